@@ -0,0 +1,208 @@
+"""
+Casos del benchmark. Todo sale de semillas fijas: ciudades de
+fleet_logic.city.generate_city, pedidos sintéticos y `random` sembrado antes
+de cada preparación. Los nombres llevan la escala entre corchetes.
+"""
+from __future__ import annotations
+import atexit
+import os
+import random
+import shutil
+import tempfile
+from types import SimpleNamespace
+
+import pygame
+
+from src.game import settings
+from src.game.fleet_logic.city import generate_city
+from src.game.jobs_logic.job_logic import JobLogic, PickupMarker
+from src.game.map_logic.map_loader import MapLoader
+from src.game.player import Player
+from src.game.save_format import read_save, write_save
+from src.game.statistics_logic.leaderboard import Leaderboard
+from src.game.weather_logic.weather import WeatherManager
+from src.game.weather_logic.weather_visuals import WeatherVisuals
+from src.game.world_data import WorldData
+
+from .harness import bench
+
+SEED = 7
+MAP_SIZES = (30, 256, 2048)
+
+_TMP = tempfile.mkdtemp(prefix="cq-bench-")
+atexit.register(shutil.rmtree, _TMP, True)
+
+
+def _city(n: int) -> dict:
+    return generate_city(n, n, SEED)
+
+
+def _free_cells(game_map) -> list:
+    return [i for i, b in enumerate(game_map.blocked) if not b]
+
+
+def _jobs_raw(game_map, count: int) -> tuple:
+    """`count` pedidos con pickup/dropoff en celdas libres, en el formato del API."""
+    rng = random.Random(SEED)
+    cells = _free_cells(game_map)
+    w = game_map.width
+    out = []
+    for k in range(count):
+        a, b = rng.choice(cells), rng.choice(cells)
+        out.append({
+            "id": f"B-{k:06d}", "pickup": [a % w, a // w], "dropoff": [b % w, b // w],
+            "payout": float(rng.randint(100, 300)), "deadline": f"2025-09-01T{12 + k % 8:02d}:{k % 60:02d}Z",
+            "weight": rng.choice((1, 1, 2, 3)), "priority": rng.randint(0, 2), "release_time": k,
+        })
+    return tuple(out)
+
+
+def _job_logic(size: int, jobs: int) -> JobLogic:
+    game_map = MapLoader().load_payload(_city(size))
+    world = WorldData(map_payload=_city(size), weather={}, jobs_raw=_jobs_raw(game_map, jobs))
+    logic = JobLogic(settings.TILE_SIZE, world=world)
+    logic.reset()
+    return logic
+
+
+# --------- Mapa ---------
+def _map_load(n: int):
+    def setup():
+        payload, loader = _city(n), MapLoader()
+        return lambda: loader._load_from_payload(payload)
+    return setup
+
+
+for _n in MAP_SIZES:
+    bench(f"map_load[{_n}]", repeat=1 if _n >= 2048 else 5, large=_n >= 2048)(_map_load(_n))
+
+
+def _map_draw(n: int):
+    def setup():
+        game_map = MapLoader().load_payload(_city(n))
+        game_map.renderer.preload(game_map.tiles)
+        screen = pygame.Surface((n * settings.TILE_SIZE, n * settings.TILE_SIZE))
+        return lambda: game_map.draw(screen)
+    return setup
+
+
+for _n in MAP_SIZES[:2]:   # 2048 son 40960 px de lado: no entra en una Surface
+    bench(f"map_draw[{_n}]", repeat=3 if _n >= 256 else 10)(_map_draw(_n))
+
+
+# --------- Jugador ---------
+@bench("player_move_x1000[256]", repeat=5)
+def _player_move():
+    game_map = MapLoader().load_payload(_city(256))
+    rng = random.Random(SEED)
+    start = rng.choice(_free_cells(game_map))
+    player = Player((start % game_map.width, start // game_map.width))
+    step = settings.TILE_SIZE * 8 / settings.FPS
+    moves = [(rng.choice((-1, 0, 1)) * step, rng.choice((-1, 0, 1)) * step) for _ in range(1000)]
+
+    def run():
+        for dx, dy in moves:
+            player.move_with_collision(dx, dy, game_map, 2.0, "rain")
+        player.stamina, player.exhausted = 100, False
+    return run
+
+
+# --------- Pedidos ---------
+def _job_update(jobs: int, markers: int):
+    def setup():
+        random.seed(SEED)
+        logic = _job_logic(256, jobs)
+        ts = settings.TILE_SIZE
+        rng = random.Random(SEED)
+        px = py = 128 * ts + ts // 2
+        ids = logic.jobs.all_ids()
+        # Ofertas vivas lejos del jugador (no se aceptan ni vencen durante la medición)
+        for jid in rng.sample(ids, min(markers, len(ids))):
+            gx, gy = logic.jobs.get(jid).pickup
+            if abs(gx - 128) + abs(gy - 128) > 10:
+                logic._pickup_markers.append(PickupMarker(gx * ts + ts // 2, gy * ts + ts // 2, jid, 1e12))
+        logic.setConditions(8.0, 300.0)
+        pickups = list(logic._pickup_markers)
+
+        def run():
+            # Cada llamada arranca del mismo estado (si no, se lanzan ofertas y el reloj avanza)
+            logic._pickup_markers[:] = pickups
+            logic._game_elapsed = logic._job_offer_elapsed = 0.0
+            # Un segundo de juego, moviéndose un tile por frame en diagonal (el asesor recalcula)
+            x, y = px, py
+            for k in range(settings.FPS):
+                logic.update(1.0 / settings.FPS, x + (k % 4) * ts, y + (k % 4) * ts)
+        return run
+    return setup
+
+
+for _jobs, _markers in ((10, 10), (1000, 200), (100000, 200)):
+    bench(f"job_update_60f[jobs={_jobs},markers={_markers}]", repeat=5)(_job_update(_jobs, _markers))
+
+
+# --------- Clima ---------
+def _weather_draw(cond: str):
+    def setup():
+        random.seed(SEED)
+        w = h = 30 * settings.TILE_SIZE
+        visuals = WeatherVisuals(w, h)
+        visuals.handle_condition_change(cond)
+        for _ in range(5 * settings.FPS):   # 5 s para que lleguen nubes y alphas
+            visuals.update(1.0 / settings.FPS, cond, False)
+        screen = pygame.Surface((w, h))
+        player = SimpleNamespace(x=w / 2, y=h / 2)
+        return lambda: visuals.draw_overlay(screen, player, 1.0 / settings.FPS, cond)
+    return setup
+
+
+for _cond in WeatherManager.BASE_MULTIPLIERS:
+    bench(f"weather_draw[{_cond}]", repeat=5, number=20)(_weather_draw(_cond))
+
+
+# --------- Guardado ---------
+def _played_logic(jobs: int, history: int, inventory: int) -> JobLogic:
+    """JobLogic con historial e inventario como tras una partida larga."""
+    logic = _job_logic(30, jobs)
+    ids = logic.jobs.all_ids()
+    for k in range(history):
+        jid = ids[k % len(ids)]
+        if k < inventory:
+            logic.orders.accept_job(jid)
+        else:
+            logic.orders.record_offer_result(jid, accepted=k % 3 != 0, t=float(k))
+    return logic
+
+
+def _save(jobs: int, history: int):
+    def setup():
+        logic = _played_logic(jobs, history, 50)
+        path = os.path.join(_TMP, f"save-{jobs}.sav")
+        return lambda: write_save(path, logic.save_state())
+    return setup
+
+
+def _load(jobs: int, history: int):
+    def setup():
+        logic = _played_logic(jobs, history, 50)
+        path = os.path.join(_TMP, f"load-{jobs}.sav")
+        write_save(path, logic.save_state())
+        return lambda: logic.load_state(read_save(path))
+    return setup
+
+
+for _jobs, _history in ((1000, 500), (100000, 20000)):
+    bench(f"save[jobs={_jobs},history={_history}]", repeat=5)(_save(_jobs, _history))
+    bench(f"load[jobs={_jobs},history={_history}]", repeat=5)(_load(_jobs, _history))
+
+
+# --------- Puntajes ---------
+@bench("leaderboard_add[10000]", repeat=5, number=20)
+def _leaderboard_add():
+    rng = random.Random(SEED)
+    directory = tempfile.mkdtemp(dir=_TMP)
+    lb = Leaderboard(os.path.join(directory, "puntajes.json"), compact_every=10 ** 9)
+    lb.load()
+    for k in range(10000):
+        lb._insert(f"p{k}", float(rng.randint(0, 20000)))
+    lb.compact()
+    return lambda: lb.add("bench", float(rng.randint(0, 20000)))
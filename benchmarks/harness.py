@@ -0,0 +1,98 @@
+"""
+Mini framework de benchmarks: registro de casos, medición y comparación
+contra la línea base.
+
+Un caso es una función de preparación decorada con @bench; devuelve lo que
+se mide (un callable sin argumentos). La preparación no se cuenta. Cada
+caso corre `repeat` veces `number` llamadas y se guarda el mínimo y la
+mediana por llamada (ms). Para comparar se usa el mínimo, que es lo menos
+sensible al ruido de la máquina.
+"""
+from __future__ import annotations
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+@dataclass
+class Bench:
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    repeat: int = 5
+    number: int = 1
+    large: bool = False      # se saltea con --quick
+
+
+REGISTRY: List[Bench] = []
+
+
+def bench(name: str, repeat: int = 5, number: int = 1, large: bool = False):
+    def register(setup):
+        REGISTRY.append(Bench(name, setup, repeat, number, large))
+        return setup
+    return register
+
+
+def measure(case: Bench) -> Dict[str, float]:
+    fn = case.setup()
+    fn()   # calentamiento: caches de imágenes, imports perezosos, etc.
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(case.repeat):
+            t0 = time.perf_counter()
+            for _ in range(case.number):
+                fn()
+            times.append((time.perf_counter() - t0) * 1000.0 / case.number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return {"min_ms": round(min(times), 4), "median_ms": round(statistics.median(times), 4)}
+
+
+def machine() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": sys.implementation.name,
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"machine": {}, "results": {}}
+
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str = BASELINE_PATH,
+                  previous: Optional[dict] = None) -> None:
+    """Escribe la línea base; conserva los casos que no se corrieron esta vez."""
+    merged = dict((previous or {}).get("results", {}))
+    merged.update(results)
+    data = {"machine": machine(), "results": dict(sorted(merged.items()))}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: dict, threshold: float) -> List[str]:
+    """Casos cuyo mínimo empeoró más de `threshold` (0.25 = 25%) respecto de la línea base."""
+    base = baseline.get("results", {})
+    slower = []
+    for name, r in results.items():
+        ref = base.get(name)
+        if ref and r["min_ms"] > ref["min_ms"] * (1.0 + threshold):
+            slower.append(name)
+    return slower
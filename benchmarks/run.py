@@ -0,0 +1,85 @@
+"""
+Benchmarks de los caminos calientes del juego.
+
+    python -m benchmarks.run                 # compara contra benchmarks/baseline.json
+    python -m benchmarks.run --quick         # sin los casos grandes (mapa 2048x2048)
+    python -m benchmarks.run -k map_         # solo los casos cuyo nombre contiene "map_"
+    python -m benchmarks.run --update        # mide y reescribe la línea base
+
+Sale con código 1 si algún caso quedó más de --threshold (25% por defecto)
+más lento que su línea base. Los que se pasan se vuelven a medir hasta
+--retries veces (se queda el mejor mínimo) antes de darlos por más lentos,
+así un pico de la máquina no falla la corrida. La línea base es de una
+máquina: después de cambiar de máquina o de versión de Python, regenerarla
+con --update.
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from .harness import (BASELINE_PATH, REGISTRY, compare, load_baseline, machine,  # noqa: E402
+                      measure, save_baseline)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("-k", dest="filter", default="", help="solo casos cuyo nombre contiene este texto")
+    parser.add_argument("--quick", action="store_true", help="saltea los casos grandes")
+    parser.add_argument("--update", action="store_true", help="reescribe la línea base con esta corrida")
+    parser.add_argument("--threshold", type=float, default=0.25, help="empeoramiento tolerado (0.25 = 25%%)")
+    parser.add_argument("--retries", type=int, default=2, help="remediciones de los casos que se pasan")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args(argv)
+
+    # load_image hace convert_alpha: hace falta un display (el driver dummy alcanza)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    from . import cases  # noqa: F401  (registra los casos)
+
+    baseline = load_baseline(args.baseline)
+    if not args.update and baseline.get("machine") and baseline["machine"] != machine():
+        print(f"Aviso: la línea base es de otra máquina ({baseline['machine']}); regenerarla con --update")
+
+    ref = baseline.get("results", {})
+    results = {}
+    print(f"{'caso':<44} {'mín ms':>10} {'mediana':>10} {'base':>10} {'cambio':>8}")
+    for case in REGISTRY:
+        if args.filter not in case.name or (args.quick and case.large):
+            continue
+        r = results[case.name] = measure(case)
+        base = ref.get(case.name)
+        change = f"{(r['min_ms'] / base['min_ms'] - 1) * 100:+7.1f}%" if base else "   nuevo"
+        base_ms = f"{base['min_ms']:10.3f}" if base else " " * 10
+        print(f"{case.name:<44} {r['min_ms']:10.3f} {r['median_ms']:10.3f} {base_ms} {change}", flush=True)
+
+    if args.update:
+        save_baseline(results, args.baseline, baseline)
+        print(f"Línea base actualizada: {args.baseline}")
+        return 0
+    slower = compare(results, baseline, args.threshold)
+    by_name = {case.name: case for case in REGISTRY}
+    for _ in range(args.retries):
+        if not slower:
+            break
+        for name in slower:
+            again = measure(by_name[name])
+            if again["min_ms"] < results[name]["min_ms"]:
+                results[name] = again
+            print(f"  remedido {name:<35} {results[name]['min_ms']:10.3f}", flush=True)
+        slower = compare(results, baseline, args.threshold)
+    if slower:
+        print(f"\nMás lentos que la línea base (> {args.threshold:.0%}):")
+        for name in slower:
+            print(f"  {name}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
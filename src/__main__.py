@@ -1,8 +1,24 @@
 # Entry point
-from .game.engine import Game
+import argparse
+
+from .game.startup import PROFILER
 
 
 def main():
+    parser = argparse.ArgumentParser(prog="python -m src")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="imprime el desglose de tiempos de arranque (import, I/O, decode, pygame)",
+    )
+    args = parser.parse_args()
+
+    PROFILER.start(enabled=args.profile_startup)
+
+    # Import perezoso: el motor (y pygame) se cuentan dentro del perfil de arranque
+    with PROFILER.phase("game.engine", "import"):
+        from .game.engine import Game
+
     Game().run()
 
 if __name__ == "__main__":
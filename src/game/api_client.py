@@ -1,61 +1,293 @@
 # src/game/api_client.py
-# Cliente de API con urllib.request y fallback local a /data
+# Cliente de API con conexiones keep-alive, descarga en paralelo y fallback local a /data
 import json
 import os
-import urllib.request
+import tempfile
+import threading
+import time
+import http.client
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from urllib.error import URLError, HTTPError
-from typing import Any, Dict, List
+from urllib.parse import urlsplit
+from email.utils import formatdate
+from typing import Any, Dict, List, Optional
 
+from . import settings
+from .startup import PROFILER
 
-API_CITY_MAP_URL = (
-    "https://tigerds-api.kindflower-ccaf48b6.eastus.azurecontainerapps.io/city/map"
-)
 
-API_CITY_WEATHER_URL = (
-    "https://tigerds-api.kindflower-ccaf48b6.eastus.azurecontainerapps.io/city/weather"
-)
+API_BASE_URL = "https://tigerds-api.kindflower-ccaf48b6.eastus.azurecontainerapps.io"
 
-API_JOBS_URL = (
-    "https://tigerds-api.kindflower-ccaf48b6.eastus.azurecontainerapps.io/city/jobs"
-)
+API_CITY_MAP_URL = API_BASE_URL + "/city/map"
+
+API_CITY_WEATHER_URL = API_BASE_URL + "/city/weather"
+
+API_JOBS_URL = API_BASE_URL + "/city/jobs"
+
+# recurso -> (ruta en el API, nombre del cache en /data)
+_RESOURCES = {
+    "map": ("/city/map", "ciudad"),
+    "weather": ("/city/weather", "weather"),
+    "jobs": ("/city/jobs", "pedidos"),
+}
+
+# Errores de red/parseo que activan el fallback local (URLError/HTTPError/TimeoutError son OSError)
+_FETCH_ERRORS = (URLError, HTTPError, TimeoutError, OSError, http.client.HTTPException, json.JSONDecodeError)
+
+
+def _atomic_write(path: str, blob: bytes) -> None:
+    """Escritura atómica: primero a archivo temporal en el mismo directorio, luego replace."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile("wb", dir=directory, delete=False)
+    try:
+        with tmp:
+            tmp.write(blob)
+        os.replace(tmp.name, path)
+    except Exception:
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+        raise
+
+
+class _ConnectionPool:
+    """
+    Pool pequeño de conexiones HTTP(S) keep-alive por host.
+    Cada hilo toma una conexión libre (o crea una) y la devuelve al terminar,
+    así las peticiones siguientes reutilizan el socket/TLS ya abierto.
+    """
+    def __init__(self, timeout: float, max_idle: int = 3) -> None:
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle: Dict[tuple, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        key = (scheme, netloc)
+        with self._lock:
+            conns = self._idle.get(key)
+            if conns:
+                return conns.pop()
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def release(self, scheme: str, netloc: str, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            conns = self._idle.setdefault((scheme, netloc), [])
+            if len(conns) < self.max_idle:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for conns in self._idle.values():
+                for c in conns:
+                    c.close()
+            self._idle.clear()
 
 
 class APIClient:
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, base_url: Optional[str] = None, timeout: float = 8.0,
+                 max_age: Optional[float] = None, grace: Optional[float] = None):
         """
         base_dir: ruta absoluta a la carpeta raíz del proyecto (la que contiene /data)
+        base_url: raíz del API (por defecto API_BASE_URL; útil para apuntar a un servidor local)
+        max_age: segundos durante los que el cache local se usa sin consultar el API
+                 (por defecto settings.API_CACHE_MAX_AGE; 0 = validar siempre)
+        grace: segundos que se espera a la red antes de devolver el cache local
+               (por defecto settings.API_NETWORK_GRACE)
         """
         self.base_dir = base_dir
+        self.base_url = (base_url or API_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.max_age = float(settings.API_CACHE_MAX_AGE if max_age is None else max_age)
+        self.grace = float(settings.API_NETWORK_GRACE if grace is None else grace)
+
+        self._pool = _ConnectionPool(timeout)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
 
-    def _fetch_json(self, url: str, timeout: float = 8.0) -> dict:
-        req = urllib.request.Request(url, headers={"User-Agent": "CourierQuest/1.0"})
-        with urllib.request.urlopen(req, timeout=timeout) as response:
-            # Carga directo como dict (igual que tu ejemplo)
-            return json.load(response)
+        # Una descarga (Future) por recurso; se comparte entre todos los consumidores
+        self._network: Dict[str, Future] = {}
+        # Lectura del cache local en paralelo a la red, lista para el fallback
+        self._local: Dict[str, Future] = {}
+
+    # -------- Red --------
+    def _request(self, url: str, headers: Optional[Dict[str, str]] = None,
+                 timeout: Optional[float] = None) -> tuple:
+        """GET sobre una conexión del pool. Devuelve (status, headers, body)."""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        conn = self._pool.acquire(parts.scheme, parts.netloc)
+        if timeout is not None:
+            conn.timeout = timeout
+        try:
+            req_headers = {"User-Agent": "CourierQuest/1.0", "Connection": "keep-alive"}
+            req_headers.update(headers or {})
+            with PROFILER.phase(f"GET {parts.path}", "io"):
+                conn.request("GET", path, headers=req_headers)
+                response = conn.getresponse()
+                body = response.read()
+        except Exception:
+            conn.close()
+            raise
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._pool.release(parts.scheme, parts.netloc, conn)
+
+        if response.status not in (200, 304):
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+        return response.status, response.headers, body
+
+    def _fetch_json(self, url: str, timeout: Optional[float] = None) -> Any:
+        status, _, body = self._request(url, timeout=timeout)
+        return json.loads(body)
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2 * len(_RESOURCES), thread_name_prefix="api")
+        return self._executor
+
+    def prefetch(self, names=tuple(_RESOURCES)) -> None:
+        """
+        Lanza en paralelo la descarga de los recursos pedidos (y la lectura de su
+        cache local) sin bloquear. Los get_*() posteriores esperan ese resultado.
+        """
+        with self._lock:
+            executor = self._ensure_executor()
+            for name in names:
+                path, cache_name = _RESOURCES[name]
+                if name not in self._local:
+                    self._local[name] = executor.submit(self._load_local, cache_name)
+                if name not in self._network:
+                    self._network[name] = executor.submit(self._fetch_resource, name)
+
+    def _fetch_resource(self, name: str) -> Any:
+        """
+        Descarga condicional: si el cache es más nuevo que max_age ni siquiera
+        consulta el API; si no, envía If-None-Match / If-Modified-Since y ante un
+        304 reutiliza la copia local. Solo reescribe /data cuando el contenido cambió.
+        """
+        path, cache_name = _RESOURCES[name]
+        meta = self._load_meta(cache_name)
+        has_local = os.path.exists(self._cache_path(cache_name))
+
+        if has_local and self.max_age > 0 and time.time() - meta.get("fetched_at", 0.0) < self.max_age:
+            return self._local[name].result()
+
+        headers = {}
+        if has_local:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        status, resp_headers, body = self._request(self.base_url + path, headers, self.timeout)
+
+        if status == 304:
+            data = self._local[name].result()
+        else:
+            with PROFILER.phase(f"json {cache_name}", "decode"):
+                data = json.loads(body)
+            if name == "jobs":
+                self._normalize_jobs(data)  # no cachear un payload que no se puede usar
+            # Guardar copia local actualizada (solo si cambió)
+            self._write_local(cache_name, data)
+
+        self._write_meta(cache_name, {
+            "etag": resp_headers.get("ETag") or meta.get("etag"),
+            "last_modified": (resp_headers.get("Last-Modified") or meta.get("last_modified")
+                              or formatdate(usegmt=True)),
+            "fetched_at": time.time(),
+        })
+        return data
+
+    def _get(self, name: str) -> tuple:
+        """
+        Devuelve (payload, from_network). La red y el cache local corren en
+        carrera: si la red no terminó `grace` segundos después que el cache y
+        el cache existe, se devuelve el cache (la descarga sigue de fondo y
+        actualiza /data al terminar). Si la red falla, también se usa el cache.
+        """
+        self.prefetch((name,))
+        net, local = self._network[name], self._local[name]
+        wait((net, local), return_when=FIRST_COMPLETED)
+        if not net.done():
+            wait((net,), timeout=self.grace)
+        if not net.done() and local.exception() is None:
+            return local.result(), False
+        try:
+            return net.result(), True
+        except _FETCH_ERRORS:
+            return local.result(), False
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Olvida el resultado de un recurso (o de todos) para forzar otra descarga."""
+        with self._lock:
+            for key in ([name] if name else list(_RESOURCES)):
+                self._network.pop(key, None)
+                self._local.pop(key, None)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self._pool.close()
+
+    # -------- Cache local --------
+    def _cache_path(self, name: str, suffix: str = ".json") -> str:
+        return os.path.join(self.base_dir, "data", f"{name}{suffix}")
 
     def _load_local(self, name: str) -> dict:
         """
         Fallback local: intenta leer /data/<name>.json
         """
-        path = os.path.join(self.base_dir, "data", f"{name}.json")
+        path = self._cache_path(name)
         if not os.path.exists(path):
             raise FileNotFoundError(path)
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with PROFILER.phase(f"read {name}.json", "io"):
+            with open(path, "rb") as f:
+                raw = f.read()
+        with PROFILER.phase(f"json {name}", "decode"):
+            return json.loads(raw)
 
-    def get_map(self) -> dict:
+    def _write_local(self, name: str, data: Any) -> None:
+        """Escribe /data/<name>.json compacto y atómico; no toca el archivo si no cambió."""
+        blob = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        path = self._cache_path(name)
         try:
-            data = self._fetch_json(API_CITY_MAP_URL)
+            with open(path, "rb") as f:
+                if f.read() == blob:
+                    return
+        except OSError:
+            pass
+        _atomic_write(path, blob)
 
-            # Guardar copia local actualizada
-            path = os.path.join(self.base_dir, "data", "ciudad.json")
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+    def _load_meta(self, name: str) -> dict:
+        """Validadores HTTP guardados junto al cache: /data/<name>.meta.json"""
+        try:
+            with open(self._cache_path(name, ".meta.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            return meta if isinstance(meta, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _write_meta(self, name: str, meta: dict) -> None:
+        blob = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        try:
+            _atomic_write(self._cache_path(name, ".meta.json"), blob)
+        except OSError:
+            pass
 
-            return data
-        except (URLError, HTTPError, TimeoutError, json.JSONDecodeError):
-            # Fallback local
-            return self._load_local("ciudad")
+    def get_map(self) -> dict:
+        data, _ = self._get("map")
+        return data
 
 
     def _normalize_jobs(self, data: Any) -> List[Dict[str, Any]]:
@@ -112,39 +344,12 @@ class APIClient:
     Resultado: el cache refleja el API real; get_jobs() siempre retorna una lista normalizada.
     """
     def get_jobs(self) -> List[Dict[str, Any]]:
-        try:
-            data = self._fetch_json(API_JOBS_URL)
-            jobs = self._normalize_jobs(data)              # ← siempre list[dict]
-
-            # Guardar copia local actualizada
-            path = os.path.join(self.base_dir, "data", "pedidos.json")
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            return jobs
-        except (URLError, HTTPError, TimeoutError, json.JSONDecodeError):
-          local_raw = self._load_local("pedidos")
-          return self._normalize_jobs(local_raw)
-    
-
+        data, _ = self._get("jobs")
+        return self._normalize_jobs(data)
 
     def get_weather(self) -> dict:
+        data, _ = self._get("weather")
+        return data
 
-        try:
-            data = self._fetch_json(API_CITY_WEATHER_URL)
-
-            # Guardar copia local actualizada
-            path = os.path.join(self.base_dir, "data", "weather.json")
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            return data
-        except (URLError, HTTPError, TimeoutError, json.JSONDecodeError):
-            # Fallback local
-            return self._load_local("weather")
-
-
-    
     def get_map_local(self) -> dict:
         return self._load_local("ciudad")
-        
\ No newline at end of file
@@ -0,0 +1,38 @@
+import os
+from functools import lru_cache
+
+import pygame
+
+from .startup import PROFILER
+
+ASSETS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "assets"))
+
+# Imágenes ya decodificadas en segundo plano, pendientes de convert() en el hilo principal
+_decoded: dict = {}
+
+
+def _decode(category: str, filename: str) -> pygame.Surface:
+    with PROFILER.phase(f"png {category}", "decode"):
+        return pygame.image.load(os.path.join(ASSETS_DIR, category, filename))
+
+
+def preload_category(category: str) -> None:
+    """
+    Decodifica todos los .png de /assets/<category> sin convert(), para poder
+    llamarla desde el hilo de carga; load_image() luego solo los convierte.
+    """
+    folder = os.path.join(ASSETS_DIR, category)
+    for filename in sorted(os.listdir(folder)):
+        if filename.lower().endswith(".png") and (category, filename) not in _decoded:
+            _decoded[(category, filename)] = _decode(category, filename)
+
+
+@lru_cache(maxsize=None)
+def load_image(category: str, filename: str, alpha: bool = True) -> pygame.Surface:
+    """
+    Carga /assets/<category>/<filename> una sola vez por proceso y devuelve siempre
+    la misma superficie. Quien necesite modificarla (escala, alpha) debe copiarla
+    o asumir que el cambio se comparte.
+    """
+    surf = _decoded.pop((category, filename), None) or _decode(category, filename)
+    return surf.convert_alpha() if alpha else surf.convert()
@@ -0,0 +1,167 @@
+"""
+Autoguardado en segundo plano.
+
+Cada AUTOSAVE_INTERVAL_SECONDS de juego se toma una foto del estado
+(get_current_data(), barato: solo arma dicts/listas nuevos) en el hilo
+principal y se le pasa a un hilo de trabajo que la agrega al log del slot
+(save_log.SaveLog: keyframe + deltas, solo append). Cada partida nueva usa
+el siguiente slot (autosave-1.cqlog … autosave-N.cqlog, rotando), así se
+conservan las últimas N partidas y cada una se puede recorrer guardado a
+guardado.
+
+La foto no comparte objetos mutables con el juego: los save_state()
+devuelven copias, y el hilo de trabajo es el único que la toca después.
+"""
+from __future__ import annotations
+import os
+import queue
+import threading
+from typing import Callable, Optional
+
+from . import settings
+from .save_format import SAVES_DIR
+from .save_log import SaveLog
+
+
+class AutoSaver:
+    def __init__(
+        self,
+        snapshot_fn: Callable[[], dict],
+        saves_dir: str = SAVES_DIR,
+        interval: float = settings.AUTOSAVE_INTERVAL_SECONDS,
+        slots: int = settings.AUTOSAVE_SLOTS,
+        prefix: str = "autosave",
+        index=None,
+        thumb_fn: Optional[Callable[[], tuple]] = None,
+        store=None,
+    ) -> None:
+        self.snapshot_fn = snapshot_fn
+        self.index = index                # SaveIndex opcional: se actualiza tras cada escritura
+        self.thumb_fn = thumb_fn          # miniatura ((w, h), rgb) tomada junto con la foto
+        # Con backend SQLite (DbSaveIndex) cada slot es una fila completa en vez de un log
+        self.store = store
+        self.saves_dir = saves_dir
+        self.interval = float(interval)
+        self.slots = max(1, int(slots))
+        self.prefix = prefix
+
+        self._elapsed = 0.0
+        # El primer guardado de cada partida avanza al siguiente slot (ver save_now)
+        self._slot = (self._oldest_slot() - 1) % self.slots
+        self._fresh = True                # el próximo guardado empieza un log nuevo
+        self._logs: dict = {}             # ruta -> SaveLog (solo los toca el hilo de trabajo)
+        # Como mucho una foto pendiente: si el disco va lento, la nueva reemplaza a la vieja
+        self._pending: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=1)
+        self._idle = threading.Event()
+        self._idle.set()
+
+        self.saves_written = 0
+        self.last_path: Optional[str] = None
+        self.last_error: Optional[Exception] = None
+
+        self._thread = threading.Thread(target=self._worker, name="autosave", daemon=True)
+        self._thread.start()
+
+    # --------- Slots ---------
+    def slot_path(self, index: int) -> str:
+        return os.path.join(self.saves_dir, f"{self.prefix}-{index + 1}.cqlog")
+
+    def _slot_mtime(self, index: int) -> float:
+        if self.store is not None:
+            entry = self.store.get(f"{self.prefix}-{index + 1}.sav")
+            if entry is None:
+                raise OSError("slot vacío")
+            return entry["saved_at"]
+        return os.path.getmtime(self.slot_path(index))
+
+    def _oldest_slot(self) -> int:
+        """Sigue la rotación entre ejecuciones: primero un slot vacío, si no el más viejo."""
+        oldest, oldest_mtime = 0, None
+        for i in range(self.slots):
+            try:
+                mtime = self._slot_mtime(i)
+            except OSError:
+                return i
+            if oldest_mtime is None or mtime < oldest_mtime:
+                oldest, oldest_mtime = i, mtime
+        return oldest
+
+    # --------- Hilo principal ---------
+    def tick(self, dt: float) -> None:
+        """Llamar una vez por frame mientras se juega."""
+        if self.interval <= 0:
+            return
+        self._elapsed += dt
+        if self._elapsed >= self.interval:
+            self._elapsed = 0.0
+            self.save_now()
+
+    def new_run(self) -> None:
+        """Partida nueva (o recién cargada): su primer guardado va al siguiente slot, desde cero."""
+        self._elapsed = 0.0
+        self._fresh = True
+
+    def save_now(self) -> None:
+        """Toma la foto ya y la encola; no bloquea por disco."""
+        snapshot = self.snapshot_fn()
+        thumb = self.thumb_fn() if self.thumb_fn else None
+        fresh, self._fresh = self._fresh, False
+        if fresh:
+            self._slot = (self._slot + 1) % self.slots
+        path = self.slot_path(self._slot)
+
+        self._idle.clear()
+        try:
+            self._pending.put_nowait((path, snapshot, thumb, fresh))
+        except queue.Full:
+            # Descarta la foto vieja que aún no se escribió (sin perder su "empezar de cero")
+            try:
+                old_path, _, _, old_fresh = self._pending.get_nowait()
+                fresh = fresh or (old_fresh and old_path == path)
+            except queue.Empty:
+                pass
+            self._pending.put_nowait((path, snapshot, thumb, fresh))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que no quede nada por escribir. True si terminó a tiempo."""
+        return self._idle.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self.flush(timeout)
+        try:
+            self._pending.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    # --------- Hilo de trabajo ---------
+    def _worker(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is None:
+                self._idle.set()
+                return
+            path, snapshot, thumb, fresh = item
+            try:
+                if self.store is not None:
+                    self.store.update(os.path.basename(path).replace(".cqlog", ".sav"), snapshot, thumb)
+                    self.saves_written += 1
+                    self.last_path = path
+                    self.last_error = None
+                    continue
+                log = self._logs.get(path)
+                if log is None or fresh:
+                    if fresh and os.path.exists(path):
+                        os.remove(path)
+                    log = self._logs[path] = SaveLog(path)
+                log.append(snapshot)
+                if self.index is not None:
+                    self.index.update(os.path.basename(path), snapshot, thumb)
+                self.saves_written += 1
+                self.last_path = path
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+            finally:
+                if self._pending.empty():
+                    self._idle.set()
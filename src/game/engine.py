@@ -1,37 +1,42 @@
 import pygame
 import os
-import pickle
-import tempfile
 import re
+import time
+import uuid
 from . import settings
+from .save_format import SAVES_DIR, read_save, write_save
+from .save_log import SaveLog
+from .save_index import SaveIndex
 from .map_logic.map_loader import MapLoader
-from .player import Player
 from .ui.menu import MainMenu
-
-from .weather_logic.weather import WeatherManager
-
-from .statistics_logic.statistic_logic import statisticLogic
-
-from .jobs_logic.job_logic import JobLogic
-from .ui.inventory import InventoryUI
-from .ui.game_over import GameOverLogic
-from .ui.pause_menu import PauseMenu
 from .game_state import GameState
+from .api_client import APIClient
+from .startup import PROFILER, StartupLoader
+from .profiler import FRAME_PROFILER
+from .ui.perf_overlay import PerfOverlay
 
-from .sounds import SoundManager
+BASE_TILES_PER_SEC = 8  # Modificar para ajustar velocidad base
 
 class Game:
     def __init__(self):
-        pygame.mixer.pre_init(44100, -16, 2, 256)
-        pygame.init()
+        # 0) Descarga de mapa, clima y pedidos en paralelo mientras arranca pygame
+        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        self.api = APIClient(base_dir)
+        self.api.prefetch()
 
-        # 1) Cargar mapa
-        self.map = MapLoader().load_default()
+        with PROFILER.phase("pygame.init", "pygame"):
+            pygame.mixer.pre_init(44100, -16, 2, 256)
+            pygame.init()
+
+        # 1) Mapa (define el tamaño de la ventana; lo demás se carga en segundo plano)
+        with PROFILER.phase("mapa", "init"):
+            self.map = MapLoader().load_payload(self.api.get_map())
 
         # 2) Ventana del tamaño del mapa
         window_w = self.map.width * settings.TILE_SIZE
         window_h = self.map.height * settings.TILE_SIZE
-        self.screen = pygame.display.set_mode((window_w, window_h))
+        with PROFILER.phase("display.set_mode", "pygame"):
+            self.screen = pygame.display.set_mode((window_w, window_h))
         pygame.display.set_caption("Courier Quest")
         # Cargar icono (ruta relativa a este archivo)
         try:
@@ -49,32 +54,108 @@ class Game:
             # Si falla, simplemente no cambia el icono
             pass
 
-        # 3) Reloj y jugador
+        # 3) Reloj
         self.clock = pygame.time.Clock()
-        self.player = Player((0, 0))
 
         # 4) UI: menú + fuentes HUD 
-        self.menu = MainMenu((window_w, window_h), self._load_game)
+        with PROFILER.phase("menú", "init"):
+            # Backend de persistencia: archivos (por defecto) o SQLite
+            self.db = None
+            if settings.PERSISTENCE_BACKEND == "sqlite":
+                from .game_db import GameDatabase, DbSaveIndex
+                self.db = GameDatabase()
+                self.save_index = DbSaveIndex(self.db)
+            else:
+                self.save_index = SaveIndex()
+            self.menu = MainMenu((window_w, window_h), self._load_game, self.save_index)
         self.hud_font = pygame.font.Font(settings.UI_FONT_NAME, settings.UI_FONT_SIZE)
         self.small_font = pygame.font.Font(settings.UI_FONT_NAME, 18)  # para texto de clima
 
-        self.pause_menu = PauseMenu((window_w, window_h), self.hud_font, self.small_font)
+        # Perfilado por frame: F3 muestra el overlay (y mide mientras está abierto)
+        FRAME_PROFILER.set_enabled(settings.FRAME_PROFILER)
+        self.perf_overlay = PerfOverlay(FRAME_PROFILER)
 
-        # 5) Estado + timer
+        # 5) Estado
         self.state = GameState.MENU
-        self.statistics_logic = statisticLogic()
 
-        # 6) Clima
-        self.weather = WeatherManager(window_w,window_h) 
+        # 6) Lo pesado (clima, pedidos, tiles, sonido) se carga en un hilo mientras se ve el menú
+        pygame.mixer.set_num_channels(16)
+        self._ready = False
+        self._loader = StartupLoader([
+            ("Clima y pedidos", 3.0, self._load_world_data),
+            ("Catálogo de pedidos", 2.0, self._load_job_logic),
+            ("Tiles", 3.0, self._load_tiles),
+            ("Imágenes del clima", 2.0, self._load_weather_images),
+            ("Sonido", 1.0, self._load_sounds),
+            ("Puntajes", 1.0, self._load_leaderboard),
+        ]).start()
+        self.menu.set_loading(0.0, self._loader.label)
+
+    # --------- Carga en segundo plano ---------
+    def _load_world_data(self):
+        with PROFILER.phase("world_data", "import"):
+            from .world_data import load_world
+        self.world = load_world(self.api)
+
+    def _load_job_logic(self):
+        with PROFILER.phase("jobs_logic", "import"):
+            from .jobs_logic.job_logic import JobLogic
+        with PROFILER.phase("catálogo de pedidos", "init"):
+            self.job_logic = JobLogic(tile_size=settings.TILE_SIZE, world=self.world)
+            self.job_logic.reset()
+
+    def _load_tiles(self):
+        self.map.renderer.preload(self.map.tiles)
+
+    def _load_weather_images(self):
+        from .assets import preload_category
+        for category in ("overlays", "clouds", "lightning"):
+            preload_category(category)
+
+    def _load_sounds(self):
+        with PROFILER.phase("sounds", "import"):
+            from .sounds import SoundManager
+        with PROFILER.phase("sonidos", "decode"):
+            self.sfx = SoundManager()
+
+    def _load_leaderboard(self):
+        if self.db is not None:
+            from .game_db import DbLeaderboard
+            self.leaderboard = DbLeaderboard(self.db)
+            return
+        from .statistics_logic.leaderboard import Leaderboard
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "puntajes.json")
+        self.leaderboard = Leaderboard(os.path.normpath(path))
+        with PROFILER.phase("puntajes", "io"):
+            self.leaderboard.load()
+
+    def _finish_startup(self):
+        """Arma en el hilo principal lo que necesita el display (fuentes, convert())."""
+        with PROFILER.phase("subsistemas", "import"):
+            from .player import Player
+            from .weather_logic.weather import WeatherManager
+            from .statistics_logic.statistic_logic import statisticLogic
+            from .ui.inventory import InventoryUI
+            from .ui.game_over import GameOverLogic
+            from .ui.pause_menu import PauseMenu
+            from .autosave import AutoSaver
+            from .jobs_logic.route_planner import RoutePlanner
+            from .metrics import MetricsSink
+
+        window_w, window_h = self.screen.get_size()
+
+        # Jugador
+        self.player = Player((0, 0))
 
-        # 7) Pedidos
-        self.job_logic = JobLogic(tile_size=settings.TILE_SIZE)
-        self.job_logic.reset()
+        # Timer / estadísticas
+        self.statistics_logic = statisticLogic()
+
+        # Clima
+        self.weather = WeatherManager(window_w, window_h, self.world)
 
-        #8) UI: Inventario
+        # UI: Inventario
         self.inventory_ui = InventoryUI(self.job_logic) 
 
-        
         self.inventory_ui.set_on_pick_job(
             lambda job: self.job_logic.setCurrentJob(str(getattr(job, "id", "")))
         )
@@ -83,22 +164,55 @@ class Game:
             lambda: setattr(self, "state", GameState.PLAYING)
         )
 
-        # 9) Game Over Logic
-        self.game_over = GameOverLogic(self.hud_font, self.small_font)
+        # Ruta sugerida (tecla O): se calcula en un hilo propio sobre la grilla del mapa
+        self.route_planner = RoutePlanner(self.map)
+        self.job_logic.route_planner = self.route_planner
+        self.inventory_ui.set_on_optimize_route(
+            lambda: self.job_logic.requestRoute(self.player.x, self.player.y,
+                                                BASE_TILES_PER_SEC * self.current_speed())
+        )
 
-        #10) SoundManager para reproducir sonidos 
-        pygame.mixer.set_num_channels(16)  
-        self.sfx = SoundManager()    
+        # Game Over Logic
+        self.game_over = GameOverLogic(self.hud_font, self.small_font, self.leaderboard)
 
-        #11) Pausa Logic
+        # Pausa Logic
         self.pause_menu = PauseMenu((window_w, window_h), self.hud_font, self.small_font, self._save_game)
 
+        # Autoguardado: foto en el hilo principal, escritura en un hilo aparte
+        if self.db is not None:
+            self.autosave = AutoSaver(self.get_current_data, thumb_fn=self._thumbnail, store=self.save_index)
+        else:
+            self.autosave = AutoSaver(self.get_current_data, index=self.save_index, thumb_fn=self._thumbnail)
+
+        # Telemetría (METRICS_TARGET): el registro se arma acá, lo escribe un hilo aparte
+        self.metrics = MetricsSink(self._metrics_snapshot)
+
+    def _poll_startup(self):
+        """Actualiza la barra de carga y, al terminar el hilo, completa el arranque."""
+        if self._ready:
+            return
+        if self._loader.error is not None:
+            raise self._loader.error
+        if not self._loader.done:
+            self.menu.set_loading(self._loader.progress, self._loader.label)
+            return
+
+        with PROFILER.phase("subsistemas", "init"):
+            self._finish_startup()
+        self.menu.set_loading(None)
+        self._ready = True
+        PROFILER.mark("carga completa")
 
     # --------- Ciclo principal ---------
     def run(self):
         running = True
         while running:
             dt = self.clock.tick(settings.FPS) / 1000.0
+            FRAME_PROFILER.begin_frame()
+
+            self._poll_startup()
+            if self._ready:
+                self.metrics.tick(dt)
 
             # Selección de handlers por estado
             handle_event, update, draw = self._get_state_handlers()
@@ -107,6 +221,9 @@ class Game:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.perf_overlay.toggle()
+                    FRAME_PROFILER.set_enabled(self.perf_overlay.visible or settings.FRAME_PROFILER)
                 else:
                     handle_event(event)
 
@@ -115,15 +232,33 @@ class Game:
 
             # DRAW
             self.screen.fill(settings.MENU_BG)
-            # Dibuja mundo de fondo siempre:
-            self.map.draw(self.screen)
-            self.player.draw(self.screen)
-            self.weather.draw_weather_overlay(self.screen, self.player,dt)
-            self.player.draw_stamina(self.screen)
+            # Dibuja mundo de fondo (el menú lo tapa por completo, ahí no hace falta)
+            if self.state != GameState.MENU:
+                with FRAME_PROFILER.section("mapa"):
+                    self.map.draw(self.screen)
+                with FRAME_PROFILER.section("jugador"):
+                    self.player.draw(self.screen)
+                with FRAME_PROFILER.section("clima"):
+                    self.weather.draw_weather_overlay(self.screen, self.player,dt)
+                with FRAME_PROFILER.section("jugador"):
+                    self.player.draw_stamina(self.screen)
             draw()
-
-            pygame.display.flip()
-
+            self.perf_overlay.draw(self.screen)
+
+            with FRAME_PROFILER.section("flip"):
+                pygame.display.flip()
+            FRAME_PROFILER.end_frame()
+
+            PROFILER.mark("menú visible")
+            if self._ready:
+                PROFILER.report_once()
+
+        if self._ready:
+            self.autosave.stop()
+            self.route_planner.stop()
+            self.metrics.stop()
+        if self.db is not None:
+            self.db.close()
         pygame.quit()
 
     # --------- Helpers ---------
@@ -155,6 +290,30 @@ class Game:
         # Reiniciar clima
         self.weather.reset()
 
+        self.autosave.new_run()
+        self._start_run()
+
+    def _start_run(self):
+        """Identifica la partida en curso (para el resumen en SQLite)."""
+        self._run_id = uuid.uuid4().hex
+        self._run_started = time.time()
+
+    def _end_run(self, won: bool, score: float):
+        """Registra el resumen de la partida terminada si el backend es SQLite."""
+        if self.db is None:
+            return
+        from .game_db import summarize_run
+        self.db.record_run(self._run_id, summarize_run(
+            self.job_logic.getHistoryIDs(),
+            started_at=self._run_started,
+            won=won,
+            score=score,
+            money=self.job_logic.getMoney(),
+            reputation=self.job_logic.getReputation(),
+            time_left=self.statistics_logic.time_left,
+        ))
+        self.leaderboard.run_id = self._run_id
+
     # --------- Estado: MENU ---------
     def _handle_event_menu(self, event: pygame.event.Event):
       action = self.menu.handle_event(event)
@@ -226,7 +385,7 @@ class Game:
 
         # 2) Lee input y aplica multiplicador de velocidad del clima
         keys = pygame.key.get_pressed()
-        base_px_per_sec = settings.TILE_SIZE * 8  # Modificar para ajustar velocidad base
+        base_px_per_sec = settings.TILE_SIZE * BASE_TILES_PER_SEC
         speed_mult = self.current_speed()
 
         # Soporte flechas + WASD
@@ -254,15 +413,24 @@ class Game:
         self.statistics_logic.update(dt, currentMoney, currentReputation)
         if self.statistics_logic.check_time_finished() or currentReputation < settings.MIN_REPUTACION:
             self.game_over.set_title("GAME OVER (you lose)", win=False)
-            self.game_over.enter(self.get_score())
+            score = self.get_score()
+            self._end_run(False, score)
+            self.game_over.enter(score)
             self.state = GameState.GAME_OVER
         if currentMoney >= settings.META_INGRESOS:
             self.game_over.set_title("CONGRATS! (you win)", win=True)
-            self.game_over.enter(self.get_score())
+            score = self.get_score()
+            self._end_run(True, score)
+            self.game_over.enter(score)
             self.state = GameState.GAME_OVER
-        # 4) Actualiza pedidos
+        # 4) Actualiza pedidos (el asesor de ofertas usa la velocidad con clima de este frame)
+        self.job_logic.setConditions(BASE_TILES_PER_SEC * speed_mult, self.statistics_logic.time_left)
         self.job_logic.update(dt, self.player.x, self.player.y)
 
+        # 5) Autoguardado (solo si la partida sigue en curso)
+        if self.state == GameState.PLAYING:
+            self.autosave.tick(dt)
+
 
     # --------- Estado: GAME OVER ---------
     def _handle_event_gameover(self, event: pygame.event.Event):
@@ -293,10 +461,12 @@ class Game:
 
     def _draw_play(self):
         #self._draw_temporizador()
-        self._draw_weather()
+        with FRAME_PROFILER.section("hud"):
+            self._draw_weather()
 
         self.job_logic.draw(self.screen)
-        self.statistics_logic.draw(self.screen)
+        with FRAME_PROFILER.section("hud"):
+            self.statistics_logic.draw(self.screen)
 
 
     # --------- Clima ---------
@@ -352,60 +522,73 @@ class Game:
       if not safe_name.lower().endswith(".sav"):
           safe_name += ".sav"
 
-      # Directorio destino absoluto: /saves
-      base_dir = os.path.dirname(os.path.abspath(__file__))
-      # saves_dir = os.path.join(os.sep, "saves")
-      saves_dir = os.path.join(base_dir, "..", "..", "saves")
-      os.makedirs(saves_dir, exist_ok=True)
-      final_path = os.path.join(saves_dir, safe_name)
+      final_path = os.path.join(SAVES_DIR, safe_name)
 
-      data = self.get_current_data()
+      # SQLite: se encola y lo escribe el hilo escritor
+      if self.db is not None:
+          self.save_index.update(safe_name, self.get_current_data(), self._thumbnail())
+          return True
 
-      # Escritura atómica: primero a archivo temporal, luego replace
-      tmp_file = None
+      # Escritura atómica (temporal + fsync + replace), la misma que usa el autosave
       try:
-          tmp = tempfile.NamedTemporaryFile("wb", dir=saves_dir, delete=False)
-          tmp_file = tmp.name
-          with tmp:
-              pickle.dump(data, tmp, protocol=pickle.HIGHEST_PROTOCOL)
-          os.replace(tmp_file, final_path)
-          tmp_file = None
+          state = self.get_current_data()
+          write_save(final_path, state)
+          self.save_index.update(safe_name, state, self._thumbnail())
           return True
       except Exception:
           return False
-      finally:
-          # Limpieza si falló antes del replace
-          if tmp_file and os.path.exists(tmp_file):
-              try:
-                  os.remove(tmp_file)
-              except Exception:
-                  pass
 
     def _load_game(self, filename: str) -> bool:
-      if not filename.lower().endswith(".sav"):
+      if not filename.lower().endswith((".sav", ".cqlog")):
           filename += ".sav"
 
-      # Same directory convention as _save_game
-      base_dir = os.path.dirname(os.path.abspath(__file__))
-      saves_dir = os.path.join(base_dir, "..", "..", "saves")
-      path = os.path.join(saves_dir, filename)
+      path = os.path.join(SAVES_DIR, filename)
 
       try:
-          if not os.path.exists(path):
-              return False
-
-          with open(path, "rb") as f:
-              state = pickle.load(f)
-
-          if not isinstance(state, dict):
+          if self.db is not None:
+              self.db.flush()
+              state = self.db.get_save(filename)
+              if state is None:
+                  return False
+          elif not os.path.exists(path):
               return False
+          elif path.lower().endswith(".cqlog"):
+              # Autoguardado incremental: último keyframe + deltas
+              state = SaveLog(path).load_latest()
+          else:
+              state = read_save(path)
 
           self.set_current_data(state)
+          self.autosave.new_run()
+          self._start_run()
           return True
 
       except Exception as e:
           return False
 
+    def _thumbnail(self):
+        """Miniatura del mapa con el jugador para el índice de partidas: ((w, h), bytes RGB)."""
+        surf = pygame.Surface(self.screen.get_size())
+        self.map.draw(surf)
+        self.player.draw(surf)
+        small = pygame.transform.smoothscale(surf, settings.SAVE_THUMB_SIZE)
+        return small.get_size(), pygame.image.tobytes(small, "RGB")
+
+    def _metrics_snapshot(self) -> dict:
+        """Cantidades y contadores para MetricsSink (barato: solo len() y una copia del dict)."""
+        visuals = self.weather.visuals
+        return {
+            "gauges": {
+                "clouds": len(visuals.clouds) if visuals else 0,
+                "particles": len(visuals.wind_gusts) if visuals else 0,
+                "pickup_markers": len(self.job_logic._pickup_markers),
+                "dropoff_markers": len(self.job_logic._dropoff_markers),
+                "inventory": self.job_logic.getInventoryCount(),
+                "playing": int(self.state == GameState.PLAYING),
+            },
+            "counters": dict(self.job_logic.counters),
+        }
+
     def get_current_data(self) -> dict:
         """Prepara un dict con el estado actual para guardado."""
         return {
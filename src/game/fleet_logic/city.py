@@ -0,0 +1,44 @@
+"""
+Ciudades sintéticas (mismo formato que data/ciudad.json) para simular flotas
+en mapas más grandes que el del juego. Con la misma semilla sale el mismo mapa.
+"""
+from __future__ import annotations
+import random
+from typing import List
+
+LEGEND = {
+    "C": {"name": "calle", "surface_weight": 1.0},
+    "B": {"name": "edificio", "blocked": True},
+    "P": {"name": "parque", "surface_weight": 0.95},
+}
+
+
+def generate_city(width: int, height: int, seed: int = 0, block: int = 5, street: int = 2,
+                  park_ratio: float = 0.1) -> dict:
+    """
+    Payload {"data": {...}} para MapLoader.load_payload: manzanas de `block`
+    tiles separadas por calles de `street` (todas conectadas) y algunas
+    manzanas convertidas en parque.
+    """
+    rng = random.Random(seed)
+    period = block + street
+    tiles: List[List[str]] = [["C"] * width for _ in range(height)]
+    for by in range(street, height - 1, period):
+        for bx in range(street, width - 1, period):
+            sym = "P" if rng.random() < park_ratio else "B"
+            for y in range(by, min(by + block, height - 1)):
+                row = tiles[y]
+                for x in range(bx, min(bx + block, width - 1)):
+                    row[x] = sym
+    return {
+        "data": {
+            "version": "1.0",
+            "city_name": f"Sintética {width}x{height} #{seed}",
+            "width": width,
+            "height": height,
+            "goal": 0,
+            "max_time": 0,
+            "tiles": tiles,
+            "legend": LEGEND,
+        }
+    }
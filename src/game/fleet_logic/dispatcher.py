@@ -0,0 +1,276 @@
+"""
+Despacho central para la simulación de flota.
+
+Cada tick el FleetSim le pasa las ofertas pendientes (fila, vence, lanzada)
+y el despachador decide a qué repartidor va cada una:
+
+    NearestDispatcher   la de antes: más vieja primero al libre más cercano
+    AuctionDispatcher   asignación en lote con el algoritmo de subasta
+
+Las ofertas que no se asignan quedan pendientes y vuelven a entrar en el
+lote del próximo tick (hasta que vencen). Ambos llevan DispatchMetrics:
+latencia de despacho (segundos de juego entre lanzamiento y asignación),
+tiempo de cómputo por tick, tamaño de lote y rebatches.
+"""
+from __future__ import annotations
+import time
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+from .. import settings
+from .fleet import IDLE, TO_DROPOFF, TO_PICKUP, Fleet
+
+Offer = Tuple[int, float, float]     # (fila del catálogo, vence, lanzada)
+
+WEIGHT_CAP = 5.0                     # el mismo tope que JobLogic (getWeight() < 5)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    return s[min(len(s) - 1, int(q * len(s)))]
+
+
+class DispatchMetrics:
+    """Acumula latencias y costo de cómputo; summary() da percentiles."""
+
+    def __init__(self) -> None:
+        self.latency = array("f")        # s de juego, por oferta asignada
+        self.compute_ms = array("f")     # ms de reloj, por tick
+        self.batch = array("I")          # ofertas en el lote, por tick
+        self.assigned = 0
+        self.rebatched = 0               # ofertas que pasaron a un tick siguiente
+        self.over_budget = 0             # ticks cortados por el presupuesto
+
+    def summary(self) -> Dict[str, float]:
+        lat, ms = self.latency, self.compute_ms
+        return {
+            "ticks": len(ms),
+            "assigned": self.assigned,
+            "rebatched": self.rebatched,
+            "over_budget": self.over_budget,
+            "batch_avg": sum(self.batch) / len(self.batch) if self.batch else 0.0,
+            "latency_p50_s": percentile(lat, 0.50),
+            "latency_p95_s": percentile(lat, 0.95),
+            "latency_p99_s": percentile(lat, 0.99),
+            "compute_p50_ms": percentile(ms, 0.50),
+            "compute_p99_ms": percentile(ms, 0.99),
+            "compute_max_ms": max(ms) if ms else 0.0,
+        }
+
+
+class NearestDispatcher:
+    """Cada oferta pendiente (más vieja primero) al repartidor libre más cercano en Manhattan."""
+
+    def __init__(self) -> None:
+        self.metrics = DispatchMetrics()
+
+    def dispatch(self, sim, pending: List[Offer]) -> List[Offer]:
+        t0 = time.perf_counter()
+        fleet, cat, now = sim.fleet, sim.jobs.catalog, sim.now
+        ts = settings.TILE_SIZE
+        pos = {i: (int(fleet.x[i] // ts), int(fleet.y[i] // ts)) for i in fleet.idle()}
+        keep: List[Offer] = []
+        for offer in pending:
+            if not pos:
+                keep.append(offer)
+                continue
+            row = offer[0]
+            px, py = cat.pickup_x[row], cat.pickup_y[row]
+            best = min(pos, key=lambda i: abs(pos[i][0] - px) + abs(pos[i][1] - py))
+            del pos[best]
+            sim.assign(best, row)
+            self.metrics.latency.append(now - offer[2])
+            self.metrics.assigned += 1
+        self.metrics.rebatched += len(keep)
+        self.metrics.batch.append(len(pending))
+        self.metrics.compute_ms.append(1000.0 * (time.perf_counter() - t0))
+        return keep
+
+
+class AuctionDispatcher:
+    """
+    Asignación ofertas -> repartidores por subasta (Bertsekas), en lote.
+
+    Matriz de beneficios rala: cada oferta solo considera los `candidates`
+    repartidores más cercanos a su pickup (buckets de `bucket` tiles sobre la
+    posición en que cada uno queda libre). Beneficio:
+
+        payout - COSTO_VIAJE·(espera + viaje al pickup) - COSTO_ATRASO·atraso estimado
+
+    con el pickup imposible si llega después de que venza la oferta o si el
+    peso comprometido pasaría el tope. Cada oferta tiene además la opción
+    "quedar sin asignar" con beneficio 0, así la subasta termina aunque haya
+    más ofertas que repartidores. Si se acaba `time_budget` se conserva lo
+    ya asignado y el resto se rebatchea.
+    """
+
+    def __init__(self, time_budget: float = settings.DISPATCH_TIME_BUDGET,
+                 candidates: int = settings.DISPATCH_CANDIDATES,
+                 max_queue: int = settings.DISPATCH_MAX_QUEUE,
+                 max_batch: int = settings.DISPATCH_MAX_BATCH, bucket: int = 16,
+                 epsilon: float = 1.0) -> None:
+        self.time_budget = time_budget
+        self.max_batch = max_batch
+        self.candidates = candidates
+        self.max_queue = max_queue
+        self.bucket = bucket
+        self.epsilon = epsilon
+        self.metrics = DispatchMetrics()
+
+    # --------- Disponibilidad de cada repartidor ---------
+    def _availability(self, fleet: Fleet, cat, now: float, speed: float) -> Dict[int, Tuple[int, int, float, float]]:
+        """
+        repartidor -> (tx, ty, libre_en, peso comprometido) para los que aceptan
+        otra tarea: dónde y cuándo terminan lo que ya tienen (estimado Manhattan).
+        """
+        ts = settings.TILE_SIZE
+        w = fleet.w
+        out = {}
+        phase, paths, path_i = fleet.phase, fleet.paths, fleet.path_i
+        for i in range(fleet.n):
+            if fleet.pending_tasks(i) >= self.max_queue or fleet.committed[i] >= WEIGHT_CAP:
+                continue
+            x, y = int(fleet.x[i] // ts), int(fleet.y[i] // ts)
+            t = now
+            if fleet.exhausted[i]:
+                t += (30.0 - fleet.stamina[i]) / 10.0   # recover_stamina: 10 puntos/s hasta 30
+            if phase[i] != IDLE:
+                t += (len(paths[i]) - path_i[i]) / speed
+                task = fleet.current_task(i)
+                if phase[i] == TO_PICKUP:
+                    x, y = task[1] % w, task[1] // w
+                    bx, by = task[2] % w, task[2] // w
+                    t += (abs(bx - x) + abs(by - y)) / speed
+                    x, y = bx, by
+                elif phase[i] == TO_DROPOFF:
+                    x, y = task[2] % w, task[2] // w
+            for _, pickup, dropoff, _ in fleet.tasks[i]:
+                px, py, dx, dy = pickup % w, pickup // w, dropoff % w, dropoff // w
+                t += (abs(px - x) + abs(py - y) + abs(dx - px) + abs(dy - py)) / speed
+                x, y = dx, dy
+            out[i] = (x, y, t, fleet.committed[i])
+        return out
+
+    def _benefits(self, offers: List[Offer], avail, cat, now: float, speed: float,
+                  window: float, deadline: float) -> List[List[Tuple[int, float]]]:
+        """
+        Fila rala de la matriz por oferta: [(repartidor, beneficio)] de los
+        candidatos factibles. Pasado `deadline` las ofertas que faltan quedan
+        sin fila (van al próximo lote).
+        """
+        b = self.bucket
+        grid: Dict[Tuple[int, int], List[int]] = {}
+        for i, (x, y, _, _) in avail.items():
+            grid.setdefault((x // b, y // b), []).append(i)
+        if not grid:
+            return [[] for _ in offers]
+        max_ring = max(max(abs(gx), abs(gy)) for gx, gy in grid) + 1
+
+        travel_cost = settings.DISPATCH_TRAVEL_COST
+        late_cost = settings.DISPATCH_LATE_COST
+        rows: List[List[Tuple[int, float]]] = []
+        k = self.candidates
+        for n, (row, expires, _) in enumerate(offers):
+            if n & 31 == 31 and time.perf_counter() > deadline:
+                rows.extend([] for _ in range(len(offers) - n))
+                break
+            px, py = cat.pickup_x[row], cat.pickup_y[row]
+            deliver = (abs(cat.dropoff_x[row] - px) + abs(cat.dropoff_y[row] - py)) / speed
+            weight, payout = cat.weight[row], cat.payout[row]
+            late = max(0.0, deliver - window)
+            cx, cy = px // b, py // b
+            found: List[int] = []
+            ring = 0
+            # Anillos de buckets alrededor del pickup hasta juntar k candidatos
+            while len(found) < k and ring <= max_ring:
+                for gx in range(cx - ring, cx + ring + 1):
+                    for gy in (range(cy - ring, cy + ring + 1) if abs(gx - cx) == ring else (cy - ring, cy + ring)):
+                        cell = grid.get((gx, gy))
+                        if cell:
+                            found.extend(cell)
+                ring += 1
+            cand = []
+            for i in found:
+                x, y, free_at, committed = avail[i]
+                if committed + weight > WEIGHT_CAP:
+                    continue
+                reach = free_at - now + (abs(px - x) + abs(py - y)) / speed
+                if now + reach > expires:
+                    continue
+                value = payout - travel_cost * reach - late_cost * late
+                if value > 0:
+                    cand.append((i, value))
+            if len(cand) > k:
+                cand.sort(key=lambda c: -c[1])
+                del cand[k:]
+            rows.append(cand)
+        return rows
+
+    # --------- Subasta ---------
+    def _auction(self, rows: List[List[Tuple[int, float]]], deadline: float) -> Tuple[Dict[int, int], bool]:
+        """offer -> repartidor. El segundo valor es False si se cortó por tiempo."""
+        eps = self.epsilon
+        price: Dict[int, float] = {}
+        owner: Dict[int, int] = {}
+        queue = [j for j, r in enumerate(rows) if r]
+        queue.reverse()
+        steps = 0
+        while queue:
+            steps += 1
+            if steps & 63 == 0 and time.perf_counter() > deadline:
+                return {j: i for i, j in owner.items()}, False
+            j = queue.pop()
+            best_i, best, second = -1, 0.0, 0.0   # 0 = quedar sin asignar
+            for i, a in rows[j]:
+                v = a - price.get(i, 0.0)
+                if v > best:
+                    best_i, best, second = i, v, best
+                elif v > second:
+                    second = v
+            if best_i < 0:
+                continue
+            price[best_i] = price.get(best_i, 0.0) + best - second + eps
+            prev = owner.get(best_i)
+            owner[best_i] = j
+            if prev is not None:
+                queue.append(prev)
+        return {j: i for i, j in owner.items()}, True
+
+    def dispatch(self, sim, pending: List[Offer]) -> List[Offer]:
+        t0 = time.perf_counter()
+        deadline = t0 + self.time_budget
+        fleet, cat, now = sim.fleet, sim.jobs.catalog, sim.now
+        m = self.metrics
+        m.batch.append(len(pending))
+        if not pending:
+            m.compute_ms.append(1000.0 * (time.perf_counter() - t0))
+            return pending
+
+        speed = max(0.1, fleet.tiles_per_sec * sim.multiplier)
+        avail = self._availability(fleet, cat, now, speed)
+        # Lote acotado a las más nuevas: con más ofertas que repartidores, a las
+        # viejas les queda poco para vencer y casi nunca hay quien llegue
+        cut = max(0, len(pending) - self.max_batch)
+        batch = pending[cut:]
+        # La matriz usa a lo sumo la mitad del presupuesto; la subasta, el resto
+        rows = self._benefits(batch, avail, cat, now, speed, fleet.delivery_window,
+                              t0 + self.time_budget / 2)
+        match, complete = self._auction(rows, deadline)
+        if not complete:
+            m.over_budget += 1
+
+        keep: List[Offer] = []
+        for j, offer in enumerate(batch):
+            i = match.get(j)
+            if i is None:
+                keep.append(offer)
+                continue
+            sim.assign(i, offer[0])
+            m.latency.append(now - offer[2])
+            m.assigned += 1
+        keep[:0] = pending[:cut]
+        m.rebatched += len(keep)
+        m.compute_ms.append(1000.0 * (time.perf_counter() - t0))
+        return keep
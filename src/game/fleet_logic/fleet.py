@@ -0,0 +1,198 @@
+"""
+Flota de repartidores en columnas (struct of arrays).
+
+Cada repartidor es un índice i en arreglos paralelos en vez de un objeto:
+
+    x, y            array('d')  posición en píxeles (como Player.x/y)
+    stamina         array('d')  0-100
+    exhausted       array('B')
+    weight          array('d')  peso que lleva encima
+    committed       array('d')  peso de todo lo asignado (lleva + por recoger)
+    phase           array('B')  IDLE | TO_PICKUP | TO_DROPOFF
+    job             array('i')  fila del catálogo del pedido en curso (-1 = ninguno)
+    due             array('d')  segundo de simulación en que vence la entrega
+    path_i          array('i')  siguiente celda de paths[i] (array('i'))
+
+step() avanza a todos en una sola pasada: sigue el camino celda por celda,
+mueve la caja con sweep_x/sweep_y contra el bitmap de bloqueados (igual que
+Player.move_with_collision) y aplica las reglas de resistencia de Player
+(costo por movimiento, agotamiento y recover_stamina).
+"""
+from __future__ import annotations
+from array import array
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from .. import settings
+from ..map_logic.collision import sweep_x, sweep_y
+from ..player import recover_stamina, stamina_extra
+from .pathing import astar
+
+IDLE, TO_PICKUP, TO_DROPOFF = 0, 1, 2
+
+# Eventos que devuelve step(): (tipo, repartidor, fila del pedido, a_tiempo)
+PICKED, DELIVERED, UNREACHABLE = "picked", "delivered", "unreachable"
+
+Task = Tuple[int, int, int, float]   # (fila, celda pickup, celda dropoff, peso)
+
+
+class Fleet:
+    def __init__(self, game_map, starts: List[int], tiles_per_sec: float = settings.FLEET_TILES_PER_SEC,
+                 arrive_radius: int = 3, delivery_window: float = settings.FLEET_DELIVERY_WINDOW) -> None:
+        self.map = game_map
+        self.w, self.h = game_map.width, game_map.height
+        self.blocked = game_map.blocked
+        self.tiles_per_sec = tiles_per_sec
+        self.arrive_radius = arrive_radius       # como _PICKUP/_DROPOFF_RADIUS_TILES de JobLogic
+        self.delivery_window = delivery_window
+
+        ts = settings.TILE_SIZE
+        half = ts // 2
+        n = self.n = len(starts)
+        self.radius = int(ts * 0.35)
+        self.x = array("d", [c % self.w * ts + half for c in starts])
+        self.y = array("d", [c // self.w * ts + half for c in starts])
+        self.stamina = array("d", [100.0]) * n
+        self.exhausted = array("B", [0]) * n
+        self.weight = array("d", [0.0]) * n
+        self.committed = array("d", [0.0]) * n
+        self.phase = array("B", [IDLE]) * n
+        self.job = array("i", [-1]) * n
+        self.due = array("d", [0.0]) * n
+        self.path_i = array("i", [0]) * n
+        self.paths: List[array] = [array("i") for _ in range(n)]
+        self.tasks: List[Deque[Task]] = [deque() for _ in range(n)]
+        self._current: List[Optional[Task]] = [None] * n
+        self.path_searches = 0
+
+        # Peso de superficie por celda (parques más lentos), como MapLoader.surface_weight
+        surface = getattr(game_map, "surface_weight", None)
+        if surface is None:
+            self._surface = None
+        else:
+            self._surface = array("f", (
+                surface(x * ts + half, y * ts + half) for y in range(self.h) for x in range(self.w)
+            ))
+
+    # --------- Consultas ---------
+    def cell_of(self, i: int) -> int:
+        ts = settings.TILE_SIZE
+        return int(self.y[i] // ts) * self.w + int(self.x[i] // ts)
+
+    def idle(self) -> List[int]:
+        phase = self.phase
+        return [i for i in range(self.n) if phase[i] == IDLE]
+
+    def current_task(self, i: int) -> Optional[Task]:
+        return self._current[i]
+
+    def pending_tasks(self, i: int) -> int:
+        return len(self.tasks[i]) + (self.phase[i] != IDLE)
+
+    # --------- Asignación ---------
+    def assign(self, i: int, row: int, pickup: int, dropoff: int, weight: float, now: float) -> None:
+        """Encola el pedido (fila del catálogo) en el repartidor i; arranca si estaba libre."""
+        self.tasks[i].append((row, pickup, dropoff, weight))
+        self.committed[i] += weight
+        if self.phase[i] == IDLE:
+            self._next_task(i, now, [])
+
+    def _route_to(self, i: int, goal: int) -> bool:
+        path = astar(self.blocked, self.w, self.h, self.cell_of(i), goal)
+        self.path_searches += 1
+        if path is None:
+            return False
+        self.paths[i] = path
+        self.path_i[i] = 0
+        return True
+
+    def _next_task(self, i: int, now: float, events: list) -> None:
+        tasks = self.tasks[i]
+        while tasks:
+            task = tasks.popleft()
+            if self._route_to(i, task[1]):
+                self._current[i] = task
+                self.job[i] = task[0]
+                self.phase[i] = TO_PICKUP
+                return
+            self.committed[i] -= task[3]
+            events.append((UNREACHABLE, i, task[0], False))
+        self._current[i] = None
+        self.job[i] = -1
+        self.phase[i] = IDLE
+
+    def _arrive(self, i: int, now: float, events: list) -> None:
+        task = self._current[i]
+        if self.phase[i] == TO_PICKUP:
+            self.weight[i] += task[3]
+            self.due[i] = now + self.delivery_window
+            events.append((PICKED, i, task[0], True))
+            if self._route_to(i, task[2]):
+                self.phase[i] = TO_DROPOFF
+                return
+            self.weight[i] -= task[3]
+            events.append((UNREACHABLE, i, task[0], False))
+        else:
+            self.weight[i] -= task[3]
+            events.append((DELIVERED, i, task[0], now <= self.due[i]))
+        self.committed[i] -= task[3]
+        self._next_task(i, now, events)
+
+    # --------- Paso en lote ---------
+    def step(self, dt: float, now: float, weather: str = "clear", multiplier: float = 1.0) -> List[tuple]:
+        """
+        Avanza dt segundos a toda la flota. `multiplier` es el del clima
+        (WeatherManager.current_multiplier). Devuelve los eventos del paso.
+        """
+        ts = settings.TILE_SIZE
+        half = ts // 2
+        w, h, blocked, r = self.w, self.h, self.blocked, self.radius
+        X, Y, ST, EX, WT = self.x, self.y, self.stamina, self.exhausted, self.weight
+        phase, paths, path_i = self.phase, self.paths, self.path_i
+        surface = self._surface
+        stop_at = self.arrive_radius
+        full_step = self.tiles_per_sec * ts * multiplier * dt
+        # El juego cobra la resistencia por frame movido: acá se escala al paso (dt * FPS frames)
+        frames = dt * settings.FPS
+        events: List[tuple] = []
+
+        for i in range(self.n):
+            st, ex = ST[i], EX[i]
+            if phase[i] != IDLE and not ex:
+                path, k = paths[i], path_i[i]
+                end = len(path) - stop_at
+                x, y = X[i], Y[i]
+                # Igual que Player.get_speed: 80% con poca resistencia
+                budget = full_step * (0.8 if st < 30 else 1.0)
+                if surface is not None:
+                    budget *= surface[int(y // ts) * w + int(x // ts)]
+                moved = False
+                while budget > 0.0 and k < end:
+                    c = path[k]
+                    dx = c % w * ts + half - x
+                    dy = c // w * ts + half - y
+                    d = abs(dx) + abs(dy)
+                    if d > budget:
+                        dx, dy = dx * budget / d, dy * budget / d
+                        d = budget
+                    else:
+                        k += 1
+                    nx = sweep_x(blocked, w, h, ts, x, y, r, dx)
+                    ny = sweep_y(blocked, w, h, ts, nx, y, r, dy)
+                    if nx == x and ny == y:
+                        break  # trabado contra una esquina: lo reintenta el próximo paso
+                    x, y = nx, ny
+                    budget -= d
+                    moved = True
+                X[i], Y[i] = x, y
+                path_i[i] = k
+                if moved:
+                    cost = (0.5 + stamina_extra(WT[i], weather) / 2.5) / 2
+                    st = max(0.0, st - cost * frames)
+                    if st <= 0:
+                        ex = 1
+                if k >= end:
+                    self._arrive(i, now, events)
+            st, ex = recover_stamina(st, ex, dt)
+            ST[i], EX[i] = st, ex
+        return events
@@ -0,0 +1,130 @@
+"""
+Simulación de flota: N repartidores comparten la ciudad y la cola de
+lanzamiento de pedidos (un solo OrderManager, como el del jugador).
+
+Cada tick se lanzan ofertas al ritmo del juego (una cada `offer_interval`
+segundos por repartidor) y avanza la flota; cada DISPATCH_INTERVAL el
+despachador (dispatcher.py) reparte las pendientes en lote. Las ofertas que
+nadie toma vencen a los `offer_ttl` segundos y quedan en el historial como
+rechazadas; las entregas se registran a tiempo o tarde.
+"""
+from __future__ import annotations
+import time
+from typing import Dict, List, Optional
+
+from .. import settings
+from ..jobs_logic.job_loader import JobLoader
+from .dispatcher import AuctionDispatcher, Offer
+from .fleet import DELIVERED, PICKED, UNREACHABLE, Fleet
+
+
+class FleetSim:
+    def __init__(self, game_map, jobs: JobLoader, fleet: Fleet, dispatcher=None,
+                 offer_interval: float = 5.0, offer_ttl: float = 15.0,
+                 dispatch_interval: float = settings.DISPATCH_INTERVAL) -> None:
+        self.map = game_map
+        self.jobs = jobs
+        self.orders = jobs.create_order_manager()
+        self.fleet = fleet
+        # Ritmo del juego (JobLogic._offer_interval / _TIME_TO_EXPIRE) multiplicado por la flota
+        self.offers_per_sec = fleet.n / offer_interval
+        self.offer_ttl = offer_ttl
+        self.now = 0.0
+        self._offer_acc = 0.0
+        self.pending: List[Offer] = []   # (fila, vence, lanzada), por vencimiento
+        self.dispatcher = dispatcher or AuctionDispatcher()
+        self.dispatch_interval = dispatch_interval
+        self._dispatch_acc = 0.0
+        self.weather = "clear"
+        self.multiplier = 1.0
+        self.stats: Dict[str, float] = {
+            "released": 0, "assigned": 0, "expired": 0, "picked": 0,
+            "delivered": 0, "on_time": 0, "late": 0, "unreachable": 0,
+            "step_s": 0.0, "steps": 0,
+        }
+
+    def set_weather(self, condition: str, multiplier: float) -> None:
+        self.weather = condition
+        self.multiplier = multiplier
+
+    # --------- Ofertas ---------
+    def _release(self, dt: float) -> None:
+        self._offer_acc += dt * self.offers_per_sec
+        cat = self.jobs.catalog
+        while self._offer_acc >= 1.0:
+            self._offer_acc -= 1.0
+            job = self.orders.pop_next_job()
+            if job is None:
+                break
+            self.pending.append((cat.index_of[job.id], self.now + self.offer_ttl, self.now))
+            self.stats["released"] += 1
+
+    def _expire(self) -> None:
+        pending, now = self.pending, self.now
+        ids = self.jobs.catalog.ids
+        k = 0
+        while k < len(pending) and pending[k][1] <= now:
+            self.orders.record_offer_result(ids[pending[k][0]], accepted=False, t=now)
+            k += 1
+        if k:
+            del pending[:k]
+            self.stats["expired"] += k
+
+    def _cell(self, x: int, y: int) -> int:
+        return y * self.fleet.w + x
+
+    def dispatch(self) -> None:
+        """Un lote: el despachador devuelve las ofertas que quedan para el próximo."""
+        self.pending = self.dispatcher.dispatch(self, self.pending)
+
+    def assign(self, courier: int, row: int) -> None:
+        cat = self.jobs.catalog
+        self.fleet.assign(courier, row, self._cell(cat.pickup_x[row], cat.pickup_y[row]),
+                          self._cell(cat.dropoff_x[row], cat.dropoff_y[row]), cat.weight[row], self.now)
+        self.stats["assigned"] += 1
+
+    # --------- Tick ---------
+    def tick(self, dt: float) -> List[tuple]:
+        self.now += dt
+        self._release(dt)
+        self._expire()
+        self._dispatch_acc += dt
+        if self._dispatch_acc >= self.dispatch_interval:
+            self._dispatch_acc -= self.dispatch_interval
+            self.dispatch()
+        t0 = time.perf_counter()
+        events = self.fleet.step(dt, self.now, self.weather, self.multiplier)
+        self.stats["step_s"] += time.perf_counter() - t0
+        self.stats["steps"] += 1
+        self._record(events)
+        return events
+
+    def _record(self, events: List[tuple]) -> None:
+        ids = self.jobs.catalog.ids
+        stats = self.stats
+        for kind, _, row, on_time in events:
+            if kind == PICKED:
+                stats["picked"] += 1
+            elif kind == DELIVERED:
+                # Historial compartido: entregado (con payout) a tiempo o tarde
+                self.orders.record_offer_result(ids[row], accepted=True, onTime=on_time, t=self.now)
+                stats["delivered"] += 1
+                stats["on_time" if on_time else "late"] += 1
+            elif kind == UNREACHABLE:
+                stats["unreachable"] += 1
+
+    def run(self, seconds: float, dt: float = settings.FLEET_STEP) -> Dict[str, float]:
+        """Simula `seconds` segundos de juego tan rápido como se pueda."""
+        steps = int(round(seconds / dt))
+        t0 = time.perf_counter()
+        for _ in range(steps):
+            self.tick(dt)
+        wall = time.perf_counter() - t0
+        out = dict(self.stats)
+        out["sim_seconds"] = self.now
+        out["wall_seconds"] = wall
+        out["speedup"] = self.now / wall if wall > 0 else float("inf")
+        out["money"] = self.orders.history.money
+        for key, value in self.dispatcher.metrics.summary().items():
+            out["dispatch_" + key] = value
+        return out
@@ -0,0 +1,51 @@
+"""
+Caminos en la grilla de tiles bloqueados (4 vecinos, costo 1 por tile).
+
+A* con heurística Manhattan y desempate por mayor g, que en una grilla de
+calles expande poco más que el largo del camino. Se usa un dict para g en
+vez de un arreglo por celda: en mapas de 2048x2048 asignar w*h por búsqueda
+costaría más que la búsqueda misma.
+"""
+from __future__ import annotations
+import heapq
+from array import array
+from typing import Optional
+
+
+def astar(blocked, w: int, h: int, start: int, goal: int) -> Optional[array]:
+    """
+    Celdas del camino de `start` a `goal` (sin incluir start) como array('i');
+    vacío si ya está ahí, None si no hay camino.
+    """
+    if start == goal:
+        return array("i")
+    if blocked[goal] or blocked[start]:
+        return None
+    n = w * h
+    gx, gy = goal % w, goal // w
+    g = {start: 0}
+    came = {}
+    heap = [(abs(start % w - gx) + abs(start // w - gy), 0, start)]
+    pop, push = heapq.heappop, heapq.heappush
+    while heap:
+        _, neg_g, c = pop(heap)
+        gc = -neg_g
+        if c == goal:
+            path = array("i")
+            while c != start:
+                path.append(c)
+                c = came[c]
+            path.reverse()
+            return path
+        if gc > g[c]:
+            continue
+        ng = gc + 1
+        x = c % w
+        for nb in (c - 1 if x > 0 else -1, c + 1 if x < w - 1 else -1,
+                   c - w, c + w if c + w < n else -1):
+            if nb < 0 or blocked[nb] or g.get(nb, n) <= ng:
+                continue
+            g[nb] = ng
+            came[nb] = c
+            push(heap, (ng + abs(nb % w - gx) + abs(nb // w - gy), -ng, nb))
+    return None
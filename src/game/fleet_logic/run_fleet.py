@@ -0,0 +1,76 @@
+"""
+Corrida sin ventana de una flota sobre una ciudad sintética.
+
+    python -m src.game.fleet_logic.run_fleet --couriers 1000 --size 256 --seconds 600
+
+Imprime el resumen (entregas, a tiempo, vencidas) y cuántas veces más
+rápido que el tiempo real corrió la simulación.
+"""
+from __future__ import annotations
+import argparse
+import json
+import random
+
+from ..jobs_logic.job_catalog import EPOCH, deadline_to_seconds
+from ..jobs_logic.job_loader import JobLoader
+from ..map_logic.map_loader import MapLoader
+from ..weather_logic.weather import WeatherManager
+from .city import generate_city
+from .dispatcher import AuctionDispatcher, NearestDispatcher
+from .fleet import Fleet
+from .fleet_sim import FleetSim
+
+
+def free_cells(game_map) -> list:
+    return [i for i, b in enumerate(game_map.blocked) if not b]
+
+
+def synthetic_jobs(game_map, count: int, seed: int) -> JobLoader:
+    """Catálogo de `count` pedidos con pickup/dropoff en celdas libres."""
+    rng = random.Random(seed)
+    cells = free_cells(game_map)
+    w = game_map.width
+    base = deadline_to_seconds(EPOCH.replace(year=2025))
+    rows = []
+    for k in range(count):
+        a, b = rng.choice(cells), rng.choice(cells)
+        rows.append((f"F-{k:06d}", a % w, a // w, b % w, b // w,
+                     float(rng.randint(100, 300)), float(rng.choice((0.5, 1, 1, 2, 3))),
+                     base + k * 60.0, rng.randint(0, 2), k))
+    loader = JobLoader()
+    loader.catalog.add_rows(rows)
+    return loader
+
+
+DISPATCHERS = {"auction": AuctionDispatcher, "nearest": NearestDispatcher}
+
+
+def build(couriers: int, size: int, jobs: int, seed: int, dispatch: str = "auction") -> FleetSim:
+    game_map = MapLoader().load_payload(generate_city(size, size, seed))
+    rng = random.Random(seed + 1)
+    cells = free_cells(game_map)
+    fleet = Fleet(game_map, [rng.choice(cells) for _ in range(couriers)])
+    return FleetSim(game_map, synthetic_jobs(game_map, jobs, seed), fleet, DISPATCHERS[dispatch]())
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.game.fleet_logic.run_fleet")
+    parser.add_argument("--couriers", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=256, help="lado del mapa en tiles")
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--seconds", type=float, default=300.0, help="segundos de juego a simular")
+    parser.add_argument("--weather", default="clear", choices=sorted(WeatherManager.BASE_MULTIPLIERS))
+    parser.add_argument("--dispatch", default="auction", choices=sorted(DISPATCHERS))
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    sim = build(args.couriers, args.size, args.jobs, args.seed, args.dispatch)
+    sim.set_weather(args.weather, WeatherManager.BASE_MULTIPLIERS[args.weather])
+    out = sim.run(args.seconds)
+    out["step_ms"] = 1000.0 * out.pop("step_s") / max(1, out["steps"])
+    out["path_searches"] = sim.fleet.path_searches
+    print(json.dumps({k: round(v, 3) if isinstance(v, float) else v for k, v in out.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
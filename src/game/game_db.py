@@ -0,0 +1,334 @@
+"""
+Persistencia opcional en SQLite (`PERSISTENCE_BACKEND = "sqlite"`).
+
+Un solo archivo `data/courier_quest.db` con:
+    scores  puntajes (índices por score y por fecha)
+    saves   partidas como BLOB (formato de save_format) + columnas de metadatos
+    runs    resumen de cada partida jugada, armado desde OrderManager.history
+
+Usa WAL, así varias instancias del juego (kiosco) leen mientras otra escribe.
+Todas las escrituras van a una cola que vacía un hilo escritor propio,
+agrupando lo pendiente en una sola transacción; el hilo del juego nunca
+espera al disco. Las lecturas usan una conexión por hilo.
+
+DbLeaderboard y DbSaveIndex exponen la misma interfaz que Leaderboard y
+SaveIndex, así GameOverLogic, el menú y el autosave no saben qué backend hay.
+"""
+from __future__ import annotations
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from . import settings
+from .save_format import decode_save, encode_save
+from .save_index import meta_from_state
+
+DEFAULT_DB_PATH = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "courier_quest.db")
+)
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL,
+    score       REAL NOT NULL,
+    created_at  REAL NOT NULL,
+    run_id      TEXT
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores(score DESC, id);
+CREATE INDEX IF NOT EXISTS scores_by_date  ON scores(created_at);
+CREATE INDEX IF NOT EXISTS scores_by_name  ON scores(name, score DESC);
+
+CREATE TABLE IF NOT EXISTS saves (
+    name        TEXT PRIMARY KEY,
+    saved_at    REAL NOT NULL,
+    money       REAL,
+    reputation  INTEGER,
+    time_left   REAL,
+    thumb_w     INTEGER,
+    thumb_h     INTEGER,
+    thumb       BLOB,
+    data        BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS saves_by_date ON saves(saved_at DESC);
+
+CREATE TABLE IF NOT EXISTS runs (
+    id          TEXT PRIMARY KEY,
+    started_at  REAL,
+    ended_at    REAL NOT NULL,
+    won         INTEGER NOT NULL,
+    score       REAL,
+    money       REAL,
+    reputation  INTEGER,
+    time_left   REAL,
+    delivered   INTEGER,
+    on_time     INTEGER,
+    late        INTEGER,
+    rejected    INTEGER,
+    player_name TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_end ON runs(ended_at);
+"""
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def summarize_run(history: Iterable, **fields) -> dict:
+    """
+    Resumen de una partida a partir del historial de OrderManager
+    (accepted=True son entregas, False rechazos/expirados) más los campos dados.
+    Con un HistoryLog usa sus totales acumulados en vez de recorrerlo.
+    """
+    delivered = on_time = rejected = 0
+    if hasattr(history, "on_time_rate"):
+        delivered, on_time, rejected = history.delivered, history.on_time, history.rejected
+        history = ()
+    for h in history:
+        if h.accepted:
+            delivered += 1
+            on_time += 1 if h.onTime else 0
+        else:
+            rejected += 1
+    summary = dict(fields)
+    summary.update(delivered=delivered, on_time=on_time, late=delivered - on_time, rejected=rejected)
+    return summary
+
+
+class GameDatabase:
+    def __init__(self, path: str = DEFAULT_DB_PATH, batch_size: int = settings.SQLITE_BATCH_SIZE) -> None:
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # El esquema se crea sincrónicamente para que las lecturas funcionen desde ya
+        conn = _connect(path)
+        with conn:
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        conn.close()
+
+        self._local = threading.local()
+        self._writes: "queue.Queue[Optional[Callable]]" = queue.Queue()
+        self.last_error: Optional[Exception] = None
+        self._writer = threading.Thread(target=self._writer_loop, name="sqlite-writer", daemon=True)
+        self._writer.start()
+
+    # --------- Conexiones ---------
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.path)
+        return conn
+
+    def _writer_loop(self) -> None:
+        conn = _connect(self.path)
+        while True:
+            job = self._writes.get()
+            if job is None:
+                self._writes.task_done()
+                break
+            batch = [job]
+            stop = False
+            # Agrupa lo que ya esté encolado en la misma transacción
+            while len(batch) < self.batch_size:
+                try:
+                    nxt = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                for fn in batch:
+                    fn(conn)
+                conn.execute("COMMIT")
+            except Exception as e:
+                self.last_error = e
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+            if stop:
+                self._writes.task_done()
+                break
+        conn.close()
+
+    def _submit(self, fn: Callable[[sqlite3.Connection], None]) -> None:
+        self._writes.put(fn)
+
+    def flush(self) -> None:
+        """Espera a que el escritor haya confirmado todo lo encolado."""
+        self._writes.join()
+
+    def close(self) -> None:
+        self._writes.put(None)
+        self._writer.join(5.0)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # --------- Puntajes ---------
+    def add_score(self, name: str, score: float, run_id: Optional[str] = None) -> None:
+        created = time.time()
+
+        def write(conn):
+            conn.execute("INSERT INTO scores(name, score, created_at, run_id) VALUES (?, ?, ?, ?)",
+                         (name, float(score), created, run_id))
+            if run_id is not None:
+                conn.execute("UPDATE runs SET player_name = ? WHERE id = ?", (name, run_id))
+        self._submit(write)
+
+    def top_scores(self, k: int, since: Optional[float] = None) -> List[Tuple[str, float, float]]:
+        """(nombre, puntaje, fecha) de los k mejores, opcionalmente desde `since` (epoch)."""
+        if since is None:
+            sql = "SELECT name, score, created_at FROM scores ORDER BY score DESC, id LIMIT ?"
+            args: tuple = (k,)
+        else:
+            sql = ("SELECT name, score, created_at FROM scores WHERE created_at >= ? "
+                   "ORDER BY score DESC, id LIMIT ?")
+            args = (since, k)
+        return self._reader().execute(sql, args).fetchall()
+
+    def top_this_week(self, k: int = 10) -> List[Tuple[str, float, float]]:
+        return self.top_scores(k, since=time.time() - 7 * 24 * 3600)
+
+    def best_per_player(self, k: int = 10) -> List[Tuple[str, float, int]]:
+        """(nombre, mejor puntaje, partidas registradas) por jugador."""
+        return self._reader().execute(
+            "SELECT name, MAX(score) AS best, COUNT(*) FROM scores GROUP BY name ORDER BY best DESC LIMIT ?",
+            (k,),
+        ).fetchall()
+
+    def score_rank(self, score: float) -> int:
+        """Rango que tendría un puntaje nuevo (empata por detrás, como Leaderboard)."""
+        (n,) = self._reader().execute("SELECT COUNT(*) FROM scores WHERE score >= ?", (float(score),)).fetchone()
+        return n + 1
+
+    def score_count(self) -> int:
+        return self._reader().execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    # --------- Partidas ---------
+    def put_save(self, name: str, state: dict, thumb=None) -> None:
+        """Encola el guardado; la compresión también corre en el hilo escritor."""
+        saved_at = time.time()
+
+        def write(conn):
+            meta = meta_from_state(state)
+            (tw, th), rgb = thumb if thumb else ((None, None), None)
+            conn.execute(
+                "INSERT OR REPLACE INTO saves(name, saved_at, money, reputation, time_left, thumb_w, thumb_h, thumb, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, saved_at, meta["money"], meta["reputation"], meta["time_left"],
+                 tw, th, zlib.compress(rgb, 9) if rgb else None, encode_save(state)),
+            )
+        self._submit(write)
+
+    def delete_save(self, name: str) -> None:
+        self._submit(lambda conn: conn.execute("DELETE FROM saves WHERE name = ?", (name,)))
+
+    def get_save(self, name: str) -> Optional[dict]:
+        row = self._reader().execute("SELECT data FROM saves WHERE name = ?", (name,)).fetchone()
+        return decode_save(row[0]) if row else None
+
+    def list_saves(self) -> List[dict]:
+        """Metadatos de todas las partidas (sin leer los BLOB de estado), más recientes primero."""
+        rows = self._reader().execute(
+            "SELECT name, saved_at, money, reputation, time_left, thumb_w, thumb_h, thumb "
+            "FROM saves ORDER BY saved_at DESC"
+        ).fetchall()
+        return [
+            {
+                "name": name, "saved_at": saved_at, "money": money, "reputation": reputation,
+                "time_left": time_left, "thumb": [tw, th, thumb] if thumb else None,
+            }
+            for name, saved_at, money, reputation, time_left, tw, th, thumb in rows
+        ]
+
+    # --------- Partidas jugadas ---------
+    def record_run(self, run_id: str, summary: dict) -> None:
+        ended_at = time.time()
+
+        def write(conn):
+            conn.execute(
+                "INSERT OR REPLACE INTO runs(id, started_at, ended_at, won, score, money, reputation, time_left, "
+                "delivered, on_time, late, rejected) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, summary.get("started_at"), ended_at, int(bool(summary.get("won"))),
+                 summary.get("score"), summary.get("money"), summary.get("reputation"), summary.get("time_left"),
+                 summary.get("delivered", 0), summary.get("on_time", 0), summary.get("late", 0),
+                 summary.get("rejected", 0)),
+            )
+        self._submit(write)
+
+    def recent_runs(self, k: int = 10) -> List[tuple]:
+        return self._reader().execute(
+            "SELECT id, ended_at, won, score, delivered, on_time, late, rejected, player_name "
+            "FROM runs ORDER BY ended_at DESC LIMIT ?", (k,)
+        ).fetchall()
+
+
+class DbLeaderboard:
+    """Misma interfaz que statistics_logic.leaderboard.Leaderboard, sobre la tabla scores."""
+    def __init__(self, db: GameDatabase) -> None:
+        self.db = db
+        self.run_id: Optional[str] = None   # partida a la que se asocia el próximo add()
+
+    def load(self) -> None:
+        pass
+
+    def refresh(self) -> None:
+        self.db.flush()
+
+    def __len__(self) -> int:
+        return self.db.score_count()
+
+    def top(self, k: int) -> List[Tuple[int, str, float]]:
+        return [(i + 1, name, score) for i, (name, score, _) in enumerate(self.db.top_scores(k))]
+
+    def rank_of(self, score: float) -> int:
+        return self.db.score_rank(score)
+
+    def add(self, name: str, score: float) -> int:
+        score = float(round(score, settings.GO_SCORE_DECIMALS))
+        rank = self.db.score_rank(score)
+        self.db.add_score(name, score, self.run_id)
+        return rank
+
+
+class DbSaveIndex:
+    """Misma interfaz que save_index.SaveIndex; update() además guarda la partida."""
+    def __init__(self, db: GameDatabase) -> None:
+        self.db = db
+
+    def entries(self) -> List[dict]:
+        self.db.flush()
+        return self.db.list_saves()
+
+    def get(self, name: str) -> Optional[dict]:
+        return next((e for e in self.entries() if e["name"] == name), None)
+
+    def update(self, name: str, state: dict, thumb=None) -> None:
+        self.db.put_save(name, state, thumb)
+
+    def remove(self, name: str) -> None:
+        self.db.delete_save(name)
+
+    def rebuild(self) -> None:
+        pass
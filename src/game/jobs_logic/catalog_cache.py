@@ -0,0 +1,228 @@
+"""
+Cache binario del catálogo de pedidos (`data/cache/*.cqcat`), abierto con mmap.
+
+    header   "<4sBBHI20s20sQqI"  magic, versión, byteorder, -, n, sha1 del
+             archivo fuente, content_hash del catálogo, tamaño y mtime_ns del
+             fuente, largo de la tabla de IDs
+    columnas pickup_x/y, dropoff_x/y, priority, release_time (int32 × n),
+             payout, weight, deadline (float64 × n), por release (uint32 × n)
+    IDs      offsets (uint32 × n+1), orden por ID (uint32 × n), UTF-8 seguido
+
+Cada sección arranca alineada a 8 bytes. Al abrir no se copia nada: las
+columnas son memoryview.cast sobre el mmap, los IDs se decodifican al
+pedirlos y la búsqueda por ID es binaria sobre el orden guardado, sin armar
+el dict. El sistema operativo trae las páginas recién cuando se leen.
+
+El cache vale mientras el fuente tenga el mismo tamaño y mtime; si cambió
+solo el mtime se compara el sha1 (y se reusa si coincide).
+"""
+from __future__ import annotations
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterator, Optional
+
+from ..save_format import atomic_write
+from .job_catalog import JobCatalog
+
+CACHE_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data", "cache")
+)
+MAGIC = b"CQCT"
+VERSION = 1
+_HEADER = struct.Struct("<4sBBHI20s20sQqI")
+_BYTEORDER = 0 if sys.byteorder == "little" else 1
+
+_INT_COLS = ("pickup_x", "pickup_y", "dropoff_x", "dropoff_y", "priority", "release_time")
+_FLOAT_COLS = ("payout", "weight", "deadline")
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def cache_path_for(source: str, cache_dir: str = CACHE_DIR) -> str:
+    """Un cache por archivo fuente (nombre + hash corto de la ruta absoluta)."""
+    source = os.path.abspath(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    tag = hashlib.sha1(source.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(cache_dir, f"{stem}-{tag}.cqcat")
+
+
+def file_sha1(path: str) -> bytes:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+class IdTable:
+    """Secuencia de IDs sobre la tabla del cache; decodifica cada uno al pedirlo."""
+    __slots__ = ("_offsets", "_blob")
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, i: int) -> bytes:
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        return self.raw(i).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        blob, offs = self._blob, self._offsets
+        for i in range(len(offs) - 1):
+            yield bytes(blob[offs[i]:offs[i + 1]]).decode("utf-8")
+
+
+class IdIndex:
+    """ID -> fila por búsqueda binaria sobre el orden guardado (sin dict)."""
+    __slots__ = ("_table", "_order")
+
+    def __init__(self, table: IdTable, order: memoryview) -> None:
+        self._table = table
+        self._order = order
+
+    def get(self, job_id, default=None):
+        if not isinstance(job_id, str):
+            return default
+        key = job_id.encode("utf-8")
+        order, raw = self._order, self._table.raw
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if raw(order[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order) and raw(order[lo]) == key:
+            return order[lo]
+        return default
+
+    def __contains__(self, job_id: object) -> bool:
+        return self.get(job_id) is not None
+
+    def __getitem__(self, job_id: str) -> int:
+        i = self.get(job_id)
+        if i is None:
+            raise KeyError(job_id)
+        return i
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+def write_cache(path: str, catalog: JobCatalog, source: str, content_hash: str,
+                source_sha: Optional[bytes] = None) -> None:
+    n = len(catalog)
+    encoded = [jid.encode("utf-8") for jid in catalog.ids]
+    offsets = array("I", [0])
+    total = 0
+    for b in encoded:
+        total += len(b)
+        offsets.append(total)
+    id_order = array("I", sorted(range(n), key=encoded.__getitem__))
+    rel = catalog.release_time
+    by_release = array("I", sorted(range(n), key=rel.__getitem__))
+
+    st = os.stat(source)
+    header = _HEADER.pack(
+        MAGIC, VERSION, _BYTEORDER, 0, n,
+        source_sha or file_sha1(source), bytes.fromhex(content_hash),
+        st.st_size, st.st_mtime_ns, total,
+    )
+    parts = [header]
+    size = len(header)
+
+    def add(blob: bytes) -> None:
+        nonlocal size
+        pad = _align(size) - size
+        if pad:
+            parts.append(b"\0" * pad)
+            size += pad
+        parts.append(blob)
+        size += len(blob)
+
+    for name in _INT_COLS:
+        add(array("i", getattr(catalog, name)).tobytes())
+    for name in _FLOAT_COLS:
+        add(array("d", getattr(catalog, name)).tobytes())
+    add(by_release.tobytes())
+    add(offsets.tobytes())
+    add(id_order.tobytes())
+    add(b"".join(encoded))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, b"".join(parts))
+
+
+def _refresh_stamp(path: str, mm: mmap.mmap, source: str) -> None:
+    """El fuente se tocó pero no cambió: actualiza mtime en el header (sin reescribir)."""
+    try:
+        st = os.stat(source)
+        with open(path, "r+b") as f:
+            fields = list(_HEADER.unpack(mm[:_HEADER.size]))
+            fields[8] = st.st_mtime_ns
+            f.write(_HEADER.pack(*fields))
+    except OSError:
+        pass
+
+
+def open_cache(path: str, source: str, catalog: JobCatalog) -> Optional[str]:
+    """
+    Si el cache de `source` está al día, conecta `catalog` a él (columnas de
+    solo lectura sobre el mmap) y devuelve el content_hash guardado; si no, None.
+    """
+    try:
+        st = os.stat(source)
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mm) < _HEADER.size:
+        return None
+    magic, version, order, _, n, sha, chash, src_size, src_mtime, blob_len = _HEADER.unpack(mm[:_HEADER.size])
+    if magic != MAGIC or version != VERSION or order != _BYTEORDER or src_size != st.st_size:
+        return None
+    if src_mtime != st.st_mtime_ns:
+        if file_sha1(source) != sha:
+            return None
+        _refresh_stamp(path, mm, source)
+
+    buf = memoryview(mm)
+    pos = _HEADER.size
+    cols = {}
+
+    def take(nbytes: int, fmt: str) -> memoryview:
+        nonlocal pos
+        pos = _align(pos)
+        view = buf[pos:pos + nbytes]
+        pos += nbytes
+        if len(view) != nbytes:
+            raise ValueError("cache truncado")
+        return view.cast(fmt) if fmt != "B" else view
+
+    try:
+        for name in _INT_COLS:
+            cols[name] = take(4 * n, "i")
+        for name in _FLOAT_COLS:
+            cols[name] = take(8 * n, "d")
+        by_release = take(4 * n, "I")
+        offsets = take(4 * (n + 1), "I")
+        id_order = take(4 * n, "I")
+        blob = take(blob_len, "B")
+    except ValueError:
+        return None
+
+    table = IdTable(offsets, blob)
+    catalog.attach(cols, table, IdIndex(table, id_order), by_release, mm)
+    return chash.hex()
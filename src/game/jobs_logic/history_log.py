@@ -0,0 +1,155 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+
+@dataclass(slots=True)
+class HistoryEntry:
+    job_id: str
+    accepted: bool
+    onTime: bool = False
+
+
+# Bits de la columna de flags
+F_ACCEPTED = 1
+F_ON_TIME = 2
+
+
+class HistoryLog:
+    """
+    Historial de ofertas/entregas en columnas (solo append).
+
+        _job    array('i')  índice del job en la tabla interna de IDs
+        _flags  array('B')  F_ACCEPTED | F_ON_TIME
+        _t      array('f')  segundos de juego en que ocurrió
+
+    Unos 9 bytes por registro, más 4 por entrega en _on_time_prefix (conteo
+    acumulado de entregas a tiempo) para responder ventanas en O(1).
+    Lleva al día los totales (dinero, entregas, a tiempo, rechazos), así
+    getMoney() y el resumen de partida no recorren el historial.
+
+    Iterar o indexar devuelve HistoryEntry, como la lista de antes.
+    """
+    __slots__ = ("_ids", "_id_index", "_job", "_flags", "_t", "_on_time_prefix",
+                 "money", "delivered", "on_time", "rejected")
+
+    def __init__(self) -> None:
+        self._ids: List[str] = []
+        self._id_index: Dict[str, int] = {}
+        self._job = array("i")
+        self._flags = array("B")
+        self._t = array("f")
+        self._on_time_prefix = array("I", [0])
+        self.money = 0.0
+        self.delivered = 0
+        self.on_time = 0
+        self.rejected = 0
+
+    # --------- Escritura ---------
+    def _intern(self, job_id: str) -> int:
+        idx = self._id_index.get(job_id)
+        if idx is None:
+            idx = self._id_index[job_id] = len(self._ids)
+            self._ids.append(job_id)
+        return idx
+
+    def append(self, job_id: str, accepted: bool, onTime: bool = False, payout: float = 0.0, t: float = 0.0) -> None:
+        self._job.append(self._intern(job_id))
+        self._flags.append((F_ACCEPTED if accepted else 0) | (F_ON_TIME if onTime else 0))
+        self._t.append(t)
+        if accepted:
+            self.money += payout
+            self.delivered += 1
+            if onTime:
+                self.on_time += 1
+            self._on_time_prefix.append(self.on_time)
+        else:
+            self.rejected += 1
+
+    def clear(self) -> None:
+        self.__init__()
+
+    # --------- Lectura ---------
+    def __len__(self) -> int:
+        return len(self._job)
+
+    def __bool__(self) -> bool:
+        return bool(self._job)
+
+    def _entry(self, i: int) -> HistoryEntry:
+        f = self._flags[i]
+        return HistoryEntry(job_id=self._ids[self._job[i]], accepted=bool(f & F_ACCEPTED), onTime=bool(f & F_ON_TIME))
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        ids = self._ids
+        for j, f in zip(self._job, self._flags):
+            yield HistoryEntry(job_id=ids[j], accepted=bool(f & F_ACCEPTED), onTime=bool(f & F_ON_TIME))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(len(self._job)))]
+        if index < 0:
+            index += len(self._job)
+        if not 0 <= index < len(self._job):
+            raise IndexError("history index out of range")
+        return self._entry(index)
+
+    def time_of(self, index: int) -> float:
+        return self._t[index]
+
+    @property
+    def late(self) -> int:
+        return self.delivered - self.on_time
+
+    def on_time_rate(self, last_n: Optional[int] = None) -> float:
+        """Fracción de entregas a tiempo, total o sobre las últimas `last_n` entregas."""
+        prefix = self._on_time_prefix
+        n = self.delivered if last_n is None else max(0, min(int(last_n), self.delivered))
+        if n == 0:
+            return 0.0
+        return (prefix[-1] - prefix[-1 - n]) / n
+
+    def job_ids(self) -> List[str]:
+        """IDs distintos que aparecen en el historial."""
+        return list(self._ids)
+
+    # --------- Guardado ---------
+    def save_state(self) -> dict:
+        """Columnas como listas (el log de guardado las extiende en vez de reescribirlas)."""
+        return {
+            "ids": list(self._ids),
+            "job": self._job.tolist(),
+            "flags": self._flags.tolist(),
+            "t": [round(t, 3) for t in self._t],
+        }
+
+    @classmethod
+    def from_state(cls, data, payout_of) -> "HistoryLog":
+        """
+        Reconstruye desde save_state() o desde el formato viejo (lista de
+        {"job_id", "accepted", "onTime"}). `payout_of(job_id)` rehace el dinero.
+        """
+        log = cls()
+        if isinstance(data, dict):
+            ids = list(data.get("ids", []))
+            times = data.get("t") or []
+            for k, (j, f) in enumerate(zip(data.get("job", []), data.get("flags", []))):
+                jid = ids[j]
+                accepted = bool(f & F_ACCEPTED)
+                log.append(jid, accepted, bool(f & F_ON_TIME),
+                           payout_of(jid) if accepted else 0.0,
+                           float(times[k]) if k < len(times) else 0.0)
+        else:
+            for h in data or []:
+                accepted = bool(h["accepted"])
+                log.append(h["job_id"], accepted, bool(h["onTime"]),
+                           payout_of(h["job_id"]) if accepted else 0.0)
+        return log
+
+    @staticmethod
+    def referenced_ids(data) -> List[str]:
+        """IDs que referencia un historial guardado, en cualquiera de los dos formatos."""
+        if isinstance(data, dict):
+            return list(data.get("ids", []))
+        return [h["job_id"] for h in data or []]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class IndexedInventory:
+    """
+    Inventario ordenado con acceso O(1) por ID.
+
+    Lista de slots + dict ID -> posición. Borrar deja un hueco (None) en vez
+    de correr la lista; cuando los huecos superan a los vivos se compacta
+    (O(1) amortizado). Conserva el orden que ve el jugador y permite
+    reordenar intercambiando vecinos sin mover el resto.
+
+    Se comporta como la lista de IDs que era antes: `in`, len(), iteración,
+    índices/slices, append() y remove() (ValueError si no está).
+    """
+    __slots__ = ("_slots", "_pos", "_holes", "_head")
+
+    def __init__(self, ids: Iterable[str] = ()) -> None:
+        self._slots: List[Optional[str]] = []
+        self._pos: Dict[str, int] = {}
+        self._holes = 0
+        self._head = 0          # primer slot que puede estar vivo
+        for jid in ids:
+            self.append(jid)
+
+    # --------- Lectura ---------
+    def __contains__(self, job_id: object) -> bool:
+        return job_id in self._pos
+
+    def __len__(self) -> int:
+        return len(self._pos)
+
+    def __bool__(self) -> bool:
+        return bool(self._pos)
+
+    def __iter__(self) -> Iterator[str]:
+        for jid in self._slots:
+            if jid is not None:
+                yield jid
+
+    def __getitem__(self, index):
+        if self._holes:
+            self._compact()
+        return self._slots[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IndexedInventory):
+            other = list(other)
+        return isinstance(other, list) and list(self) == other
+
+    def __repr__(self) -> str:
+        return f"IndexedInventory({list(self)!r})"
+
+    def first(self) -> Optional[str]:
+        """Primer ID en orden (None si está vacío)."""
+        slots = self._slots
+        while self._head < len(slots) and slots[self._head] is None:
+            self._head += 1
+        return slots[self._head] if self._head < len(slots) else None
+
+    def index(self, job_id: str) -> int:
+        if job_id not in self._pos:
+            raise ValueError(f"{job_id} no está en el inventario")
+        if self._holes:
+            self._compact()
+        return self._pos[job_id]
+
+    # --------- Escritura ---------
+    def append(self, job_id: str) -> None:
+        if job_id in self._pos:
+            return
+        self._pos[job_id] = len(self._slots)
+        self._slots.append(job_id)
+
+    def remove(self, job_id: str) -> None:
+        i = self._pos.pop(job_id, None)
+        if i is None:
+            raise ValueError(f"{job_id} no está en el inventario")
+        if i == len(self._slots) - 1:
+            self._slots.pop()
+        else:
+            self._slots[i] = None
+            self._holes += 1
+            if self._holes > len(self._pos):
+                self._compact()
+        if not self._pos:
+            self.clear()
+
+    def clear(self) -> None:
+        self._slots.clear()
+        self._pos.clear()
+        self._holes = 0
+        self._head = 0
+
+    def swap(self, a: str, b: str) -> None:
+        """Intercambia de lugar dos IDs (O(1))."""
+        ia, ib = self._pos[a], self._pos[b]
+        self._slots[ia], self._slots[ib] = b, a
+        self._pos[a], self._pos[b] = ib, ia
+        self._head = min(self._head, ia, ib)
+
+    def move(self, job_id: str, delta: int) -> bool:
+        """
+        Mueve un ID un lugar hacia adelante (delta < 0) o atrás (delta > 0)
+        intercambiándolo con su vecino vivo. False si ya está en el borde.
+        """
+        if job_id not in self._pos or delta == 0:
+            return False
+        step = -1 if delta < 0 else 1
+        slots = self._slots
+        j = self._pos[job_id] + step
+        while 0 <= j < len(slots) and slots[j] is None:
+            j += step
+        if not 0 <= j < len(slots):
+            return False
+        self.swap(job_id, slots[j])
+        return True
+
+    def _compact(self) -> None:
+        live = [jid for jid in self._slots if jid is not None]
+        self._slots = live
+        self._pos = {jid: i for i, jid in enumerate(live)}
+        self._holes = 0
+        self._head = 0
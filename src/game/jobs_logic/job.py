@@ -3,41 +3,12 @@ from dataclasses import dataclass
 from typing import Tuple, Dict, Any, Optional
 from datetime import datetime, timezone
 
-@dataclass(slots=True)
-class Job:
-    id: str
-    pickup: Tuple[int, int]          # (x, y)
-    dropoff: Tuple[int, int]         # (x, y)
-    payout: float
-    deadline: datetime               # naive (UTC-normalized) para cálculos simples
-    weight: float
-    priority: int                    # 0 = normal; mayor => más urgente
-    release_time: int                # segundos desde t=0 del juego
-
-    # ---------- Constructores ----------
-    @staticmethod
-    def _parse_deadline(value: str) -> datetime:
-        """
-        Admite ISO 8601: 'YYYY-MM-DDTHH:MM:SS' opcionalmente con 'Z' o '+/-HH:MM'.
-        Normaliza a UTC y retorna naive (tzinfo=None) para facilitar comparaciones.
-        """
-        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-        if dt.tzinfo:
-            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
-        return dt
-
-    @classmethod
-    def from_dict(cls, d: Dict[str, Any]) -> "Job":
-        return cls(
-            id=d["id"],
-            pickup=tuple(d["pickup"]),
-            dropoff=tuple(d["dropoff"]),
-            payout=float(d["payout"]),
-            deadline=cls._parse_deadline(d["deadline"]),
-            weight=float(d["weight"]),
-            priority=int(d["priority"]),
-            release_time=int(d["release_time"]),
-        )
+class JobMethods:
+    """
+    Lógica común a Job y a JobView (catálogo en columnas): solo lee los
+    atributos id/pickup/dropoff/payout/deadline/weight/priority/release_time.
+    """
+    __slots__ = ()
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -93,3 +64,40 @@ class Job:
         assert isinstance(self.dropoff, tuple) and len(self.dropoff) == 2
         assert self.payout >= 0
         assert self.weight >= 0
+
+
+@dataclass(slots=True)
+class Job(JobMethods):
+    id: str
+    pickup: Tuple[int, int]          # (x, y)
+    dropoff: Tuple[int, int]         # (x, y)
+    payout: float
+    deadline: datetime               # naive (UTC-normalized) para cálculos simples
+    weight: float
+    priority: int                    # 0 = normal; mayor => más urgente
+    release_time: int                # segundos desde t=0 del juego
+
+    # ---------- Constructores ----------
+    @staticmethod
+    def _parse_deadline(value: str) -> datetime:
+        """
+        Admite ISO 8601: 'YYYY-MM-DDTHH:MM:SS' opcionalmente con 'Z' o '+/-HH:MM'.
+        Normaliza a UTC y retorna naive (tzinfo=None) para facilitar comparaciones.
+        """
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if dt.tzinfo:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Job":
+        return cls(
+            id=d["id"],
+            pickup=tuple(d["pickup"]),
+            dropoff=tuple(d["dropoff"]),
+            payout=float(d["payout"]),
+            deadline=cls._parse_deadline(d["deadline"]),
+            weight=float(d["weight"]),
+            priority=int(d["priority"]),
+            release_time=int(d["release_time"]),
+        )
@@ -0,0 +1,308 @@
+from __future__ import annotations
+import heapq
+from array import array
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .job import Job, JobMethods
+
+# Los deadlines se guardan como segundos desde esta fecha (naive, UTC normalizado)
+EPOCH = datetime(1970, 1, 1)
+
+
+def deadline_to_seconds(dt: datetime) -> float:
+    return (dt - EPOCH).total_seconds()
+
+
+def seconds_to_deadline(s: float) -> datetime:
+    return EPOCH + timedelta(seconds=s)
+
+
+_DAY_SECONDS: Dict[str, float] = {}   # 'YYYY-MM-DD' -> segundos desde EPOCH
+
+
+def parse_deadline_seconds(value: str) -> float:
+    """
+    Deadline ISO 8601 -> segundos desde EPOCH (como Job._parse_deadline).
+    El caso común 'YYYY-MM-DDTHH:MM:SS[Z]' se resuelve sin fromisoformat:
+    la fecha se cachea (los pedidos comparten pocos días) y la hora se suma.
+    """
+    n = len(value)
+    if (n == 19 or (n == 20 and value[19] == "Z")) and value[10] == "T" and value[13] == ":" and value[16] == ":":
+        day = value[:10]
+        base = _DAY_SECONDS.get(day)
+        if base is None:
+            if len(_DAY_SECONDS) > 4096:
+                _DAY_SECONDS.clear()
+            base = _DAY_SECONDS[day] = deadline_to_seconds(datetime.strptime(day, "%Y-%m-%d"))
+        try:
+            h, m, s = int(value[11:13]), int(value[14:16]), int(value[17:19])
+        except ValueError:
+            h = 99
+        if h < 24 and m < 60 and s < 60:
+            return base + h * 3600 + m * 60 + s
+    return deadline_to_seconds(Job._parse_deadline(value))
+
+
+class JobView(JobMethods):
+    """
+    Job de solo lectura respaldado por una fila de JobCatalog (dos punteros
+    por instancia). Tiene los mismos atributos y métodos que Job.
+    """
+    __slots__ = ("_cat", "_i")
+
+    def __init__(self, catalog: "JobCatalog", index: int) -> None:
+        self._cat = catalog
+        self._i = index
+
+    @property
+    def index(self) -> int:
+        return self._i
+
+    @property
+    def id(self) -> str:
+        return self._cat.ids[self._i]
+
+    @property
+    def pickup(self) -> Tuple[int, int]:
+        c, i = self._cat, self._i
+        return (c.pickup_x[i], c.pickup_y[i])
+
+    @property
+    def dropoff(self) -> Tuple[int, int]:
+        c, i = self._cat, self._i
+        return (c.dropoff_x[i], c.dropoff_y[i])
+
+    @property
+    def payout(self) -> float:
+        return self._cat.payout[self._i]
+
+    @property
+    def deadline(self) -> datetime:
+        return seconds_to_deadline(self._cat.deadline[self._i])
+
+    @property
+    def weight(self) -> float:
+        return self._cat.weight[self._i]
+
+    @property
+    def priority(self) -> int:
+        return self._cat.priority[self._i]
+
+    @property
+    def release_time(self) -> int:
+        return self._cat.release_time[self._i]
+
+    def to_job(self) -> Job:
+        """Copia independiente como Job."""
+        return Job(self.id, self.pickup, self.dropoff, self.payout, self.deadline,
+                   self.weight, self.priority, self.release_time)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, JobView):
+            return self._cat is other._cat and self._i == other._i
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"JobView({self.id!r}, payout={self.payout}, priority={self.priority})"
+
+
+class JobCatalog:
+    """
+    Catálogo de jobs en columnas (array): una fila por job y un mapa id -> fila.
+
+        pickup_x/y, dropoff_x/y, priority, release_time   array('i')
+        payout, weight, deadline (segundos desde EPOCH)   array('d')
+
+    Las operaciones sobre todo el catálogo (ranking por value ratio, filtros
+    por deadline o release) recorren las columnas con zip/map en vez de
+    resolver atributos de un objeto por job.
+
+    Con attach() las columnas pasan a ser memoryviews sobre el cache mmap
+    (catalog_cache); la primera escritura las copia a arrays.
+    """
+    _INT_COLS = ("pickup_x", "pickup_y", "dropoff_x", "dropoff_y", "priority", "release_time")
+    _FLOAT_COLS = ("payout", "weight", "deadline")
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.index_of: Dict[str, int] = {}
+        self.clear()
+
+    def clear(self) -> None:
+        self.ids = []
+        self.index_of = {}
+        self._by_release = None   # permutación por release_time guardada en el cache
+        self._mapped = None       # mmap del cache mientras las columnas lo usen
+        for name in self._INT_COLS:
+            setattr(self, name, array("i"))
+        for name in self._FLOAT_COLS:
+            setattr(self, name, array("d"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # --------- Cache mmap ---------
+    def attach(self, columns: Dict[str, memoryview], ids, index_of, by_release, mapped) -> None:
+        """Usa columnas de solo lectura (memoryview) en vez de arrays propios."""
+        for name, col in columns.items():
+            setattr(self, name, col)
+        self.ids = ids
+        self.index_of = index_of
+        self._by_release = by_release
+        self._mapped = mapped
+
+    @property
+    def is_mapped(self) -> bool:
+        return self._mapped is not None
+
+    def _ensure_writable(self) -> None:
+        """Copia las columnas del mmap a arrays antes de la primera escritura."""
+        if self._mapped is None:
+            return
+        for name in self._INT_COLS + self._FLOAT_COLS:
+            col = array("i" if name in self._INT_COLS else "d")
+            col.frombytes(getattr(self, name).cast("B"))
+            setattr(self, name, col)
+        self.ids = list(self.ids)
+        self.index_of = {jid: i for i, jid in enumerate(self.ids)}
+        self._by_release = None
+        self._mapped = None
+
+    def __contains__(self, job_id: object) -> bool:
+        return job_id in self.index_of
+
+    # --------- Alta ---------
+    def add(self, job_id: str, pickup: Sequence[int], dropoff: Sequence[int], payout: float,
+            deadline_s: float, weight: float, priority: int, release_time: int) -> int:
+        """Agrega (o reemplaza, el último gana) una fila y devuelve su índice."""
+        self._ensure_writable()
+        assert len(pickup) == 2 and len(dropoff) == 2
+        assert payout >= 0 and weight >= 0
+        row = (int(pickup[0]), int(pickup[1]), int(dropoff[0]), int(dropoff[1]), int(priority), int(release_time))
+        frow = (float(payout), float(weight), float(deadline_s))
+        i = self.index_of.get(job_id)
+        if i is None:
+            i = self.index_of[job_id] = len(self.ids)
+            self.ids.append(job_id)
+            for name, v in zip(self._INT_COLS, row):
+                getattr(self, name).append(v)
+            for name, v in zip(self._FLOAT_COLS, frow):
+                getattr(self, name).append(v)
+        else:
+            for name, v in zip(self._INT_COLS, row):
+                getattr(self, name)[i] = v
+            for name, v in zip(self._FLOAT_COLS, frow):
+                getattr(self, name)[i] = v
+        return i
+
+    def add_dict(self, d: Dict[str, Any]) -> int:
+        """Fila desde un dict del API (mismo formato que Job.from_dict)."""
+        return self.add(
+            d["id"], d["pickup"], d["dropoff"], float(d["payout"]),
+            parse_deadline_seconds(d["deadline"]),
+            float(d["weight"]), int(d["priority"]), int(d["release_time"]),
+        )
+
+    def add_rows(self, rows: Sequence[tuple]) -> List[str]:
+        """
+        Tanda de filas ya validadas (job_stream.validate_batch). Las nuevas se
+        agregan con un extend por columna; las repetidas reemplazan su fila.
+        Devuelve los IDs nuevos en orden.
+        """
+        self._ensure_writable()
+        index_of, ids = self.index_of, self.ids
+        base = len(ids)
+        new_rows = []
+        for r in rows:
+            i = index_of.get(r[0])
+            if i is None:
+                index_of[r[0]] = base + len(new_rows)
+                new_rows.append(r)
+            elif i >= base:
+                new_rows[i - base] = r  # repetido dentro de la misma tanda
+            else:
+                (jid, ax, ay, bx, by, payout, weight, dl, prio, rel) = r
+                self.add(jid, (ax, ay), (bx, by), payout, dl, weight, prio, rel)
+        if not new_rows:
+            return []
+        cols = list(zip(*new_rows))
+        new_ids = list(cols[0])
+        ids.extend(new_ids)
+        for name, col in zip(("pickup_x", "pickup_y", "dropoff_x", "dropoff_y", "payout", "weight",
+                              "deadline", "priority", "release_time"), cols[1:]):
+            getattr(self, name).extend(col)
+        return new_ids
+
+    def add_job(self, job: Job) -> int:
+        return self.add(job.id, job.pickup, job.dropoff, job.payout, deadline_to_seconds(job.deadline),
+                        job.weight, job.priority, job.release_time)
+
+    # --------- Vistas ---------
+    def view(self, job_id: str) -> JobView:
+        """KeyError si no existe (igual que el dict de antes)."""
+        return JobView(self, self.index_of[job_id])
+
+    def view_at(self, index: int) -> JobView:
+        return JobView(self, index)
+
+    def __iter__(self) -> Iterator[JobView]:
+        for i in range(len(self.ids)):
+            yield JobView(self, i)
+
+    def _indices(self, ids: Optional[Iterable[str]]) -> List[int]:
+        if ids is None:
+            return list(range(len(self.ids)))
+        index_of = self.index_of
+        return [index_of[jid] for jid in ids]
+
+    # --------- Operaciones sobre columnas ---------
+    def value_ratios(self, player_pos: Tuple[int, int], ids: Optional[Iterable[str]] = None) -> array:
+        """payout / (jugador->pickup + pickup->dropoff) por fila (como Job.value_ratio)."""
+        px, py = player_pos
+        ax, ay, bx, by, pay = self.pickup_x, self.pickup_y, self.dropoff_x, self.dropoff_y, self.payout
+        if ids is None:
+            rows = zip(ax, ay, bx, by, pay)
+        else:
+            rows = ((ax[i], ay[i], bx[i], by[i], pay[i]) for i in self._indices(ids))
+        return array("d", [
+            p / max(1, abs(px - x0) + abs(py - y0) + abs(x0 - x1) + abs(y0 - y1))
+            for x0, y0, x1, y1, p in rows
+        ])
+
+    def top_by_value(self, player_pos: Tuple[int, int], k: int, ids: Optional[Iterable[str]] = None) -> List[str]:
+        """Los k IDs con mejor value ratio (mayor primero)."""
+        idx = self._indices(ids)
+        ratios = self.value_ratios(player_pos, None if ids is None else (self.ids[i] for i in idx))
+        best = heapq.nlargest(k, range(len(idx)), key=ratios.__getitem__)
+        return [self.ids[idx[j]] for j in best]
+
+    def ids_by_priority_then_deadline(self, ids: Optional[Iterable[str]] = None) -> List[str]:
+        """IDs ordenados por prioridad DESC y luego deadline ASC (Job.key_priority_then_deadline)."""
+        prio, dl = self.priority, self.deadline
+        idx = self._indices(ids)
+        idx.sort(key=lambda i: (-prio[i], dl[i]))
+        return [self.ids[i] for i in idx]
+
+    def ids_by_release_time(self) -> List[str]:
+        """Todos los IDs por release_time ASC (estable: empates en orden de carga)."""
+        idx = self._by_release
+        if idx is None:
+            rel = self.release_time
+            idx = sorted(range(len(self.ids)), key=rel.__getitem__)
+        ids = self.ids
+        return [ids[i] for i in idx]
+
+    def ids_with_deadline(self, after: Optional[datetime] = None, before: Optional[datetime] = None) -> List[str]:
+        """IDs con deadline en (after, before]; cualquiera de los dos puede faltar."""
+        lo = float("-inf") if after is None else deadline_to_seconds(after)
+        hi = float("inf") if before is None else deadline_to_seconds(before)
+        ids = self.ids
+        return [ids[i] for i, d in enumerate(self.deadline) if lo < d <= hi]
+
+    def ids_released(self, game_seconds: float) -> List[str]:
+        ids = self.ids
+        return [ids[i] for i, r in enumerate(self.release_time) if r <= game_seconds]
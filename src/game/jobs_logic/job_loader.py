@@ -1,19 +1,27 @@
 from __future__ import annotations
-from typing import Dict, List, Optional, Callable
+from typing import Dict, Iterator, List, Optional, Callable
 from ..api_client import APIClient
 from .job import Job
+from . import catalog_cache
+from .job_catalog import JobCatalog, JobView
 from .job_manager import OrderManager
+from .job_stream import batched, iter_job_dicts, validate_batch
+import hashlib
+import json
 import os
 
 
 class JobLoader:
     """
     Jobs + fábrica de OrderManager.
+    El catálogo vive en columnas (JobCatalog); get() devuelve una JobView.
     """
     def __init__(self, api_client: Optional[APIClient] = None) -> None:
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../..", ".."))
         self.api = api_client or APIClient(base_dir)
-        self._jobs: Dict[str, Job] = {}
+        self.catalog = JobCatalog()
+        self._hash: Optional[str] = None
+        self.stream_rejected = 0  # pedidos inválidos descartados por stream_batches()
 
     # -------- Fetch + carga ----------
     def load_from_api(self) -> None:
@@ -22,11 +30,64 @@ class JobLoader:
         - Valida cada job (Job.validate()).
         """
         jobs_raw = self.api.get_jobs()  # se espera: list[dict] con la estructura del pedido
-        self._jobs.clear()
+        self.load_from_raw(jobs_raw)
+
+    def load_from_raw(self, jobs_raw) -> None:
+        """Carga el catálogo desde una lista de dicts ya descargada (p.ej. WorldData.jobs_raw)."""
+        self.catalog.clear()
+        self._hash = None
         for d in jobs_raw:
-            job = Job.from_dict(d)
-            job.validate()
-            self._jobs[job.id] = job  # último gana
+            self.catalog.add_dict(d)  # valida; último gana
+
+    def stream_batches(self, source, batch_size: int = 1000) -> Iterator[List[str]]:
+        """
+        Vacía el catálogo y lo llena por tandas desde un .jsonl o .json (ruta o
+        archivo abierto), sin cargar todo el archivo. Cada next() lee, valida e
+        incorpora `batch_size` pedidos y devuelve los IDs nuevos.
+        """
+        self.catalog.clear()
+        self._hash = None
+        self.stream_rejected = 0
+        for batch in batched(iter_job_dicts(source), batch_size):
+            rows, rejected = validate_batch(batch)
+            self.stream_rejected += rejected
+            new_ids = self.catalog.add_rows(rows)
+            self._hash = None
+            yield new_ids
+
+    # -------- Cache binario (catalog_cache) ----------
+    def load_cached(self, source: str) -> bool:
+        """Abre el cache mmap de `source` si está al día. True si se usó."""
+        catalog = JobCatalog()
+        content_hash = catalog_cache.open_cache(catalog_cache.cache_path_for(source), source, catalog)
+        if content_hash is None:
+            return False
+        self.catalog = catalog
+        self._hash = content_hash
+        self.stream_rejected = 0
+        return True
+
+    def write_cache(self, source: str) -> bool:
+        """Compila el catálogo actual (leído desde `source`) al cache binario."""
+        try:
+            catalog_cache.write_cache(catalog_cache.cache_path_for(source), self.catalog, source, self.content_hash())
+        except OSError:
+            return False
+        return True
+
+    def load_from_file(self, source: str, batch_size: int = 1000) -> None:
+        """Catálogo completo desde un .jsonl/.json, usando (o creando) el cache binario."""
+        if self.load_cached(source):
+            return
+        for _ in self.stream_batches(source, batch_size):
+            pass
+        self.write_cache(source)
+
+    def add_job(self, job: Job) -> None:
+        """Agrega (o reemplaza) un job suelto en el catálogo."""
+        job.validate()
+        self.catalog.add_job(job)
+        self._hash = None
 
     # -------- Fábrica de OrderManager ----------
     def create_order_manager(self) -> OrderManager:
@@ -47,20 +108,32 @@ class JobLoader:
         return self.create_order_manager()
 
     # -------- Lecturas tipo “repo” (para OrderManager/UI) ----------
-    def get(self, job_id: str) -> Job:
-        return self._jobs[job_id]
+    def get(self, job_id: str) -> JobView:
+        return self.catalog.view(job_id)
 
     def exists(self, job_id: str) -> bool:
-        return job_id in self._jobs
+        return job_id in self.catalog
 
     def all_ids(self) -> List[str]:
-        return list(self._jobs.keys())
+        return list(self.catalog.ids)
 
     def snapshot_ids(self) -> List[str]:
-        return list(self._jobs.keys())
+        return list(self.catalog.ids)
+
+    def ids_by_release_time(self) -> List[str]:
+        return self.catalog.ids_by_release_time()
 
     def size(self) -> int:
-        return len(self._jobs)
+        return len(self.catalog)
+
+    def filter_ids(self, predicate: Callable[[JobView], bool]) -> List[str]:
+        return [job.id for job in self.catalog if predicate(job)]
 
-    def filter_ids(self, predicate: Callable[[Job], bool]) -> List[str]:
-        return [jid for jid, job in self._jobs.items() if predicate(job)]
+    def content_hash(self) -> str:
+        """Hash del catálogo cargado; las partidas guardan este hash en vez de los jobs."""
+        if self._hash is None:
+            h = hashlib.sha1()
+            for jid in sorted(self.catalog.ids):
+                h.update(json.dumps(self.catalog.view(jid).to_dict(), sort_keys=True).encode("utf-8"))
+            self._hash = h.hexdigest()
+        return self._hash
@@ -2,14 +2,20 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Tuple, Dict, Any, Optional
 import pygame
-import os
+import threading
 from collections import deque
 from dataclasses import asdict
 
+from .. import settings
+from ..assets import load_image
+from ..profiler import FRAME_PROFILER
+from ..world_data import WorldData, load_world
 from .job_loader import JobLoader
 from .job import Job
 
-from .job_manager import HistoryEntry
+from .history_log import HistoryEntry, HistoryLog
+from .route_planner import RoutePlan, Stop
+from .offer_advisor import OfferAdvisor
 # ---- Marcadores en pantalla ----
 @dataclass
 class PickupMarker:
@@ -34,12 +40,21 @@ class JobLogic:
     _PICKUP_RADIUS_TILES = 3
     _DROPOFF_RADIUS_TILES = 3
 
-    def __init__(self, tile_size: int, max_active_offers: int = 4) -> None:
+    def __init__(self, tile_size: int, max_active_offers: int = 4, world: Optional[WorldData] = None) -> None:
         self.tile_size = tile_size
         self.max_active_offers = max_active_offers
 
+        # Catálogo desde los datos compartidos del proceso (sin fetch propio),
+        # o desde JOBS_STREAM_PATH: el cache binario si está al día, si no por
+        # tandas (la primera ya alcanza para lanzar ofertas) y al terminar se compila
         self.jobs = JobLoader()
-        self.jobs.load_from_api()
+        self._stream = None
+        stream_path = settings.JOBS_STREAM_PATH
+        if not stream_path:
+            self.jobs.load_from_raw((world or load_world()).jobs_raw)
+        elif not (settings.JOBS_CATALOG_CACHE and self.jobs.load_cached(stream_path)):
+            self._stream = self.jobs.stream_batches(stream_path, settings.JOBS_STREAM_BATCH)
+            next(self._stream, None)
         self.orders = self.jobs.create_order_manager()
 
         self._job_offer_elapsed = 3.0
@@ -58,19 +73,41 @@ class JobLogic:
 
         self.weight_warning = False
 
+        # Ruta sugerida: el engine asigna un RoutePlanner (necesita el mapa)
+        self.route_planner = None
+        self._route_request = 0                      # pedido cuyo resultado se aplica
+        self._route_applied: Optional[RoutePlan] = None
+
+        # Puntaje de las ofertas vivas (badges); el engine informa velocidad y tiempo restante
+        self.advisor = OfferAdvisor(self._DROPOFF_LATE_AFTER)
+        self._badges: Dict[Tuple[str, Tuple[int, int, int]], pygame.Surface] = {}
+        self._badge_font: Optional[pygame.font.Font] = None
+
+        # Totales desde que arrancó el proceso (telemetría; reset() no los toca)
+        self.counters: Dict[str, int] = {
+            "offers_launched": 0, "offers_expired": 0, "offers_accepted": 0,
+            "delivered_on_time": 0, "delivered_late": 0,
+        }
+
     # =================== API pública ===================
 
     def reset(self) -> None:
         """Limpia estado de partida (no re-fetch), reconstruye estructuras de ejecución."""
         self.orders = self.jobs.create_order_manager()
+        self._route_request = 0
+        self.advisor.invalidate()
         self._pickup_markers.clear()
         self._dropoff_markers.clear()
         self._job_offer_elapsed = 3.0
         self._game_elapsed = 0.0
         self.reputation = 70
 
+    @FRAME_PROFILER.timed("pedidos.update")
     def update(self, dt: float, player_x: float, player_y: float) -> None:
         """Avanza timers, lanza ofertas, expira pickups y verifica proximidades."""
+        if self._stream is not None:
+            self._advance_stream()
+        self.pollRoute()
         self._game_elapsed += dt
         self._job_offer_elapsed += dt
 
@@ -86,24 +123,58 @@ class JobLogic:
         # Proximidades (pickup y dropoff)
         self._check_proximity(player_x, player_y)
 
-    def _select_Image(self, type):
-        assets_dir = os.path.join(os.path.dirname(__file__), "..","..", "assets", "images")
+        if settings.OFFER_ADVISOR:
+            ts = self.tile_size
+            self.advisor.update(self._pickup_markers, self._dropoff_markers, self.jobs, self.orders,
+                                (int(player_x // ts), int(player_y // ts)), self.reputation, self._game_elapsed)
+
+    def setConditions(self, tiles_per_sec: float, time_left: float) -> None:
+        """Velocidad efectiva del jugador (tiles/s, con clima) y tiempo de partida restante, para el asesor."""
+        self.advisor.set_conditions(tiles_per_sec, time_left)
+
+    def _advance_stream(self) -> bool:
+        """Incorpora la siguiente tanda del catálogo en streaming. False si ya terminó."""
+        new_ids = next(self._stream, None)
+        if new_ids is None:
+            self._stream = None
+            if settings.JOBS_CATALOG_CACHE:
+                # content_hash + escritura recorren todo el catálogo: fuera del frame
+                threading.Thread(target=self.jobs.write_cache, args=(settings.JOBS_STREAM_PATH,),
+                                 name="catalog-cache", daemon=True).start()
+            return False
+        self.orders.add_released_ids(new_ids)
+        return True
 
+    def finish_stream(self) -> None:
+        """Lee lo que falte del catálogo (p. ej. antes de cargar una partida)."""
+        while self._stream is not None and self._advance_stream():
+            pass
+
+    def _select_Image(self, type):
         if type == 0:
-            return pygame.image.load(os.path.join(assets_dir, "icon_0.png")).convert_alpha()
+            return load_image("images", "icon_0.png")
         elif type == 1:
-            return pygame.image.load(os.path.join(assets_dir, "icon_1.png")).convert_alpha()
+            return load_image("images", "icon_1.png")
 
 
+    @FRAME_PROFILER.timed("pedidos.draw")
     def draw(self, screen: pygame.Surface) -> None:
 
         dropoff_icon = self._select_Image(0)  
         pickup_icon = self._select_Image(1) 
 
         # Pickups
+        scores = self.advisor.scores() if settings.OFFER_ADVISOR else {}
         for m in self._pickup_markers:
             rect = pickup_icon.get_rect(center=(m.px, m.py))
             screen.blit(pickup_icon, rect)
+        # Badges encima de todos los íconos
+        top = pickup_icon.get_height() // 2 - 2
+        for m in self._pickup_markers:
+            s = scores.get(m.job_id)
+            if s is not None:
+                badge = self._badge(s.label, self._badge_color(s.score, s.label))
+                screen.blit(badge, badge.get_rect(midbottom=(m.px, m.py - top)))
 
         # Dropoffs (solamente el current)
         currentJob = self.orders.getCurrentJob()
@@ -112,6 +183,29 @@ class JobLogic:
             rect = dropoff_icon.get_rect(center=(m.px, m.py))
             screen.blit(dropoff_icon, rect)
     
+    def _badge_color(self, score: int, label: str) -> Tuple[int, int, int]:
+        if label in ("lleno", "no llega"):
+            return (120, 120, 120)
+        if score >= 66:
+            return (40, 160, 60)
+        if score >= 33:
+            return (200, 160, 30)
+        return (190, 50, 40)
+
+    def _badge(self, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        """Surface del badge, cacheada por texto y color (a lo sumo ~300 combinaciones)."""
+        key = (text, color)
+        surf = self._badges.get(key)
+        if surf is None:
+            if self._badge_font is None:
+                self._badge_font = pygame.font.Font(settings.UI_FONT_NAME, settings.OFFER_BADGE_FONT_SIZE)
+            label = self._badge_font.render(text, True, (255, 255, 255))
+            surf = pygame.Surface((label.get_width() + 6, label.get_height() + 2), pygame.SRCALPHA)
+            pygame.draw.rect(surf, color, surf.get_rect(), border_radius=4)
+            surf.blit(label, (3, 1))
+            self._badges[key] = surf
+        return surf
+
     # Getters y Setters
 
     def getInventory(self) -> List[Dict[str, Any]]:
@@ -122,6 +216,14 @@ class JobLogic:
             out.append(job)
         return out
     
+    def getInventoryCount(self) -> int:
+        return len(self.orders.inventory)
+
+    def getInventoryWindow(self, sort_key: Optional[str], desc: bool, start: int, count: int) -> List[Job]:
+        """Jobs visibles [start, start+count) del inventario ordenado (índices incrementales)."""
+        ids = self.orders.inventory_sorted(sort_key, desc, start, start + count)
+        return [self.jobs.get(jid) for jid in ids]
+
     def getInventoryIDs(self) -> List[str]:
         """Devuelve la lista de IDs de objetos Job actualmente en inventario."""
         return self.orders.inventory
@@ -141,10 +243,10 @@ class JobLogic:
             })
         return out
     
-    def getHistoryIDs(self) -> List[HistoryEntry]:
+    def getHistoryIDs(self) -> HistoryLog:
         """
-        Lista de dicts con información histórica.
-        Cada item: {"job_id": str, "accepted": bool, "onTime": bool}
+        Historial completo (HistoryLog). Iterarlo da HistoryEntry
+        (job_id, accepted, onTime); además tiene los totales acumulados.
         """
         return self.orders.history
     
@@ -152,12 +254,11 @@ class JobLogic:
         return self.reputation
     
     def getMoney(self) -> float:
-        total = 0.0
-        for h in self.orders.history:
-            if h.accepted:
-                job = self.jobs.get(h.job_id)
-                total += job.payout
-        return total
+        return self.orders.history.money
+
+    def getOnTimeRate(self, last_n: Optional[int] = None) -> float:
+        """Fracción de entregas a tiempo (de todas o de las últimas `last_n`)."""
+        return self.orders.history.on_time_rate(last_n)
     
     def getWeight(self) -> float:
         total = 0.0
@@ -168,6 +269,55 @@ class JobLogic:
 
     def setCurrentJob(self, job_id: str) -> None:
         self.orders.set_current_job(job_id)
+
+    def moveInventoryJob(self, job_id: str, delta: int) -> bool:
+        return self.orders.move_job(job_id, delta)
+
+    # ---- Ruta sugerida ----
+    def requestRoute(self, player_x: float, player_y: float, tiles_per_sec: float) -> bool:
+        """
+        Pide al planificador un orden de entrega para el inventario desde la
+        posición del jugador. Se aplica solo (orden manual + job actual) a
+        medida que llegan las mejoras; ver pollRoute().
+        """
+        if self.route_planner is None or not self.orders.inventory:
+            return False
+        due = {m.job_id: m.due_at for m in self._dropoff_markers}
+        stops = []
+        for jid in self.orders.inventory:
+            job = self.jobs.get(jid)
+            stops.append(Stop(jid, job.dropoff, due.get(jid, float("inf")), job.priority))
+        # Con inventarios enormes se planifican solo las entregas más urgentes
+        stops.sort(key=lambda s: (s.due, -s.priority))
+        ts = self.tile_size
+        self._route_request = self.route_planner.request(
+            (int(player_x // ts), int(player_y // ts)), stops[:settings.ROUTE_MAX_STOPS],
+            self._game_elapsed, tiles_per_sec,
+        )
+        self._route_applied = None
+        return True
+
+    def pollRoute(self) -> bool:
+        """Aplica el último plan publicado si es nuevo. True si cambió el orden."""
+        if not self._route_request or self.route_planner is None:
+            return False
+        plan = self.route_planner.result()
+        if plan is None or plan.request_id != self._route_request or plan is self._route_applied:
+            return False
+        self._route_applied = plan
+        if plan.final:
+            self._route_request = 0  # ya no llegan mejoras
+        self.orders.set_manual_order(plan.order)
+        self.orders.set_current_job(self.orders.inventory.first())
+        return True
+
+    def routeStatus(self) -> Optional[str]:
+        """Texto corto para la UI: método del último plan aplicado (o None)."""
+        plan = self._route_applied
+        if plan is None:
+            return "calculando…" if self._route_request else None
+        names = {"nn": "vecino más cercano", "2opt": "2-opt", "oropt": "Or-opt", "exact": "óptima"}
+        return names.get(plan.method, plan.method) + ("" if plan.final else "…")
     # =================== Lógica interna ===================
 
     def _grid_center_to_px(self, gx: int, gy: int) -> Tuple[int, int]:
@@ -182,15 +332,17 @@ class JobLogic:
         px, py = self._grid_center_to_px(gx, gy)
         expires_at = self._game_elapsed + self._TIME_TO_EXPIRE
         self._pickup_markers.append(PickupMarker(px, py, job.id, expires_at))
+        self.counters["offers_launched"] += 1
 
     def _expire_pickup_offers(self) -> None:
         """Borra pickups vencidos y registra NO aceptado en historial."""
         to_remove: List[int] = []
         for idx, m in enumerate(self._pickup_markers):
             if self._game_elapsed >= m.expires_at:
-                self.orders.record_offer_result(m.job_id, accepted=False)
+                self.orders.record_offer_result(m.job_id, accepted=False, t=self._game_elapsed)
                 print(f"Pedido expirado (agregado al historial como rechazado), id: {m.job_id}")
                 self.reputation -= 10  # penalización por no aceptar
+                self.counters["offers_expired"] += 1
                 if self.reputation < 0:
                     self.reputation = 0
                 to_remove.append(idx)
@@ -214,6 +366,7 @@ class JobLogic:
                 if(self.getWeight() < 5):
                     self.orders.accept_job(job.id)
                     print(f"Pedido aceptado (agregado al inventario), id: {job.id}")
+                    self.counters["offers_accepted"] += 1
                     # Crear dropoff marker con due_at relativo
                     dx, dy = job.dropoff
                     qx, qy = self._grid_center_to_px(dx, dy)
@@ -241,8 +394,9 @@ class JobLogic:
         dist = abs(mgx - pgx) + abs(mgy - pgy)
         if dist <= self._DROPOFF_RADIUS_TILES:
             on_time = self._game_elapsed <= m.due_at
-            self.orders.mark_delivered(m.job_id, delivered_on_time=on_time)
+            self.orders.mark_delivered(m.job_id, delivered_on_time=on_time, t=self._game_elapsed)
             print(f"Pedido entregado (removido del inventario y agregado al historial), id: {m.job_id}, onTime={on_time}")
+            self.counters["delivered_on_time" if on_time else "delivered_late"] += 1
             if on_time:
                 self.reputation += 10  # recompensa por entrega a tiempo
                 if self.reputation > 100:
@@ -266,16 +420,17 @@ class JobLogic:
         Serializa todo el estado mutable de JobLogic + JobLoader + OrderManager
         en un único diccionario.
         """
-        # 1) Jobs
-        jobs_list = [job.to_dict() for job in self.jobs._jobs.values()]
+        # 1) Jobs: solo la referencia al catálogo; el resto del estado guarda IDs
+        self.orders.settle_incoming()
+        catalog_state = {
+            "hash": self.jobs.content_hash(),
+            "size": self.jobs.size(),
+        }
 
         # 2) OrderManager
         orders_state = {
             "inventory": list(self.orders.inventory),  # [job_id]
-            "history": [
-                {"job_id": h.job_id, "accepted": h.accepted, "onTime": h.onTime}
-                for h in self.orders.history
-            ],
+            "history": self.orders.history.save_state(),  # columnas
             "currentJob_id": self.orders.currentJob_id,
             "release_queue": list(self.orders.release_queue),
             "base_ids_sorted": list(self.orders._base_ids_sorted),
@@ -294,7 +449,7 @@ class JobLogic:
             "reputation": self.reputation,
         }
         return {
-            "jobs": jobs_list,
+            "catalog": catalog_state,
             "orders": orders_state,
             "markers": markers_state,
             "logic": logic_state,
@@ -304,35 +459,39 @@ class JobLogic:
     def load_state(self, state: dict) -> bool:
         """
         Restaura el estado desde un diccionario generado por save_state().
-        No refetchea del API. Devuelve True si tuvo éxito, False si falló.
+        No refetchea del API: los IDs se resuelven contra el catálogo ya cargado.
+        Devuelve True si tuvo éxito, False si falló.
         """
         try:
             if not isinstance(state, dict):
                 return False
+            self.finish_stream()  # los IDs guardados se resuelven contra el catálogo completo
+            self._route_request = 0
+            self._route_applied = None
+            self.advisor.invalidate()
+
+            orders_state = state.get("orders", {})
 
-            # 1) Jobs -> reconstruir
-            self.jobs._jobs.clear()
-            for jd in state.get("jobs", []):
-                job = Job.from_dict(jd)
-                job.validate()
-                self.jobs._jobs[job.id] = job
+            # 1) Jobs: si el catálogo cambió, todos los IDs guardados deben seguir existiendo
+            catalog_state = state.get("catalog", {})
+            if catalog_state.get("hash") != self.jobs.content_hash():
+                referenced = set(orders_state.get("inventory", []))
+                referenced.update(HistoryLog.referenced_ids(orders_state.get("history")))
+                referenced.update(orders_state.get("release_queue", []))
+                referenced.update(m["job_id"] for ms in state.get("markers", {}).values() for m in ms)
+                if not all(self.jobs.exists(jid) for jid in referenced):
+                    return False
 
             # 2) OrderManager limpio con el repo actual y luego aplicar estado
             self.orders = self.jobs.create_order_manager()
 
-            orders_state = state.get("orders", {})
             # Inventario
-            self.orders.inventory = list(orders_state.get("inventory", []))
+            self.orders.set_inventory(orders_state.get("inventory", []))
             # Historial
-            self.orders.history.clear()
-            for h in orders_state.get("history", []):
-                self.orders.history.append(
-                    HistoryEntry(
-                        job_id=h["job_id"],
-                        accepted=bool(h["accepted"]),
-                        onTime=bool(h["onTime"]),
-                    )
-                )
+            # Historial (acepta también el formato viejo, lista de dicts)
+            self.orders.history = HistoryLog.from_state(
+                orders_state.get("history"), lambda jid: self.jobs.get(jid).payout
+            )
             # Current
             self.orders.currentJob_id = orders_state.get("currentJob_id", None)
             # Colas
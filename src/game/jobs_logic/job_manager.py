@@ -1,14 +1,11 @@
 from __future__ import annotations
+import heapq
+from bisect import bisect_left, insort
 from collections import deque
-from dataclasses import dataclass
 from typing import Deque, List, Optional, Dict
 from .job import Job
-
-@dataclass
-class HistoryEntry:
-    job_id: str
-    accepted: bool
-    onTime: bool = False
+from .history_log import HistoryEntry, HistoryLog
+from .indexed_inventory import IndexedInventory
 
 class OrderManager:
     def __init__(self, repo) -> None:
@@ -17,12 +14,27 @@ class OrderManager:
         # 1) Cola de lanzamiento por release_time (IDs)
         self.release_queue: Deque[str] = deque()
         self._base_ids_sorted: List[str] = []  # respaldo para recargar cuando se vacíe
-
-        # 2) Historial
-        self.history: List[HistoryEntry] = []
-
-        # 3) Inventario (IDs aceptados, aún sin entregar)
-        self.inventory: List[str] = []
+        # 1b) Jobs que llegan después (catálogo por stream): heap (release_time, seq, id)
+        #     que pop_next_job intercala con la cola
+        self._incoming: List[tuple] = []
+        self._incoming_seq = 0
+        self._base_stale = False
+
+        # 2) Historial (columnas + totales acumulados; iterarlo da HistoryEntry)
+        self.history: HistoryLog = HistoryLog()
+
+        # 3) Inventario (IDs aceptados, aún sin entregar), en el orden que ve el jugador.
+        #    IndexedInventory: membership, remove y reordenar en O(1)
+        self.inventory: IndexedInventory = IndexedInventory()
+
+        # 3b) Índices ordenados del inventario, mantenidos en accept/deliver (bisect)
+        #     por prioridad: (-priority, seq, id)   -> orden natural = prioridad DESC
+        #     por deadline:  (deadline, -priority, -payout, seq, id) -> deadline ASC (Job.key_deadline)
+        self._by_priority: List[tuple] = []
+        self._by_deadline: List[tuple] = []
+        self._inv_keys: Dict[str, tuple] = {}
+        self._inv_seq = 0
+        self.inventory_version = 0  # cambia con cada alta/baja (para caches de la UI)
 
         # Job actual
         self.currentJob_id: Optional[str] = None
@@ -33,13 +45,33 @@ class OrderManager:
         Obtiene todos los jobs del repo, los ordena por release_time ascendente
         y llena la cola. También guarda ese orden base para recargar cuando se vacíe.
         """
-        ids = self.repo.snapshot_ids()  # lista de IDs disponibles
-        ids.sort(key=lambda jid: self.repo.get(jid).release_time)
+        ids = self.repo.ids_by_release_time()  # ordenado sobre la columna release_time
         self._base_ids_sorted = ids[:]              # guardamos orden base
         self.release_queue = deque(ids)             # cola inicial
 
+    def add_released_ids(self, job_ids: List[str]) -> None:
+        """Suma jobs nuevos del catálogo (stream) sin reordenar la cola ya armada."""
+        for jid in job_ids:
+            self._incoming_seq += 1
+            heapq.heappush(self._incoming, (self.repo.get(jid).release_time, self._incoming_seq, jid))
+        if job_ids:
+            self._base_stale = True
+
+    def settle_incoming(self) -> None:
+        """Intercala en release_queue los jobs que llegaron por stream (p. ej. antes de guardar)."""
+        if not self._incoming:
+            return
+        get = self.repo.get
+        queued = ((get(jid).release_time, 0, k, jid) for k, jid in enumerate(self.release_queue))
+        incoming = ((rt, 1, seq, jid) for rt, seq, jid in sorted(self._incoming))
+        self.release_queue = deque(item[-1] for item in heapq.merge(queued, incoming))
+        self._incoming = []
+
     def _reload_release_queue_if_empty(self) -> None:
         """Si la cola está vacía, recárgala con el orden base (repetición cíclica)."""
+        if self._base_stale and not self._incoming:
+            self._base_ids_sorted = self.repo.ids_by_release_time()
+            self._base_stale = False
         if not self.release_queue and self._base_ids_sorted:
             self.release_queue = deque(self._base_ids_sorted)
 
@@ -48,6 +80,10 @@ class OrderManager:
         Saca el primer ID de la cola y retorna el Job completo.
         Si la cola está vacía, se recarga con el orden base y vuelve a intentar.
         """
+        incoming = self._incoming
+        if incoming and (not self.release_queue
+                         or incoming[0][0] < self.repo.get(self.release_queue[0]).release_time):
+            return self.repo.get(heapq.heappop(incoming)[2])
         if not self.release_queue:
             self._reload_release_queue_if_empty()
         if not self.release_queue:
@@ -58,10 +94,11 @@ class OrderManager:
         return self.repo.get(jid)
 
     # ---------- (2) Historial ----------
-    def record_offer_result(self, job_id: str, accepted: bool, onTime=False) -> None:
-        self.history.append(HistoryEntry(job_id=job_id, accepted=accepted, onTime=onTime))
+    def record_offer_result(self, job_id: str, accepted: bool, onTime=False, t: float = 0.0) -> None:
+        payout = self.repo.get(job_id).payout if accepted else 0.0
+        self.history.append(job_id, accepted, onTime, payout, t)
 
-    def mark_delivered(self, job_id: str, delivered_on_time: bool) -> bool:
+    def mark_delivered(self, job_id: str, delivered_on_time: bool, t: float = 0.0) -> bool:
         """
         Marca como entregado: saca del inventario y actualiza onTime en el historial.
         """
@@ -69,9 +106,10 @@ class OrderManager:
             self.inventory.remove(job_id)
         except ValueError:
             return False
+        self._index_remove(job_id)
 
         # Registrar la entrega directamente en el historial
-        self.history.append(HistoryEntry(job_id=job_id, accepted=True, onTime=delivered_on_time))
+        self.history.append(job_id, True, delivered_on_time, self.repo.get(job_id).payout, t)
 
         self.set_current_job_default()
         
@@ -81,10 +119,77 @@ class OrderManager:
     def accept_job(self, job_id: str) -> None:
         if job_id not in self.inventory:
             self.inventory.append(job_id)
+            self._index_add(job_id)
         # Si no hay current, lo selecciona por conveniencia
         if self.currentJob_id is None:
             self.currentJob_id = job_id
 
+    def set_inventory(self, job_ids: List[str]) -> None:
+        """Reemplaza el inventario completo (p. ej. al cargar partida) y rearma los índices."""
+        self.inventory = IndexedInventory(job_ids)
+        self._by_priority = []
+        self._by_deadline = []
+        self._inv_keys = {}
+        for jid in self.inventory:
+            self._index_add(jid)
+
+    def set_manual_order(self, job_ids: List[str]) -> None:
+        """Pone esos jobs al frente del orden manual, en ese orden; el resto queda detrás como estaba."""
+        front = [jid for jid in job_ids if jid in self.inventory]
+        placed = set(front)
+        self.inventory = IndexedInventory(front + [jid for jid in self.inventory if jid not in placed])
+        self.inventory_version += 1
+
+    def move_job(self, job_id: str, delta: int) -> bool:
+        """Sube (delta < 0) o baja (delta > 0) un job un lugar en el orden manual."""
+        if self.inventory.move(job_id, delta):
+            self.inventory_version += 1
+            return True
+        return False
+
+    def _index_add(self, job_id: str) -> None:
+        job = self.repo.get(job_id)
+        self._inv_seq += 1
+        kp = (-job.priority, self._inv_seq, job_id)
+        kd = (job.deadline, -job.priority, -job.payout, self._inv_seq, job_id)
+        insort(self._by_priority, kp)
+        insort(self._by_deadline, kd)
+        self._inv_keys[job_id] = (kp, kd)
+        self.inventory_version += 1
+
+    def _index_remove(self, job_id: str) -> None:
+        keys = self._inv_keys.pop(job_id, None)
+        if keys is None:
+            return
+        for index, key in zip((self._by_priority, self._by_deadline), keys):
+            i = bisect_left(index, key)
+            if i < len(index) and index[i] == key:
+                del index[i]
+        self.inventory_version += 1
+
+    def inventory_sorted(self, sort_key: Optional[str], desc: bool, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """
+        IDs del inventario en [start, stop) según el orden pedido, sin reordenar:
+        "priority" / "deadline" leen el índice correspondiente (al revés si hace
+        falta); cualquier otro valor respeta el orden manual del inventario.
+        """
+        if sort_key == "priority":
+            index, reverse = self._by_priority, not desc
+        elif sort_key == "deadline":
+            index, reverse = self._by_deadline, desc
+        else:
+            return self.inventory[start:stop]
+
+        n = len(index)
+        stop = n if stop is None else max(0, min(stop, n))
+        start = max(0, min(start, stop))
+        if reverse:
+            window = index[n - stop:n - start]
+            window.reverse()
+        else:
+            window = index[start:stop]
+        return [k[-1] for k in window]
+
     # ---------- Current job ----------
     def set_current_job(self, job_id: Optional[str]) -> bool:
         if job_id is None:
@@ -96,7 +201,7 @@ class OrderManager:
         return False
     
     def set_current_job_default(self) -> None:
-        self.currentJob_id = self.inventory[0] if self.inventory else None
+        self.currentJob_id = self.inventory.first()
     
     def getCurrentJobID(self) -> Optional[str]:
         """Devuelve el ID del job actual o None si no hay."""
@@ -0,0 +1,130 @@
+"""
+Ingesta de pedidos en streaming, para catálogos demasiado grandes para json.load.
+
+    iter_job_dicts(fuente)   dicts uno a uno desde JSON Lines (.jsonl/.ndjson)
+                             o desde un arreglo JSON (leído por bloques con raw_decode)
+    batched(it, n)           agrupa en listas de n
+    validate_batch(batch)    convierte a filas de JobCatalog; descarta las inválidas
+
+JobLoader.stream_batches() arma el pipeline y llena el catálogo por tandas,
+así el juego puede lanzar las primeras ofertas antes de terminar de leer.
+"""
+from __future__ import annotations
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from .job_catalog import parse_deadline_seconds
+
+CHUNK_SIZE = 1 << 16
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+_WS_AND_COMMAS = " \t\r\n,"
+
+
+def iter_jsonl(fp: io.TextIOBase) -> Iterator[Any]:
+    """Un valor JSON por línea (las vacías se ignoran)."""
+    loads = json.loads
+    for line in fp:
+        line = line.strip()
+        if line:
+            yield loads(line)
+
+
+def iter_json_array(fp: io.TextIOBase, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Elementos del primer arreglo JSON del archivo, leyendo de a `chunk_size`.
+    Sirve también con un wrapper tipo {"data": [...]} siempre que la lista de
+    pedidos sea el primer arreglo que aparece.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill() -> None:
+        nonlocal buf, pos, eof
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf, pos = buf[pos:] + chunk, 0
+
+    # Hasta el "[" de apertura
+    while True:
+        i = buf.find("[", pos)
+        if i >= 0:
+            pos = i + 1
+            break
+        if eof:
+            return
+        pos = len(buf)
+        fill()
+
+    while True:
+        while True:
+            while pos < len(buf) and buf[pos] in _WS_AND_COMMAS:
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            fill()
+        if pos >= len(buf):
+            raise ValueError("arreglo JSON sin cerrar")
+        if buf[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()  # el elemento quedó cortado: traer más y reintentar
+            continue
+        yield obj
+        pos = end
+
+
+def iter_job_dicts(source: Union[str, io.TextIOBase], chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Dicts de pedidos desde una ruta o un archivo de texto ya abierto."""
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as fp:
+            if source.lower().endswith(JSONL_EXTENSIONS):
+                yield from iter_jsonl(fp)
+            else:
+                yield from iter_json_array(fp, chunk_size)
+        return
+    yield from iter_json_array(source, chunk_size)
+
+
+def batched(items: Iterable[Any], n: int) -> Iterator[List[Any]]:
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= n:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+Row = Tuple[str, int, int, int, int, float, float, float, int, int]
+
+
+def validate_batch(batch: Iterable[Dict[str, Any]]) -> Tuple[List[Row], int]:
+    """
+    Filas (id, pickup x/y, dropoff x/y, payout, weight, deadline_s, priority,
+    release_time) listas para JobCatalog.add_rows, y cuántos pedidos se
+    descartaron por inválidos (mismas reglas que Job.validate).
+    """
+    rows: List[Row] = []
+    rejected = 0
+    for d in batch:
+        try:
+            (ax, ay), (bx, by) = d["pickup"], d["dropoff"]
+            payout = float(d["payout"])
+            weight = float(d["weight"])
+            if payout < 0 or weight < 0:
+                raise ValueError("payout/weight negativos")
+            rows.append((
+                str(d["id"]), int(ax), int(ay), int(bx), int(by), payout, weight,
+                parse_deadline_seconds(d["deadline"]), int(d["priority"]), int(d["release_time"]),
+            ))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            rejected += 1
+    return rows, rejected
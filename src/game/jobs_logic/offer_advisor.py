@@ -0,0 +1,211 @@
+"""
+Asesor de ofertas: cuánto vale *ahora* tomar cada pickup vivo.
+
+Por oferta se estima, con distancias Manhattan en tiles:
+
+    desvío      inserción más barata del par pickup -> dropoff en la ruta
+                actual (jugador + entregas del inventario en orden manual)
+    riesgo      tiempo pickup -> dropoff contra la ventana de entrega, a la
+                velocidad actual (incluye WeatherManager.current_multiplier)
+    atrasos     entregas ya aceptadas que el desvío empujaría fuera de plazo
+    peso        si con el pedido se llega al tope ya no entran más ofertas
+
+valor = payout·P(a tiempo) + reputación esperada - atrasos - bloqueo por peso,
+y el puntaje es valor / segundos extra de recorrido, normalizado contra la
+mejor oferta (0-100).
+
+Las entradas globales (tile del jugador, inventario, peso, reputación,
+velocidad, segundo de juego) se comparan con las del último cálculo: si no
+cambiaron no se recalcula nada. La parte de cada oferta que depende solo de
+la ruta (desvío y atrasos por posición) se cachea por versión de ruta.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .. import settings
+
+Tile = Tuple[int, int]
+
+WEIGHT_CAP = 5.0       # JobLogic solo acepta si getWeight() < WEIGHT_CAP
+
+
+@dataclass(slots=True)
+class OfferScore:
+    job_id: str
+    score: int             # 0-100 relativo a la mejor oferta viva
+    label: str             # texto del badge
+    fits: bool             # se puede aceptar con el peso actual
+    detour: int            # tiles extra que agrega a la ruta
+    late_risk: float       # 0 = llega holgado, 1 = llega tarde seguro
+
+
+def _dist(a: Tile, b: Tile) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class OfferAdvisor:
+    """
+    Puntajes de las ofertas vivas, recalculados solo cuando cambian sus entradas.
+    JobLogic llama a update() cada frame y dibuja scores() como badges.
+    """
+
+    def __init__(self, delivery_window: float, max_route_stops: int = 8) -> None:
+        self.delivery_window = delivery_window
+        self.max_route_stops = max_route_stops
+        self.tiles_per_sec = 8.0
+        self.time_left = float("inf")
+        self._key: Optional[tuple] = None
+        self._route_key: Optional[tuple] = None
+        self._route: List[Tile] = []        # entregas pendientes en orden
+        self._route_due: List[float] = []   # due_at de cada una
+        self._legs: List[int] = []          # distancias entre entregas consecutivas
+        self._weight = 0.0
+        self._per_job: Dict[str, tuple] = {}   # job_id -> (route_key, inserciones)
+        self._info: Dict[str, tuple] = {}      # job_id -> (pickup, dropoff, distancia, payout, peso)
+        self._scores: Dict[str, OfferScore] = {}
+        self.recomputes = 0
+
+    def set_conditions(self, tiles_per_sec: float, time_left: float) -> None:
+        """Velocidad efectiva (clima incluido) y tiempo de partida restante."""
+        # Redondeo: la velocidad fluctúa por superficie/resistencia y no debe disparar recálculos
+        self.tiles_per_sec = round(max(0.1, tiles_per_sec), 1)
+        self.time_left = time_left
+
+    def invalidate(self) -> None:
+        self._key = None
+        self._route_key = None
+        self._per_job.clear()
+        self._info.clear()
+        self._scores.clear()
+
+    def scores(self) -> Dict[str, OfferScore]:
+        return self._scores
+
+    # --------- Cálculo ---------
+    def update(self, markers: Sequence, dropoffs: Sequence, jobs, orders,
+               player_tile: Tile, reputation: int, now: float) -> bool:
+        """Recalcula si cambió alguna entrada. True si hubo recálculo."""
+        route_key = (orders.inventory_version, orders.currentJob_id)
+        key = (route_key, player_tile, reputation, self.tiles_per_sec, int(now),
+               int(min(self.time_left, 1e9)), tuple(m.job_id for m in markers))
+        if key == self._key:
+            return False
+        self._key = key
+        if route_key != self._route_key:
+            self._rebuild_route(dropoffs, jobs, orders, route_key)
+        self._score_all(markers, jobs, player_tile, reputation, now)
+        self.recomputes += 1
+        return True
+
+    def _rebuild_route(self, dropoffs: Sequence, jobs, orders, route_key: tuple) -> None:
+        """Entregas pendientes (job actual primero), con sus plazos y tramos."""
+        self._route_key = route_key
+        self._per_job.clear()
+        due = {d.job_id: d.due_at for d in dropoffs}
+        ids = list(orders.inventory)
+        self._weight = sum(jobs.get(jid).weight for jid in ids)
+        cur = orders.currentJob_id
+        if cur in ids:
+            ids.remove(cur)
+            ids.insert(0, cur)
+        ids = ids[:self.max_route_stops]
+        self._route = [tuple(jobs.get(jid).dropoff) for jid in ids]
+        self._route_due = [due.get(jid, float("inf")) for jid in ids]
+        self._legs = [_dist(a, b) for a, b in zip(self._route, self._route[1:])]
+
+    def _insertions(self, job_id: str, pickup: Tile, dropoff: Tile) -> List[int]:
+        """
+        Desvío por posición i >= 1 (par insertado después de la entrega i-1);
+        el índice 0 (antes de todo) depende del jugador y se calcula aparte.
+        """
+        cached = self._per_job.get(job_id)
+        if cached is not None and cached[0] == self._route_key:
+            return cached[1]
+        route, legs = self._route, self._legs
+        pd = _dist(pickup, dropoff)
+        out = [0]
+        for i in range(1, len(route) + 1):
+            a = route[i - 1]
+            if i < len(route):
+                out.append(_dist(a, pickup) + pd + _dist(dropoff, route[i]) - legs[i - 1])
+            else:
+                out.append(_dist(a, pickup) + pd)
+        self._per_job[job_id] = (self._route_key, out)
+        return out
+
+    def _score_all(self, markers: Sequence, jobs, player_tile: Tile, reputation: int, now: float) -> None:
+        speed = self.tiles_per_sec
+        window = self.delivery_window
+        rep_value = settings.OFFER_REP_VALUE * (2.0 if reputation < 50 else 1.0)
+        route, route_due = self._route, self._route_due
+        weight = self._weight
+        fits = weight < WEIGHT_CAP
+
+        # Llegada (s) a cada entrega pendiente desde el jugador, sin desvío
+        arrival: List[float] = []
+        t = now
+        prev = player_tile
+        for stop in route:
+            t += _dist(prev, stop) / speed
+            arrival.append(t)
+            prev = stop
+        slack = [d - a for d, a in zip(route_due, arrival)]
+
+        raw: List[Tuple[str, float, int, float, str]] = []
+        live = {m.job_id for m in markers}
+        for cache in (self._per_job, self._info):
+            for jid in [j for j in cache if j not in live]:
+                del cache[jid]
+
+        info = self._info
+        for m in markers:
+            row = info.get(m.job_id)
+            if row is None:
+                job = jobs.get(m.job_id)
+                pickup, dropoff = tuple(job.pickup), tuple(job.dropoff)
+                row = info[m.job_id] = (pickup, dropoff, _dist(pickup, dropoff), job.payout, job.weight)
+            pickup, dropoff, pd, payout, job_weight = row
+            ins = self._insertions(m.job_id, pickup, dropoff)
+            first = route[0] if route else None
+            ins[0] = _dist(player_tile, pickup) + pd + (_dist(dropoff, first) - _dist(player_tile, first) if first else 0)
+
+            deliver = pd / speed
+            # Margen del 20% alrededor de la ventana: superficie y cansancio no están en el modelo
+            p_on = min(1.0, max(0.0, (1.2 * window - deliver) / (0.4 * window)))
+            if not fits:
+                raw.append((m.job_id, 0.0, ins[0], 1.0 - p_on, "lleno"))
+                continue
+
+            value = payout * p_on + rep_value * 20.0 * p_on
+            if weight + job_weight >= WEIGHT_CAP:
+                value -= rep_value * 10.0  # bloquea la próxima oferta, que vencería
+
+            # Mejor posición: descuenta las entregas que el desvío dejaría tarde
+            best_rate, best_detour, best_i = float("-inf"), 0, 0
+            for i, d in enumerate(ins):
+                extra = d / speed
+                flips = 0
+                for k in range(i, len(slack)):
+                    if 0.0 <= slack[k] < extra:
+                        flips += 1
+                rate = (value - rep_value * 10.0 * flips) / max(1.0, extra)
+                if rate > best_rate:
+                    best_rate, best_detour, best_i = rate, d, i
+
+            # Tiempo hasta el pickup por esa posición (vencimiento de la oferta y de la partida)
+            if best_i:
+                reach = arrival[best_i - 1] - now + _dist(route[best_i - 1], pickup) / speed
+            else:
+                reach = _dist(player_tile, pickup) / speed
+            if now + reach > m.expires_at or reach + deliver > self.time_left:
+                raw.append((m.job_id, 0.0, best_detour, 1.0 - p_on, "no llega"))
+                continue
+            raw.append((m.job_id, best_rate, best_detour, 1.0 - p_on, ""))
+
+        top = max((r[1] for r in raw), default=0.0)
+        scores: Dict[str, OfferScore] = {}
+        for jid, rate, detour, risk, label in raw:
+            score = int(round(100.0 * rate / top)) if top > 0 and rate > 0 else 0
+            scores[jid] = OfferScore(jid, score, label or str(score), label != "lleno", detour, round(risk, 2))
+        self._scores = scores
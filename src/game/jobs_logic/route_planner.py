@@ -0,0 +1,341 @@
+"""
+Planificador de ruta para el inventario (varias entregas con deadline).
+
+Distancias reales: BFS sobre la grilla `blocked` del mapa (4 vecinos), desde
+el jugador y desde cada entrega; las BFS se cachean por celda de origen.
+
+Costo de un orden de visita (en segundos de juego):
+    tiempo total de viaje
+    + ROUTE_LATE_PENALTY * (1 + prioridad) * segundos de atraso, por entrega
+    + ROUTE_PRIORITY_WEIGHT * prioridad * tiempo hasta esa entrega
+
+Se resuelve en un hilo aparte y "anytime": primero vecino más cercano, después
+mejoras 2-opt y Or-opt, y con pocas entregas una DP exacta (Held-Karp con
+etiquetas no dominadas costo/tiempo, porque el atraso depende de la hora de
+llegada) limitada por ROUTE_TIME_BUDGET. Cada solución mejor se publica en
+result() apenas está lista.
+"""
+from __future__ import annotations
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .. import settings
+
+
+@dataclass(slots=True)
+class Stop:
+    job_id: str
+    tile: Tuple[int, int]
+    due: float = math.inf      # segundos de juego (inf = sin apuro)
+    priority: int = 0
+
+
+@dataclass(slots=True)
+class RoutePlan:
+    request_id: int
+    order: List[str]           # job_ids en orden de visita
+    cost: float
+    late: float                # segundos de atraso sumados
+    method: str                # "nn" | "2opt" | "oropt" | "exact"
+    final: bool                # ya no va a mejorar
+
+
+# --------- Distancias en la grilla ---------
+def free_cell(blocked, w: int, h: int, x: int, y: int) -> int:
+    """Índice de la celda libre más cercana (Manhattan) a (x, y); -1 si no hay."""
+    x = min(max(x, 0), w - 1)
+    y = min(max(y, 0), h - 1)
+    for r in range(w + h):
+        for dx in range(-r, r + 1):
+            dy = r - abs(dx)
+            for yy in ((y + dy, y - dy) if dy else (y,)):
+                xx = x + dx
+                if 0 <= xx < w and 0 <= yy < h and not blocked[yy * w + xx]:
+                    return yy * w + xx
+    return -1
+
+
+def bfs(blocked, w: int, h: int, start: int) -> array:
+    """Distancia en tiles desde `start` a cada celda (-1 = inalcanzable)."""
+    n = w * h
+    dist = array("i", [-1]) * n
+    if start < 0:
+        return dist
+    dist[start] = 0
+    queue = deque((start,))
+    pop, push = queue.popleft, queue.append
+    while queue:
+        c = pop()
+        d = dist[c] + 1
+        x = c % w
+        if x > 0 and dist[c - 1] < 0 and not blocked[c - 1]:
+            dist[c - 1] = d; push(c - 1)
+        if x < w - 1 and dist[c + 1] < 0 and not blocked[c + 1]:
+            dist[c + 1] = d; push(c + 1)
+        if c >= w and dist[c - w] < 0 and not blocked[c - w]:
+            dist[c - w] = d; push(c - w)
+        if c + w < n and dist[c + w] < 0 and not blocked[c + w]:
+            dist[c + w] = d; push(c + w)
+    return dist
+
+
+# --------- Evaluación ---------
+class _Problem:
+    """Matriz de tiempos (nodo 0 = jugador, 1..n = entregas) y parámetros del costo."""
+    __slots__ = ("stops", "T", "t0", "late_pen", "prio_w")
+
+    def __init__(self, stops: Sequence[Stop], T: List[List[float]], t0: float) -> None:
+        self.stops = stops
+        self.T = T
+        self.t0 = t0
+        self.late_pen = settings.ROUTE_LATE_PENALTY
+        self.prio_w = settings.ROUTE_PRIORITY_WEIGHT
+
+    def step(self, cost: float, t: float, a: int, b: int) -> Tuple[float, float, float]:
+        """Viaje a -> b partiendo en t: (costo acumulado, hora de llegada, atraso)."""
+        t2 = t + self.T[a][b]
+        s = self.stops[b - 1]
+        late = t2 - s.due if t2 > s.due else 0.0
+        return (cost + self.T[a][b] + self.late_pen * (1 + s.priority) * late
+                + self.prio_w * s.priority * (t2 - self.t0)), t2, late
+
+    def evaluate(self, order: Sequence[int]) -> Tuple[float, float]:
+        cost, t, late_total, prev = 0.0, self.t0, 0.0, 0
+        for k in order:
+            cost, t, late = self.step(cost, t, prev, k)
+            late_total += late
+            prev = k
+        return cost, late_total
+
+
+def nearest_neighbour(p: _Problem) -> List[int]:
+    """Arranca por el más cercano en tiempo; ante empates, el de deadline más próximo."""
+    left = set(range(1, len(p.stops) + 1))
+    order, cur = [], 0
+    while left:
+        nxt = min(left, key=lambda k: (p.T[cur][k], p.stops[k - 1].due, -p.stops[k - 1].priority))
+        order.append(nxt)
+        left.remove(nxt)
+        cur = nxt
+    return order
+
+
+def two_opt(p: _Problem, order: List[int], best: float, alive: Callable[[], bool]) -> Tuple[List[int], float]:
+    """Invierte tramos mientras mejore (primera mejora). Evalúa la ruta completa: el atraso no es local."""
+    n = len(order)
+    improved = True
+    while improved and alive():
+        improved = False
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                cand = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+                c, _ = p.evaluate(cand)
+                if c < best - 1e-9:
+                    order, best, improved = cand, c, True
+            if not alive():
+                break
+    return order, best
+
+
+def or_opt(p: _Problem, order: List[int], best: float, alive: Callable[[], bool]) -> Tuple[List[int], float]:
+    """Mueve tramos de 1 a 3 entregas a otra posición mientras mejore."""
+    n = len(order)
+    improved = True
+    while improved and alive():
+        improved = False
+        for seg in (1, 2, 3):
+            for i in range(n - seg + 1):
+                chunk = order[i:i + seg]
+                rest = order[:i] + order[i + seg:]
+                for j in range(len(rest) + 1):
+                    if j == i:
+                        continue
+                    cand = rest[:j] + chunk + rest[j:]
+                    c, _ = p.evaluate(cand)
+                    if c < best - 1e-9:
+                        order, best, improved = cand, c, True
+                        break
+                if improved or not alive():
+                    break
+            if improved or not alive():
+                break
+    return order, best
+
+
+def held_karp(p: _Problem, deadline: float, alive: Callable[[], bool]) -> Optional[List[int]]:
+    """
+    Orden óptimo por DP sobre (subconjunto, última entrega). Como el costo
+    futuro depende de la hora de llegada, cada estado guarda las etiquetas
+    (costo, hora) no dominadas. None si se pasa del tiempo o se cancela.
+    """
+    n = len(p.stops)
+    full = (1 << n) - 1
+    # labels[mask][last] = [(costo, hora, etiqueta_previa, last)]
+    labels: List[List[list]] = [[[] for _ in range(n + 1)] for _ in range(full + 1)]
+    for k in range(1, n + 1):
+        c, t, _ = p.step(0.0, p.t0, 0, k)
+        labels[1 << (k - 1)][k].append((c, t, None, k))
+
+    for mask in range(1, full + 1):
+        if time.perf_counter() > deadline or not alive():
+            return None
+        for last in range(1, n + 1):
+            cur = labels[mask][last]
+            if not cur:
+                continue
+            for k in range(1, n + 1):
+                bit = 1 << (k - 1)
+                if mask & bit:
+                    continue
+                dest = labels[mask | bit][k]
+                for lab in cur:
+                    c, t, _ = p.step(lab[0], lab[1], last, k)
+                    if any(o[0] <= c and o[1] <= t for o in dest):
+                        continue
+                    dest[:] = [o for o in dest if not (c <= o[0] and t <= o[1])]
+                    dest.append((c, t, lab, k))
+
+    best = None
+    for last in range(1, n + 1):
+        for lab in labels[full][last]:
+            if best is None or lab[0] < best[0]:
+                best = lab
+    order = []
+    while best is not None:
+        order.append(best[3])
+        best = best[2]
+    order.reverse()
+    return order
+
+
+# --------- Planificador en segundo plano ---------
+class RoutePlanner:
+    def __init__(self, game_map, time_budget: float = settings.ROUTE_TIME_BUDGET,
+                 exact_max: int = settings.ROUTE_EXACT_MAX_STOPS) -> None:
+        self.map = game_map
+        self.time_budget = float(time_budget)
+        self.exact_max = int(exact_max)
+
+        self._bfs_cache: "OrderedDict[tuple, array]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._pending: Optional[tuple] = None
+        self._request_id = 0
+        self._result: Optional[RoutePlan] = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._worker, name="route-planner", daemon=True)
+        self._thread.start()
+
+    # --------- Hilo principal ---------
+    def request(self, start_tile: Tuple[int, int], stops: Sequence[Stop], now: float, tiles_per_sec: float) -> int:
+        """Pide un plan nuevo (cancela el anterior). Devuelve su id."""
+        with self._cond:
+            self._request_id += 1
+            self._pending = (self._request_id, start_tile, list(stops), now, max(0.1, tiles_per_sec))
+            self._cond.notify()
+            return self._request_id
+
+    def result(self) -> Optional[RoutePlan]:
+        """Mejor plan publicado hasta ahora para el último pedido (o None)."""
+        plan = self._result
+        return plan if plan is not None and plan.request_id == self._request_id else None
+
+    def cancel(self) -> None:
+        with self._cond:
+            self._request_id += 1
+            self._pending = None
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._request_id += 1
+            self._cond.notify()
+        self._thread.join(2.0)
+
+    # --------- Resolución ---------
+    def _distances_from(self, cell: int) -> array:
+        blocked = self.map.blocked
+        key = (id(blocked), cell)
+        dist = self._bfs_cache.get(key)
+        if dist is None:
+            dist = self._bfs_cache[key] = bfs(blocked, self.map.width, self.map.height, cell)
+            if len(self._bfs_cache) > 256:
+                self._bfs_cache.popitem(last=False)
+        else:
+            self._bfs_cache.move_to_end(key)
+        return dist
+
+    def _problem(self, start_tile, stops, now, speed) -> _Problem:
+        blocked, w, h = self.map.blocked, self.map.width, self.map.height
+        cells = [free_cell(blocked, w, h, *start_tile)] + [free_cell(blocked, w, h, *s.tile) for s in stops]
+        unreachable = float(w * h * 2)
+        T = []
+        for a in cells:
+            dist = self._distances_from(a)
+            T.append([(dist[b] if a >= 0 and b >= 0 and dist[b] >= 0 else unreachable) / speed for b in cells])
+        return _Problem(stops, T, now)
+
+    def plan(self, start_tile, stops: Sequence[Stop], now: float, tiles_per_sec: float,
+             publish: Optional[Callable[[RoutePlan], None]] = None, request_id: int = 0,
+             alive: Callable[[], bool] = lambda: True) -> Optional[RoutePlan]:
+        """Resuelve en el hilo que llama; `publish` recibe cada mejora. Devuelve el mejor plan."""
+        if not stops:
+            return None
+        started = time.perf_counter()
+        deadline = started + self.time_budget
+        in_time = lambda: alive() and time.perf_counter() < deadline
+        p = self._problem(start_tile, stops, now, max(0.1, tiles_per_sec))
+        ids = [s.job_id for s in stops]
+        best_plan: Optional[RoutePlan] = None
+
+        def emit(order: List[int], method: str) -> None:
+            nonlocal best_plan
+            cost, late = p.evaluate(order)
+            if best_plan is None or cost < best_plan.cost - 1e-9:
+                best_plan = RoutePlan(request_id, [ids[k - 1] for k in order], cost, late, method, False)
+                if publish is not None:
+                    publish(best_plan)
+
+        order = nearest_neighbour(p)
+        emit(order, "nn")
+        if len(order) > 2:
+            order, best = two_opt(p, order, best_plan.cost, in_time)
+            emit(order, "2opt")
+            order, best = or_opt(p, order, best, in_time)
+            emit(order, "oropt")
+        proven = False
+        if len(stops) <= self.exact_max and alive():
+            exact = held_karp(p, deadline, alive)
+            if exact is not None:
+                emit(exact, "exact")
+                proven = True
+        if alive():
+            # Si la DP terminó, el mejor plan es óptimo aunque lo haya encontrado una heurística
+            best_plan = replace(best_plan, final=True, method="exact" if proven else best_plan.method)
+            if publish is not None:
+                publish(best_plan)
+        return best_plan
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                rid, start_tile, stops, now, speed = self._pending
+                self._pending = None
+
+            alive = lambda: self._request_id == rid and not self._stopped
+            try:
+                self.plan(start_tile, stops, now, speed, publish=self._publish, request_id=rid, alive=alive)
+            except Exception:
+                pass  # el mapa cambió a mitad de camino, etc.: el próximo pedido vuelve a intentar
+
+    def _publish(self, plan: RoutePlan) -> None:
+        if plan.request_id == self._request_id:
+            self._result = plan
@@ -0,0 +1,106 @@
+"""
+Colisión barrida (swept AABB) contra la grilla de tiles bloqueados.
+
+Trabaja directo sobre el bitmap `blocked` que precalcula MapLoader
+(bytearray de width*height, 1 = bloqueado), sin crear listas ni tuplas
+por llamada. Cada eje se barre por separado: se recorren solo las
+columnas/filas que cruza el borde delantero de la caja y se detiene en la
+primera bloqueada, así un dx grande (frame lento o speed_mult alto) no
+atraviesa paredes delgadas y el movimiento se desliza sobre el otro eje.
+"""
+
+# Separación mínima al detenerse contra un tile por la derecha/abajo.
+# La caja se considera cerrada ([x - r, x + r]), igual que _collides_at.
+_EPS = 1e-3
+
+
+def cell_blocked(blocked, w: int, h: int, tx: int, ty: int) -> bool:
+    """True si (tx, ty) está bloqueado; fuera del mapa cuenta como bloqueado."""
+    if tx < 0 or ty < 0 or tx >= w or ty >= h:
+        return True
+    return blocked[ty * w + tx] != 0
+
+
+def box_blocked(blocked, w: int, h: int, ts: int, x: float, y: float, r: float) -> bool:
+    """True si la caja centrada en (x, y) con medio lado r toca algún tile bloqueado."""
+    tx0 = int((x - r) // ts)
+    tx1 = int((x + r) // ts)
+    ty = int((y - r) // ts)
+    ty1 = int((y + r) // ts)
+    while ty <= ty1:
+        tx = tx0
+        while tx <= tx1:
+            if cell_blocked(blocked, w, h, tx, ty):
+                return True
+            tx += 1
+        ty += 1
+    return False
+
+
+def _column_blocked(blocked, w, h, tx, ty0, ty1) -> bool:
+    ty = ty0
+    while ty <= ty1:
+        if cell_blocked(blocked, w, h, tx, ty):
+            return True
+        ty += 1
+    return False
+
+
+def _row_blocked(blocked, w, h, ty, tx0, tx1) -> bool:
+    tx = tx0
+    while tx <= tx1:
+        if cell_blocked(blocked, w, h, tx, ty):
+            return True
+        tx += 1
+    return False
+
+
+def sweep_x(blocked, w: int, h: int, ts: int, x: float, y: float, r: float, dx: float) -> float:
+    """
+    Mueve la caja en X hasta dx y devuelve la nueva x, detenida contra el
+    primer tile bloqueado que cruce el borde delantero.
+    """
+    if dx == 0:
+        return x
+    ty0 = int((y - r) // ts)
+    ty1 = int((y + r) // ts)
+
+    if dx > 0:
+        tx = int((x + r) // ts) + 1
+        end = int((x + r + dx) // ts)
+        while tx <= end:
+            if _column_blocked(blocked, w, h, tx, ty0, ty1):
+                return max(x, tx * ts - r - _EPS)
+            tx += 1
+    else:
+        tx = int((x - r) // ts) - 1
+        end = int((x - r + dx) // ts)
+        while tx >= end:
+            if _column_blocked(blocked, w, h, tx, ty0, ty1):
+                return min(x, (tx + 1) * ts + r)
+            tx -= 1
+    return x + dx
+
+
+def sweep_y(blocked, w: int, h: int, ts: int, x: float, y: float, r: float, dy: float) -> float:
+    """Igual que sweep_x pero sobre el eje Y."""
+    if dy == 0:
+        return y
+    tx0 = int((x - r) // ts)
+    tx1 = int((x + r) // ts)
+
+    if dy > 0:
+        ty = int((y + r) // ts) + 1
+        end = int((y + r + dy) // ts)
+        while ty <= end:
+            if _row_blocked(blocked, w, h, ty, tx0, tx1):
+                return max(y, ty * ts - r - _EPS)
+            ty += 1
+    else:
+        ty = int((y - r) // ts) - 1
+        end = int((y - r + dy) // ts)
+        while ty >= end:
+            if _row_blocked(blocked, w, h, ty, tx0, tx1):
+                return min(y, (ty + 1) * ts + r)
+            ty -= 1
+    return y + dy
@@ -1,6 +1,8 @@
 
+import hashlib
 import json
 import os
+from typing import Optional
 from .. import settings
 from ..api_client import APIClient
 from .tileRenderer import TileRenderer   
@@ -11,19 +13,23 @@ class MapLoader:
         self.meta = {}
         self.tiles = []        # tiles[y][x] = [sym, variant]
         self.legend = {}
+        self.blocked = bytearray()   # blocked[y * width + x] = 1 si el tile bloquea
         self.renderer = TileRenderer()
+        self.api: Optional[APIClient] = None
+        self._hash: Optional[str] = None
         self._w = 0
         self._h = 0
 
-    def load_default(self):
+    def load_default(self, api: Optional[APIClient] = None):
         """
-        Intenta API y, si falla, lee /data/ciudad.json
+        Intenta API y, si falla, lee /data/ciudad.json.
+        api: cliente compartido (p.ej. con la descarga ya lanzada por Game); si no, se crea uno.
         """
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..","..", ".."))
-        api = APIClient(base_dir)
+        self.api = api or self.api or APIClient(base_dir)
 
         try:
-            data = api.get_map()
+            data = self.api.get_map()
         except Exception:
             local_file = os.path.join(base_dir, "data", "ciudad.json")
             with open(local_file, "r", encoding="utf-8") as f:
@@ -32,6 +38,15 @@ class MapLoader:
         self._load_from_payload(data)
         return self
 
+    def load_world(self, world):
+        """Carga el mapa desde el WorldData compartido (sin red ni disco)."""
+        return self.load_payload(world.map_payload)
+
+    def load_payload(self, payload: dict):
+        """Carga el mapa desde un payload ya descargado (p.ej. APIClient.get_map())."""
+        self._load_from_payload(payload)
+        return self
+
     def _load_from_payload(self, payload: dict):
         """
         Normaliza tiles a formato [sym, variant].
@@ -72,6 +87,22 @@ class MapLoader:
 
         self.legend = data["legend"]
         self._w, self._h = self.meta["width"], self.meta["height"]
+        self._build_blocked_grid()
+
+    def _build_blocked_grid(self):
+        """
+        Precalcula el bitmap de tiles bloqueados según legend para que
+        is_blocked y la colisión del jugador no consulten legend por tile.
+        """
+        blocked_syms = {sym for sym, info in self.legend.items() if info.get("blocked", False)}
+        w, h = self._w, self._h
+        self._hash = None
+        self.blocked = bytearray(w * h)
+        for y, row in enumerate(self.tiles[:h]):
+            base = y * w
+            for x, tile in enumerate(row[:w]):
+                if tile[0] in blocked_syms:
+                    self.blocked[base + x] = 1
 
     def draw(self, screen):
         ts = settings.TILE_SIZE
@@ -88,6 +119,7 @@ class MapLoader:
         self.meta = {}
         self.tiles = []        # lista vacía de tiles
         self.legend = {}
+        self.blocked = bytearray()
         self._w = 0
         self._h = 0
         self.load_default()
@@ -108,9 +140,7 @@ class MapLoader:
         """
         if y < 0 or y >= self._h or x < 0 or x >= self._w:
             return True
-        sym = self.tiles[y][x][0]  # ahora accedemos al primer elemento [sym, variant]
-        info = self.legend.get(sym, {})
-        return bool(info.get("blocked", False))
+        return self.blocked[y * self._w + x] != 0
 
     def surface_weight(self, x: float, y: float) -> float:
         """
@@ -141,28 +171,65 @@ class MapLoader:
         return sym == "P" or (self.legend.get(sym, {}).get("name", "").lower() == "park")              
 
     # -------- guardar / cargar como dict --------
-    def save_map(self) -> dict:
+    def content_hash(self) -> str:
+        """
+        Hash del contenido del mapa (tamaño, símbolos y legend, sin variantes).
+        Identifica el mapa en las partidas guardadas sin copiar los tiles.
         """
-        Devuelve un dict con el mapa actual, incluyendo variantes de cada tile.
+        if self._hash is None:
+            h = hashlib.sha1()
+            h.update(f"{self._w}x{self._h}".encode("utf-8"))
+            for row in self.tiles:
+                h.update("".join(str(t[0]) for t in row).encode("utf-8"))
+                h.update(b"\n")
+            h.update(json.dumps(self.legend, sort_keys=True).encode("utf-8"))
+            self._hash = h.hexdigest()
+        return self._hash
+
+    def save_map(self) -> dict:
         """
+        Devuelve una referencia al mapa actual: meta + hash de contenido y la
+        grilla de variantes empaquetada (1 byte por tile, 255 = sin variante).
+        Los símbolos y legend no se guardan: vienen del mapa cargado.
+        """
+        variants = bytearray(self._w * self._h)
+        i = 0
+        for row in self.tiles:
+            for tile in row:
+                v = tile[1]
+                variants[i] = 255 if v is None else v
+                i += 1
         return {
-            "meta": self.meta,
-            "tiles": self.tiles,   # cada tile es [sym, variant]
-            "legend": self.legend
+            "ref": {
+                "city_name": self.meta.get("city_name"),
+                "version": self.meta.get("version"),
+                "width": self._w,
+                "height": self._h,
+            },
+            "hash": self.content_hash(),
+            "variants": bytes(variants),
         }
 
     def load_map(self, state: dict):
         """
-        Carga un mapa desde un dict previamente guardado con save_map().
+        Restaura las variantes guardadas con save_map(). Solo funciona si el
+        mapa cargado es el mismo (mismo hash de contenido).
         """
         try:
             if not isinstance(state, dict):
                 return False
-            self.meta = state.get("meta", {})
-            self.tiles = state.get("tiles", [])
-            self.legend = state.get("legend", {})
-            self._w = self.meta.get("width", len(self.tiles[0]) if self.tiles else 0)
-            self._h = self.meta.get("height", len(self.tiles) if self.tiles else 0)
+            if state.get("hash") != self.content_hash():
+                return False
+            variants = state.get("variants", b"")
+            if len(variants) != self._w * self._h:
+                return False
+
+            i = 0
+            for row in self.tiles:
+                for tile in row:
+                    v = variants[i]
+                    tile[1] = None if v == 255 else v
+                    i += 1
 
             return True
         except Exception:
@@ -3,6 +3,7 @@ import os
 import random
 import pygame
 from .. import settings
+from ..startup import PROFILER
 
 class TileRenderer:
     """
@@ -21,6 +22,12 @@ class TileRenderer:
             self.cache[key] = self.load_surface(sym, variant)
         return self.cache[key]
 
+    def preload(self, tiles):
+        """Carga por adelantado todas las superficies que usa el mapa (apto para el hilo de carga)."""
+        for key in {(t[0], t[1]) for row in tiles for t in row}:
+            if key not in self.cache:
+                self.cache[key] = self.load_surface(*key)
+
     def choose_variant(self, sym, tiles, x, y):
         # vecinos (símbolo solamente)
         up = tiles[y-1][x][0] if y > 0 else None
@@ -223,8 +230,9 @@ class TileRenderer:
             variant_file = f"{name}_{variant}{ext}"  # permite variantes: p.ej park_0.png
             path = os.path.join(self.assets_dir, variant_file)
             if os.path.exists(path):
-                img = pygame.image.load(path)#.convert_alpha()
-                img = pygame.transform.scale(img, (ts, ts))
+                with PROFILER.phase("tile surfaces", "decode"):
+                    img = pygame.image.load(path)#.convert_alpha()
+                    img = pygame.transform.scale(img, (ts, ts))
                 return img
 
         # fallback a color
@@ -0,0 +1,293 @@
+"""
+Telemetría del juego para juntar entre kioscos.
+
+Cada METRICS_INTERVAL segundos el hilo principal arma un registro barato:
+
+    frames    histograma de tiempo de frame (ms) del intervalo
+    sections  p50/p99 por sección del FrameProfiler (si está midiendo)
+    gauges    nubes, ráfagas de viento, marcadores, inventario, memoria (tracemalloc)
+    counters  totales de JobLogic desde que arrancó el proceso (ofertas, entregas)
+
+y lo encola sin bloquear (si la cola está llena se descarta y se cuenta en
+`dropped`). Un hilo de fondo junta los registros y los escribe en lote
+según METRICS_TARGET:
+
+    "jsonl"       una línea JSON por registro en METRICS_PATH
+    "statsd"      datagramas UDP a METRICS_STATSD_ADDR (gauges |g, deltas de contadores |c)
+    "prometheus"  texto de exposición en http://METRICS_PROMETHEUS_ADDR/metrics (acumulado)
+
+Con METRICS_TRACEMALLOC el hilo de fondo agrega cada tanto las líneas que
+más memoria alocaron (take_snapshot es caro; el hilo principal no lo paga).
+"""
+from __future__ import annotations
+import json
+import os
+import queue
+import socket
+import threading
+import time
+import tracemalloc
+from array import array
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from . import settings
+from .profiler import FRAME_PROFILER
+
+DEFAULT_PATH = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "metrics.jsonl")
+)
+
+FRAME_BUCKETS_MS = (8.0, 16.7, 20.0, 25.0, 33.3, 50.0, 100.0, 250.0)   # + el de "más"
+
+TARGETS = ("jsonl", "statsd", "prometheus")
+
+
+class FrameHistogram:
+    """Cuenta frames por bucket de FRAME_BUCKETS_MS (el último es +Inf)."""
+    __slots__ = ("counts", "sum_ms")
+
+    def __init__(self) -> None:
+        self.counts = array("I", [0]) * (len(FRAME_BUCKETS_MS) + 1)
+        self.sum_ms = 0.0
+
+    def record(self, ms: float) -> None:
+        self.counts[bisect_left(FRAME_BUCKETS_MS, ms)] += 1
+        self.sum_ms += ms
+
+    def take(self) -> dict:
+        """Lo del intervalo, y vuelve a cero."""
+        out = {"count": sum(self.counts), "sum_ms": round(self.sum_ms, 2), "buckets": self.counts.tolist()}
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.sum_ms = 0.0
+        return out
+
+
+class MetricsSink:
+    def __init__(
+        self,
+        snapshot_fn: Callable[[], dict],
+        target: Optional[str] = settings.METRICS_TARGET,
+        interval: float = settings.METRICS_INTERVAL,
+        path: Optional[str] = settings.METRICS_PATH,
+    ) -> None:
+        if target is not None and target not in TARGETS:
+            raise ValueError(f"METRICS_TARGET desconocido: {target!r}")
+        self.snapshot_fn = snapshot_fn    # {"gauges": {...}, "counters": {...}} del juego
+        self.target = target
+        self.interval = float(interval)
+        self.path = path or DEFAULT_PATH
+        self.kiosk = settings.METRICS_KIOSK_ID or socket.gethostname()
+
+        self._elapsed = 0.0
+        self._frames = FrameHistogram()
+        self._queue: "queue.Queue[Optional[dict]]" = queue.Queue(maxsize=settings.METRICS_QUEUE)
+        self.dropped = 0
+        self.records_written = 0
+        self.last_error: Optional[Exception] = None
+
+        # Estado del hilo de fondo
+        self._records_since_top = 0
+        self._statsd_sent: Dict[str, float] = {}
+        self._prom_lock = threading.Lock()
+        self._prom: Optional[dict] = None
+        self._http: Optional[ThreadingHTTPServer] = None
+        self._udp: Optional[socket.socket] = None
+
+        self._thread: Optional[threading.Thread] = None
+        if target is not None:
+            if settings.METRICS_TRACEMALLOC and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if target == "prometheus":
+                self._start_http()
+            self._thread = threading.Thread(target=self._worker, name="metrics", daemon=True)
+            self._thread.start()
+
+    # --------- Hilo principal ---------
+    def tick(self, dt: float) -> None:
+        """Llamar una vez por frame."""
+        if self._thread is None:
+            return
+        self._frames.record(dt * 1000.0)
+        self._elapsed += dt
+        if self._elapsed >= self.interval:
+            self._elapsed = 0.0
+            self.emit()
+
+    def emit(self) -> None:
+        """Arma el registro del intervalo y lo encola; nunca bloquea."""
+        record = {"ts": round(time.time(), 3), "kiosk": self.kiosk, "frames": self._frames.take()}
+        record.update(self.snapshot_fn())
+        if FRAME_PROFILER.enabled and FRAME_PROFILER.count:
+            record["sections"] = {name: [round(p50, 3), round(p99, 3)]
+                                  for name, p50, p99 in FRAME_PROFILER.stats()}
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            record.setdefault("gauges", {}).update(mem_current_kb=current // 1024, mem_peak_kb=peak // 1024)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Escribe lo pendiente y termina el hilo."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+        if self._udp is not None:
+            self._udp.close()
+
+    # --------- Hilo de fondo ---------
+    def _worker(self) -> None:
+        done = False
+        while not done:
+            item = self._queue.get()
+            if item is None:
+                return
+            # Lote: lo que llegue hasta METRICS_FLUSH_SECONDS después del primero
+            batch = [item]
+            deadline = time.monotonic() + settings.METRICS_FLUSH_SECONDS
+            while len(batch) < settings.METRICS_BATCH and self.target != "prometheus":
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+            try:
+                self._add_top_allocations(batch)
+                if self.target == "jsonl":
+                    self._write_jsonl(batch)
+                elif self.target == "statsd":
+                    self._write_statsd(batch)
+                else:
+                    self._update_prometheus(batch)
+                self.records_written += len(batch)
+                self.last_error = None
+            except Exception as e:   # la telemetría nunca tira abajo el juego
+                self.last_error = e
+
+    def _add_top_allocations(self, batch: List[dict]) -> None:
+        if not tracemalloc.is_tracing():
+            return
+        self._records_since_top += len(batch)
+        if self._records_since_top < settings.METRICS_TRACEMALLOC_TOP_EVERY:
+            return
+        self._records_since_top = 0
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:settings.METRICS_TRACEMALLOC_TOP]
+        batch[-1]["top_alloc"] = [
+            [f"{s.traceback[0].filename}:{s.traceback[0].lineno}", s.size // 1024] for s in stats
+        ]
+
+    def _write_jsonl(self, batch: List[dict]) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        lines = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in batch)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    # --- StatsD ---
+    def _statsd_lines(self, record: dict) -> List[str]:
+        prefix = f"courier.{self.kiosk}"
+        frames = record["frames"]
+        lines = [f"{prefix}.frames.count:{frames['count']}|c", f"{prefix}.frames.sum_ms:{frames['sum_ms']}|c"]
+        for le, n in zip(FRAME_BUCKETS_MS + ("inf",), frames["buckets"]):
+            if n:
+                lines.append(f"{prefix}.frames.le_{str(le).replace('.', '_')}:{n}|c")
+        for name, value in record.get("gauges", {}).items():
+            lines.append(f"{prefix}.{name}:{value}|g")
+        for name, (p50, p99) in record.get("sections", {}).items():
+            lines.append(f"{prefix}.section.{name}.p50_ms:{p50}|g")
+            lines.append(f"{prefix}.section.{name}.p99_ms:{p99}|g")
+        # Los contadores del juego son totales: a StatsD van las diferencias
+        for name, total in record.get("counters", {}).items():
+            delta = total - self._statsd_sent.get(name, 0)
+            self._statsd_sent[name] = total
+            if delta:
+                lines.append(f"{prefix}.{name}:{delta}|c")
+        return lines
+
+    def _write_statsd(self, batch: List[dict]) -> None:
+        if self._udp is None:
+            self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        addr = settings.METRICS_STATSD_ADDR
+        packet = ""
+        for record in batch:
+            for line in self._statsd_lines(record):
+                # Datagramas de hasta ~1400 bytes (sin fragmentar en la red local)
+                if packet and len(packet) + len(line) + 1 > 1400:
+                    self._udp.sendto(packet.encode(), addr)
+                    packet = ""
+                packet = f"{packet}\n{line}" if packet else line
+        if packet:
+            self._udp.sendto(packet.encode(), addr)
+
+    # --- Prometheus ---
+    def _update_prometheus(self, batch: List[dict]) -> None:
+        with self._prom_lock:
+            state = self._prom or {"buckets": [0] * (len(FRAME_BUCKETS_MS) + 1), "sum_ms": 0.0}
+            for record in batch:
+                for i, n in enumerate(record["frames"]["buckets"]):
+                    state["buckets"][i] += n
+                state["sum_ms"] += record["frames"]["sum_ms"]
+                for key in ("gauges", "counters", "sections", "top_alloc"):
+                    if key in record:
+                        state[key] = record[key]
+            self._prom = state
+
+    def prometheus_text(self) -> str:
+        with self._prom_lock:
+            state = self._prom
+            if state is None:
+                return ""
+            label = f'kiosk="{self.kiosk}"'
+            out = ["# TYPE courier_frame_ms histogram"]
+            total = 0
+            for le, n in zip(FRAME_BUCKETS_MS + ("+Inf",), state["buckets"]):
+                total += n
+                out.append(f'courier_frame_ms_bucket{{{label},le="{le}"}} {total}')
+            out.append(f"courier_frame_ms_sum{{{label}}} {state['sum_ms']:.2f}")
+            out.append(f"courier_frame_ms_count{{{label}}} {total}")
+            for name, value in state.get("gauges", {}).items():
+                out.append(f"# TYPE courier_{name} gauge")
+                out.append(f"courier_{name}{{{label}}} {value}")
+            for name, value in state.get("counters", {}).items():
+                out.append(f"# TYPE courier_{name}_total counter")
+                out.append(f"courier_{name}_total{{{label}}} {value}")
+            if state.get("sections"):
+                out.append("# TYPE courier_section_ms gauge")
+                for name, (p50, p99) in state["sections"].items():
+                    section = name.replace('"', "")
+                    out.append(f'courier_section_ms{{{label},section="{section}",quantile="0.5"}} {p50}')
+                    out.append(f'courier_section_ms{{{label},section="{section}",quantile="0.99"}} {p99}')
+            return "\n".join(out) + "\n"
+
+    def _start_http(self) -> None:
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = sink.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass   # sin una línea por scrape en la consola del kiosco
+
+        self._http = ThreadingHTTPServer(settings.METRICS_PROMETHEUS_ADDR, Handler)
+        self._http.daemon_threads = True
+        threading.Thread(target=self._http.serve_forever, name="metrics-http", daemon=True).start()
@@ -0,0 +1,110 @@
+"""
+Enjambre de clientes sin ventana para medir el servidor.
+
+    python -m src.game.net.bots --clients 64 --seconds 30
+    python -m src.game.net.bots --clients 64 --seconds 30 --serve   # servidor en el mismo proceso
+
+Cada bot se conecta, cambia de dirección al azar cada tanto y cuenta lo
+que recibe. Al final imprime bytes/s y mensajes/s por cliente y, con
+--serve, el costo por tick del servidor.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+from typing import Dict, List
+
+from .. import settings
+from ..fleet_logic.dispatcher import percentile
+from ..map_logic.map_loader import MapLoader
+from ..world_data import load_world
+from ..save_format import unpack
+from .protocol import encode, read_frame
+from .server import GameServer
+
+_DIRS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+async def _bot(n: int, host: str, port: int, map_hash: str, seconds: float,
+               rng: random.Random, out: List[Dict[str, float]]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(encode({"t": "hello", "name": f"bot{n}", "map": map_hash}))
+    stats = {"bytes": 0, "msgs": 0, "positions": 0}
+
+    async def receive() -> None:
+        while True:
+            body = await read_frame(reader)
+            if body is None:
+                return
+            msg = unpack(body)
+            stats["bytes"] += 4 + len(body)
+            stats["msgs"] += 1
+            stats["positions"] += len(msg.get("p", b"")) // 6
+
+    task = asyncio.create_task(receive())
+    loop = asyncio.get_running_loop()
+    end = loop.time() + seconds
+    while loop.time() < end:
+        dx, dy = rng.choice(_DIRS)
+        writer.write(encode({"t": "in", "dx": dx, "dy": dy}))
+        await asyncio.sleep(min(end - loop.time(), rng.uniform(0.3, 2.0)))
+    writer.write(encode({"t": "bye"}))
+    await writer.drain()
+    writer.close()
+    task.cancel()
+    stats["seconds"] = seconds
+    out.append(stats)
+
+
+async def swarm(clients: int, seconds: float, host: str, port: int, seed: int, serve: bool) -> dict:
+    server = None
+    server_task = None
+    if serve:
+        server = GameServer(host, port)
+        await server.start()
+        port = server.port
+        server_task = asyncio.create_task(server.run(seconds + 2.0))
+    map_hash = MapLoader().load_world(load_world()).content_hash()
+    rng = random.Random(seed)
+    out: List[Dict[str, float]] = []
+    bots = []
+    for n in range(clients):
+        bots.append(asyncio.create_task(_bot(n, host, port, map_hash, seconds,
+                                             random.Random(rng.random()), out)))
+        await asyncio.sleep(0.01)   # entradas escalonadas, como jugadores reales
+    await asyncio.gather(*bots)
+
+    total = sum(s["bytes"] for s in out)
+    report = {
+        "clients": len(out),
+        "bytes_per_s_per_client": total / max(1, len(out)) / seconds,
+        "msgs_per_s_per_client": sum(s["msgs"] for s in out) / max(1, len(out)) / seconds,
+        "positions_per_msg": sum(s["positions"] for s in out) / max(1, sum(s["msgs"] for s in out)),
+        "bytes_per_s_total": total / seconds,
+    }
+    if server is not None:
+        await server_task
+        server._server.close()
+        report["server_tick_p50_ms"] = percentile(server.tick_ms, 0.50)
+        report["server_tick_p99_ms"] = percentile(server.tick_ms, 0.99)
+        report["server_ticks"] = server.tick
+    return report
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.game.net.bots")
+    parser.add_argument("--clients", type=int, default=settings.NET_MAX_PLAYERS)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--host", default=settings.NET_HOST)
+    parser.add_argument("--port", type=int, default=settings.NET_PORT)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--serve", action="store_true", help="levanta el servidor en este proceso (puerto libre)")
+    args = parser.parse_args(argv)
+    port = 0 if args.serve else args.port
+    report = asyncio.run(swarm(args.clients, args.seconds, args.host, port, args.seed, args.serve))
+    print(json.dumps({k: round(v, 2) if isinstance(v, float) else v for k, v in report.items()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Cliente del modo en red.
+
+    python -m src.game.net.client --host 127.0.0.1 --port 7777 --name ana
+
+La red corre en un hilo aparte (loop asyncio); el hilo de pygame solo saca
+mensajes de una cola con poll() y manda el input cuando cambia. El estado
+se arma aplicando los deltas del servidor (protocol.py) y las posiciones se
+dibujan interpoladas NET_INTERP_DELAY segundos por detrás del último tick,
+así el movimiento se ve continuo aunque lleguen 20 ticks por segundo (o
+menos, para jugadores lejanos). No hay predicción local: el propio jugador
+también se dibuja interpolado.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pygame
+
+from .. import settings
+from ..assets import load_image
+from ..map_logic.map_loader import MapLoader
+from ..world_data import load_world
+from .protocol import encode, read_message, unpack_positions
+
+
+class Interpolator:
+    """
+    Muestras (tick, x, y) por jugador y posición interpolada a un tiempo de
+    servidor. El reloj del servidor se estima con el desfase entre tick/rate
+    y el reloj local (el mínimo de demora visto, que se relaja de a poco).
+    """
+
+    def __init__(self, rate: int, delay: float = settings.NET_INTERP_DELAY) -> None:
+        self.rate = rate
+        self.delay = delay
+        self.samples: Dict[int, Deque[Tuple[float, float, float]]] = {}
+        self._offset: Optional[float] = None
+
+    def observe(self, tick: int, now: float) -> None:
+        offset = tick / self.rate - now
+        if self._offset is None or offset > self._offset:
+            self._offset = offset
+        else:
+            self._offset += (offset - self._offset) * 0.05
+
+    def server_time(self, now: float) -> float:
+        return now + (self._offset or 0.0)
+
+    def push(self, pid: int, tick: int, x: float, y: float) -> None:
+        t = tick / self.rate
+        buf = self.samples.get(pid)
+        if buf is None:
+            buf = self.samples[pid] = deque(maxlen=32)
+        elif buf and t - buf[-1][0] > 0.25:
+            # Estuvo quieto (no se mandaron posiciones): quieto hasta el tick anterior
+            _, lx, ly = buf[-1]
+            buf.append((t - 1.0 / self.rate, lx, ly))
+        buf.append((t, x, y))
+
+    def forget(self, pid: int) -> None:
+        self.samples.pop(pid, None)
+
+    def position(self, pid: int, now: float) -> Optional[Tuple[float, float]]:
+        buf = self.samples.get(pid)
+        if not buf:
+            return None
+        t = self.server_time(now) - self.delay
+        if t <= buf[0][0]:
+            return buf[0][1], buf[0][2]
+        # Las muestras viejas ya no sirven (se queda una antes de t)
+        while len(buf) > 2 and buf[1][0] <= t:
+            buf.popleft()
+        t0, x0, y0 = buf[0]
+        if len(buf) == 1 or t >= buf[-1][0]:
+            return buf[-1][1], buf[-1][2]
+        t1, x1, y1 = buf[1]
+        a = (t - t0) / (t1 - t0) if t1 > t0 else 1.0
+        return x0 + (x1 - x0) * a, y0 + (y1 - y0) * a
+
+
+class NetClient:
+    """Conexión TCP en un hilo de fondo; poll() devuelve los mensajes recibidos."""
+
+    def __init__(self, name: str, host: str = settings.NET_HOST, port: int = settings.NET_PORT,
+                 map_hash: str = "") -> None:
+        self.name, self.host, self.port, self.map_hash = name, host, port, map_hash
+        self._inbox: "queue.Queue[dict]" = queue.Queue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.connected = False
+
+    def start(self, timeout: float = 5.0) -> bool:
+        self._thread = threading.Thread(target=self._run, name="net-client", daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        return self.connected
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._main())
+        except BaseException as e:   # se informa al hilo de pygame
+            self.error = e
+        finally:
+            self.connected = False
+            self._ready.set()
+            self._inbox.put({"t": "closed"})
+            self._loop.close()
+
+    async def _main(self) -> None:
+        reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(encode({"t": "hello", "name": self.name, "map": self.map_hash}))
+        self.connected = True
+        self._ready.set()
+        while True:
+            msg = await read_message(reader)
+            if msg is None:
+                break
+            self._inbox.put(msg)
+
+    def send_input(self, dx: int, dy: int) -> None:
+        self._send({"t": "in", "dx": dx, "dy": dy})
+
+    def _send(self, msg: dict, close: bool = False) -> None:
+        writer = self._writer
+        if self._loop is None or writer is None or not self.connected:
+            return
+
+        def write() -> None:
+            writer.write(encode(msg))
+            if close:
+                writer.close()
+
+        try:
+            self._loop.call_soon_threadsafe(write)
+        except RuntimeError:
+            pass  # el servidor cerró y el hilo ya terminó
+
+    def poll(self) -> List[dict]:
+        out = []
+        while True:
+            try:
+                out.append(self._inbox.get_nowait())
+            except queue.Empty:
+                return out
+
+    def close(self) -> None:
+        self._send({"t": "bye"}, close=True)
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+
+class ClientState:
+    """Lo que se sabe del servidor, armado a partir de welcome + deltas."""
+
+    def __init__(self) -> None:
+        self.my_id = 0
+        self.rate = settings.NET_TICK_RATE
+        self.tick = 0
+        self.names: Dict[int, str] = {}
+        self.markers: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self.weather = ("clear", 1.0)
+        self.me: dict = {}
+        self.interp = Interpolator(self.rate)
+
+    def apply(self, msg: dict, now: float) -> None:
+        t = msg.get("t")
+        if t == "welcome":
+            self.my_id = msg["id"]
+            self.rate = msg["rate"]
+            self.tick = msg["k"]
+            self.interp = Interpolator(self.rate)
+            self.interp.observe(self.tick, now)
+            return
+        if t != "d":
+            return
+        k = self.tick = msg["k"]
+        self.interp.observe(k, now)
+        for pid, name in msg.get("j", ()):
+            self.names[pid] = name
+        for pid, x, y in unpack_positions(msg.get("p", b"")):
+            self.interp.push(pid, k, x, y)
+        for pid in msg.get("g", ()):
+            self.names.pop(pid, None)
+            self.interp.forget(pid)
+        for kind, jid, x, y in msg.get("ma", ()):
+            self.markers[(kind, jid)] = (x, y)
+        for kind, jid in msg.get("mr", ()):
+            self.markers.pop((kind, jid), None)
+        if "w" in msg:
+            self.weather = tuple(msg["w"])
+        if "me" in msg:
+            self.me = msg["me"]
+
+
+_KEYS = {
+    pygame.K_LEFT: (-1, 0), pygame.K_a: (-1, 0),
+    pygame.K_RIGHT: (1, 0), pygame.K_d: (1, 0),
+    pygame.K_UP: (0, -1), pygame.K_w: (0, -1),
+    pygame.K_DOWN: (0, 1), pygame.K_s: (0, 1),
+}
+
+
+def _read_input() -> Tuple[int, int]:
+    keys = pygame.key.get_pressed()
+    dx = dy = 0
+    for key, (kx, ky) in _KEYS.items():
+        if keys[key]:
+            dx += kx
+            dy += ky
+    return max(-1, min(1, dx)), max(-1, min(1, dy))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.game.net.client")
+    parser.add_argument("--host", default=settings.NET_HOST)
+    parser.add_argument("--port", type=int, default=settings.NET_PORT)
+    parser.add_argument("--name", default="jugador")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    game_map = MapLoader().load_world(load_world())
+    client = NetClient(args.name, args.host, args.port, game_map.content_hash())
+    if not client.start():
+        print(f"No se pudo conectar a {args.host}:{args.port}: {client.error}")
+        return
+
+    state = ClientState()
+    # Hasta el welcome no se sabe si el mapa del servidor es el mismo
+    first: List[dict] = []
+    while client.connected and not any(m.get("t") == "welcome" for m in first):
+        first.extend(client.poll())
+        time.sleep(0.01)
+    welcome = next((m for m in first if m.get("t") == "welcome"), None)
+    if welcome is None:
+        print("El servidor cerró la conexión (¿lleno?)")
+        return
+    if welcome.get("map"):
+        game_map = MapLoader().load_payload(welcome["map"])
+    for msg in first:
+        state.apply(msg, time.monotonic())
+
+    ts = settings.TILE_SIZE
+    screen = pygame.display.set_mode((game_map.width * ts, game_map.height * ts))
+    pygame.display.set_caption(f"Courier Quest - {args.name}")
+    background = screen.copy()
+    game_map.draw(background)
+    pickup_icon = load_image("images", "icon_1.png")
+    dropoff_icon = load_image("images", "icon_0.png")
+    font = pygame.font.Font(settings.UI_FONT_NAME, settings.STATS_FONT_SIZE)
+    clock = pygame.time.Clock()
+    last_input = (0, 0)
+    running = True
+    while running and client.connected:
+        clock.tick(settings.FPS)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        now = time.monotonic()
+        for msg in client.poll():
+            state.apply(msg, now)
+        move = _read_input()
+        if move != last_input:
+            client.send_input(*move)
+            last_input = move
+
+        screen.blit(background, (0, 0))
+        for (kind, _), (x, y) in state.markers.items():
+            icon = pickup_icon if kind == "p" else dropoff_icon
+            screen.blit(icon, icon.get_rect(center=(x, y)))
+        for pid, name in state.names.items():
+            pos = state.interp.position(pid, now)
+            if pos is None:
+                continue
+            color = (255, 220, 120) if pid == state.my_id else (90, 170, 255)
+            pygame.draw.circle(screen, color, (int(pos[0]), int(pos[1])), int(ts * 0.35))
+            label = font.render(name, True, settings.TEXT_LIGHT)
+            screen.blit(label, label.get_rect(midbottom=(int(pos[0]), int(pos[1]) - ts // 2)))
+        me = state.me
+        hud = (f"${me.get('money', 0)}  rep {me.get('rep', 0)}  resistencia {me.get('stamina', 0)}"
+               f"  inv {me.get('inv', 0)}  {state.weather[0]} x{state.weather[1]}  jugadores {len(state.names)}")
+        screen.blit(font.render(hud, True, settings.TEXT_LIGHT, (0, 0, 0)), (6, 6))
+        pygame.display.flip()
+
+    client.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
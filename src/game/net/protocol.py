@@ -0,0 +1,63 @@
+"""
+Protocolo del modo en red: mensajes dict empaquetados con save_format.pack
+(sin pickle: leer un mensaje nunca ejecuta código), con prefijo de largo.
+
+    frame = largo (u32 little-endian) | pack(mensaje)
+
+Cliente -> servidor
+    {"t": "hello", "name": str, "map": hash del mapa local}
+    {"t": "in", "dx": -1|0|1, "dy": -1|0|1}      solo cuando cambia el input
+    {"t": "bye"}
+
+Servidor -> cliente
+    {"t": "welcome", "id": int, "rate": ticks/s, "k": tick, "map": payload | None}
+    {"t": "d", "k": tick, ...}   delta del tick; solo las claves que cambiaron:
+        "j"   [[id, nombre]]            jugadores que el cliente todavía no conocía
+        "p"   bytes: (id, x, y) u16 c/u posiciones nuevas en px (pack_positions)
+        "g"   [id]                      jugadores que se fueron
+        "ma"  [[tipo, job_id, x, y]]    marcadores agregados ("p" pickup, "d" dropoff)
+        "mr"  [[tipo, job_id]]          marcadores quitados
+        "w"   [condición, multiplicador]
+        "me"  {"money", "rep", "stamina", "inv", "weight"}
+"""
+from __future__ import annotations
+import asyncio
+import struct
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from ..save_format import pack, unpack
+
+_LEN = struct.Struct("<I")
+MAX_FRAME = 1 << 20   # un payload de mapa grande entra; más que eso es un cliente roto
+_POS = struct.Struct("<HHH")  # las posiciones van en bloque: 6 bytes c/u en vez de ~25 como listas
+
+
+def encode(msg: Any) -> bytes:
+    body = pack(msg)
+    return _LEN.pack(len(body)) + body
+
+
+def pack_positions(items: Iterable[Tuple[int, int, int]]) -> bytes:
+    return b"".join(_POS.pack(pid, x, y) for pid, x, y in items)
+
+
+def unpack_positions(raw: bytes) -> Iterator[Tuple[int, int, int]]:
+    return _POS.iter_unpack(raw)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Cuerpo del siguiente frame (sin el largo), o None si se cerró la conexión."""
+    try:
+        head = await reader.readexactly(_LEN.size)
+        (n,) = _LEN.unpack(head)
+        if n > MAX_FRAME:
+            raise ValueError(f"frame de {n} bytes")
+        return await reader.readexactly(n)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[Any]:
+    """Siguiente mensaje, o None si se cerró la conexión."""
+    body = await read_frame(reader)
+    return None if body is None else unpack(body)
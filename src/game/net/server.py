@@ -0,0 +1,277 @@
+"""
+Servidor del modo en red (asyncio, TCP). Es la simulación autoritativa:
+mapa, clima (WeatherManager sin visuals) y un JobLogic por jugador.
+
+    python -m src.game.net.server --port 7777
+
+Cada tick (NET_TICK_RATE por segundo) mueve a los jugadores según su último
+input, avanza clima y pedidos, y le manda a cada cliente solo lo que cambió
+respecto de lo que ese cliente ya tiene (ver protocol.py). El ancho de banda
+queda acotado: por tick van a lo sumo NET_MAX_POSITIONS posiciones (las de
+los jugadores más cercanos; el resto sale en los ticks siguientes) y a un
+cliente que no drena su buffer no se le escribe hasta que lo haga. Como el
+delta se arma contra lo último enviado, nada se pierde al saltear ticks.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from .. import settings
+from ..jobs_logic.job_logic import JobLogic
+from ..map_logic.collision import sweep_x, sweep_y
+from ..map_logic.map_loader import MapLoader
+from ..player import recover_stamina, stamina_extra
+from ..weather_logic.weather import WeatherManager
+from ..world_data import load_world
+from .protocol import encode, pack_positions, read_message
+
+BASE_TILES_PER_SEC = 8   # igual que en engine
+
+
+class ServerPlayer:
+    """Jugador del lado servidor: posición, resistencia, input y sus pedidos."""
+    __slots__ = ("id", "name", "x", "y", "radius", "stamina", "exhausted", "dx", "dy",
+                 "logic", "writer", "known_pos", "known_names", "known_markers",
+                 "known_weather", "known_me", "bytes_sent")
+
+    def __init__(self, pid: int, name: str, start: Tuple[int, int], logic: JobLogic, writer) -> None:
+        ts = settings.TILE_SIZE
+        self.id = pid
+        self.name = name
+        self.x = float(start[0] * ts + ts // 2)
+        self.y = float(start[1] * ts + ts // 2)
+        self.radius = int(ts * 0.35)
+        self.stamina = 100.0
+        self.exhausted = False
+        self.dx = 0
+        self.dy = 0
+        self.logic = logic
+        self.writer = writer
+        # Lo que este cliente ya recibió (base de los deltas)
+        self.known_pos: Dict[int, Tuple[int, int]] = {}
+        self.known_names: Set[int] = set()
+        self.known_markers: Set[Tuple[str, str]] = set()
+        self.known_weather: Optional[list] = None
+        self.known_me: Optional[dict] = None
+        self.bytes_sent = 0
+
+    def markers(self) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        """Lo que el cliente dibuja: pickups vivos y el dropoff del job actual (como JobLogic.draw)."""
+        out = {("p", m.job_id): (m.px, m.py) for m in self.logic._pickup_markers}
+        cur = self.logic.orders.getCurrentJobID()
+        for m in self.logic._dropoff_markers:
+            if m.job_id == cur:
+                out[("d", m.job_id)] = (m.px, m.py)
+        return out
+
+    def stats(self) -> dict:
+        logic = self.logic
+        return {
+            "money": round(logic.getMoney(), 2),
+            "rep": logic.getReputation(),
+            "stamina": int(self.stamina),
+            "inv": logic.getInventoryCount(),
+            "weight": logic.getWeight(),
+        }
+
+
+class GameServer:
+    def __init__(self, host: str = settings.NET_HOST, port: int = settings.NET_PORT,
+                 tick_rate: int = settings.NET_TICK_RATE) -> None:
+        self.host, self.port = host, port
+        self.tick_rate = tick_rate
+        self.world = load_world()
+        self.map = MapLoader().load_world(self.world)
+        self.weather = WeatherManager(0, 0, self.world, visuals=False)
+        self.players: Dict[int, ServerPlayer] = {}
+        self.tick = 0
+        self._next_id = 1
+        self._server: Optional[asyncio.base_events.Server] = None
+        self.tick_ms: List[float] = []
+        self.bytes_sent = 0
+
+    # --------- Conexiones ---------
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve(self, seconds: Optional[float] = None) -> None:
+        await self.start()
+        print(f"Servidor en {self.host}:{self.port} ({self.tick_rate} ticks/s)")
+        try:
+            await self.run(seconds)
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _spawn_tile(self) -> Tuple[int, int]:
+        """Primera celda libre a partir de (1, 1), corrida según cuántos hay."""
+        w, h, blocked = self.map.width, self.map.height, self.map.blocked
+        k = len(self.players)
+        for c in range(w * h):
+            c = (w + 1 + c + 7 * k) % (w * h)
+            if not blocked[c]:
+                return (c % w, c // w)
+        return (1, 1)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        hello = await read_message(reader)
+        if not isinstance(hello, dict) or hello.get("t") != "hello" or len(self.players) >= settings.NET_MAX_PLAYERS:
+            writer.close()
+            return
+        pid = self._next_id
+        self._next_id += 1
+        logic = JobLogic(settings.TILE_SIZE, world=self.world)
+        player = ServerPlayer(pid, str(hello.get("name", f"p{pid}"))[:24], self._spawn_tile(), logic, writer)
+        same_map = hello.get("map") == self.map.content_hash()
+        writer.write(encode({
+            "t": "welcome", "id": pid, "rate": self.tick_rate, "k": self.tick,
+            "map": None if same_map else self.world.map_payload,
+        }))
+        self.players[pid] = player
+        try:
+            while True:
+                msg = await read_message(reader)
+                if not isinstance(msg, dict) or msg.get("t") == "bye":
+                    break
+                if msg.get("t") == "in":
+                    player.dx = max(-1, min(1, int(msg.get("dx", 0))))
+                    player.dy = max(-1, min(1, int(msg.get("dy", 0))))
+        except (ValueError, TypeError):
+            pass  # mensaje mal formado: se corta la conexión
+        finally:
+            self.players.pop(pid, None)
+            writer.close()
+
+    # --------- Simulación ---------
+    def _move(self, p: ServerPlayer, dt: float, condition: str, weather_mult: float) -> None:
+        """Mismo movimiento que Game._update_play + Player.move_with_collision/update."""
+        weight = p.logic.getWeight()
+        if (p.dx or p.dy) and not p.exhausted:
+            speed = (0.8 if p.stamina < 30 else 1.0) * weather_mult \
+                * self.map.surface_weight(p.x, p.y) * p.logic.getRepSpeed()
+            step = settings.TILE_SIZE * BASE_TILES_PER_SEC * dt * speed
+            dx, dy = p.dx * step, p.dy * step
+            if dx and dy:
+                dx *= 0.70710678
+                dy *= 0.70710678
+            m = self.map
+            old = (p.x, p.y)
+            p.x = sweep_x(m.blocked, m.width, m.height, settings.TILE_SIZE, p.x, p.y, p.radius, dx)
+            p.y = sweep_y(m.blocked, m.width, m.height, settings.TILE_SIZE, p.x, p.y, p.radius, dy)
+            if (p.x, p.y) != old:
+                # El juego cobra por frame movido: se escala a los frames que dura el tick
+                cost = (0.5 + stamina_extra(weight, condition) / 2.5) / 2
+                p.stamina = max(0.0, p.stamina - cost * dt * settings.FPS)
+                if p.stamina <= 0:
+                    p.exhausted = True
+        p.stamina, p.exhausted = recover_stamina(p.stamina, p.exhausted, dt)
+
+    def step(self, dt: float) -> None:
+        self.tick += 1
+        self.weather.update(dt)
+        condition = self.weather.get_current_condition()
+        mult = self.weather.current_multiplier()
+        for p in list(self.players.values()):
+            self._move(p, dt, condition, mult)
+            p.logic.update(dt, p.x, p.y)
+
+    # --------- Deltas ---------
+    def _delta(self, p: ServerPlayer, positions: Dict[int, Tuple[int, int]], weather: list) -> Optional[dict]:
+        msg: dict = {}
+        gone = [pid for pid in p.known_pos if pid not in positions]
+        for pid in gone:
+            del p.known_pos[pid]
+            p.known_names.discard(pid)
+        if gone:
+            msg["g"] = gone
+
+        known = p.known_pos
+        dirty = [pid for pid, pos in positions.items() if known.get(pid) != pos]
+        if len(dirty) > settings.NET_MAX_POSITIONS:
+            # Interés por distancia: primero los más cercanos (y uno mismo)
+            mx, my = positions[p.id]
+            dirty.sort(key=lambda pid: abs(positions[pid][0] - mx) + abs(positions[pid][1] - my))
+            del dirty[settings.NET_MAX_POSITIONS:]
+        if dirty:
+            joins = [[pid, self.players[pid].name] for pid in dirty if pid not in p.known_names]
+            if joins:
+                msg["j"] = joins
+                p.known_names.update(pid for pid, _ in joins)
+            msg["p"] = pack_positions((pid, *positions[pid]) for pid in dirty)
+            for pid in dirty:
+                known[pid] = positions[pid]
+
+        markers = p.markers()
+        added = [[kind, jid, *markers[(kind, jid)]] for kind, jid in markers.keys() - p.known_markers]
+        removed = [list(key) for key in p.known_markers - markers.keys()]
+        if added:
+            msg["ma"] = added
+        if removed:
+            msg["mr"] = removed
+        if added or removed:
+            p.known_markers = set(markers)
+
+        if weather != p.known_weather:
+            msg["w"] = p.known_weather = weather
+        me = p.stats()
+        if me != p.known_me:
+            msg["me"] = p.known_me = me
+        if not msg:
+            return None
+        msg["t"] = "d"
+        msg["k"] = self.tick
+        return msg
+
+    def broadcast(self) -> None:
+        positions = {pid: (int(p.x), int(p.y)) for pid, p in self.players.items()}   # px entran en u16
+        weather = [self.weather.get_current_condition(), round(self.weather.current_multiplier(), 2)]
+        for p in list(self.players.values()):
+            transport = p.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > settings.NET_MAX_BUFFER:
+                continue  # cliente lento: lo que no se mandó queda pendiente en el próximo delta
+            msg = self._delta(p, positions, weather)
+            if msg is not None:
+                frame = encode(msg)
+                p.writer.write(frame)
+                p.bytes_sent += len(frame)
+                self.bytes_sent += len(frame)
+
+    async def run(self, seconds: Optional[float] = None) -> None:
+        """Bucle de ticks a paso fijo; `seconds` limita la corrida (bots/pruebas)."""
+        dt = 1.0 / self.tick_rate
+        loop = asyncio.get_running_loop()
+        start = next_tick = loop.time()
+        while seconds is None or loop.time() - start < seconds:
+            t0 = time.perf_counter()
+            self.step(dt)
+            self.broadcast()
+            self.tick_ms.append(1000.0 * (time.perf_counter() - t0))
+            if len(self.tick_ms) > 10000:
+                del self.tick_ms[:5000]
+            next_tick += dt
+            delay = next_tick - loop.time()
+            if delay < -1.0:
+                next_tick = loop.time()  # muy atrasado: no intenta recuperar ticks perdidos
+            await asyncio.sleep(max(0.0, delay))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.game.net.server")
+    parser.add_argument("--host", default=settings.NET_HOST)
+    parser.add_argument("--port", type=int, default=settings.NET_PORT)
+    parser.add_argument("--rate", type=int, default=settings.NET_TICK_RATE, help="ticks por segundo")
+    args = parser.parse_args(argv)
+    server = GameServer(args.host, args.port, args.rate)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
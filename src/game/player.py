@@ -1,9 +1,48 @@
 from collections import deque
 import pygame
-import os
 import math
 
 from . import settings
+from .assets import load_image
+from .map_logic.collision import box_blocked, sweep_x, sweep_y
+
+# Reglas de resistencia como funciones sueltas: Player y la flota
+# (fleet_logic) las comparten sin instanciar un Player por repartidor.
+
+def recover_stamina(stamina, exhausted, dt):
+    """Recuperación de un paso de dt segundos. Devuelve (stamina, exhausted)."""
+    recover_rate = 10 * dt  # puntos por segundo 
+
+    if exhausted:
+        # Solo recupera hasta 30%
+        if stamina < 30:
+            stamina = min(30, stamina + recover_rate)
+        if stamina >= 30:
+            exhausted = False
+    else:
+        # Recupera poco a poco hasta 100
+        if stamina < 100:
+            stamina = min(100, stamina + recover_rate)
+    return stamina, exhausted
+
+
+def stamina_extra(weight, weather):
+    """Costo extra de resistencia por peso cargado y clima."""
+    stamina_cost = 0
+
+    if weight > 3:
+        weight_multiplier = weight - 3
+        stamina_cost += 0.2 * weight_multiplier
+
+    if weather == "rain" or weather == "wind":
+        stamina_cost += 0.1
+    elif weather == "storm":
+        stamina_cost += 0.3
+    elif weather == "heat":
+        stamina_cost += 0.2
+
+    return stamina_cost
+
 
 class Player:
     def __init__(self, cell_pos):
@@ -35,23 +74,13 @@ class Player:
         self._pos_history.append((self.x, self.y))  
 
     def _select_Image(self):
-        assets_dir = os.path.join(os.path.dirname(__file__), "..", "assets", "images")
-        return  pygame.image.load(os.path.join(assets_dir, "player.png")).convert_alpha()
+        return load_image("images", "player.png")
 
 
     def _collides_at(self, nx, ny, game_map):
-    
-        ts = settings.TILE_SIZE
-        left_tx   = int((nx - self.radius) // ts)
-        right_tx  = int((nx + self.radius) // ts)
-        top_ty    = int((ny - self.radius) // ts)
-        bottom_ty = int((ny + self.radius) // ts)
-
-        for ty in range(top_ty, bottom_ty + 1):
-            for tx in range(left_tx, right_tx + 1):
-                if game_map.is_blocked(tx, ty):
-                    return True
-        return False
+        """True si la caja del jugador en (nx, ny) toca un tile bloqueado."""
+        return box_blocked(game_map.blocked, game_map.width, game_map.height,
+                           settings.TILE_SIZE, nx, ny, self.radius)
 
     def move_with_collision(self, dx, dy, game_map, weight, weather):
 
@@ -61,15 +90,12 @@ class Player:
 
         old_x, old_y = self.x, self.y
 
-        # Movimiento eje X
-        nx = self.x + dx
-        if not self._collides_at(nx, self.y, game_map):
-            self.x = nx
-
-        # Movimiento eje Y
-        ny = self.y + dy
-        if not self._collides_at(self.x, ny, game_map):
-            self.y = ny
+        # Barrido por eje contra el bitmap de bloqueados: se detiene en el primer
+        # tile que cruza (sin atravesar paredes con dx grandes) y desliza en el otro eje.
+        blocked, w, h = game_map.blocked, game_map.width, game_map.height
+        ts = settings.TILE_SIZE
+        self.x = sweep_x(blocked, w, h, ts, self.x, self.y, self.radius, dx)
+        self.y = sweep_y(blocked, w, h, ts, self.x, self.y, self.radius, dy)
 
 
         if dx != 0 or dy != 0:
@@ -89,18 +115,7 @@ class Player:
     def update(self, dt):
         "Delta time es tiempo en segundos."
         
-        recover_rate = 10 * dt  # puntos por segundo 
-
-        if self.exhausted:
-            # Solo recupera hasta 30%
-            if self.stamina < 30:
-                self.stamina = min(30, self.stamina + recover_rate)
-            if self.stamina >= 30:
-                self.exhausted = False
-        else:
-            # Recupera poco a poco hasta 100
-            if self.stamina < 100:
-                self.stamina = min(100, self.stamina + recover_rate)
+        self.stamina, self.exhausted = recover_stamina(self.stamina, self.exhausted, dt)
 
         self._snapshot_timer += dt
         if self._snapshot_timer >= self._snapshot_every:
@@ -174,21 +189,7 @@ class Player:
             self.x, self.y = x, y
 
     def get_stamina_extra(self, weight, weather):
-
-        stamina_cost = 0
-
-        if weight > 3:
-            weight_multiplier = weight - 3
-            stamina_cost += 0.2 * weight_multiplier
-
-        if weather == "rain" or weather == "wind":
-            stamina_cost += 0.1
-        elif weather == "storm":
-            stamina_cost += 0.3
-        elif weather == "heat":
-            stamina_cost += 0.2
-
-        return stamina_cost
+        return stamina_extra(weight, weather)
     
 
     #Guardado y Cargado del Player:
@@ -0,0 +1,130 @@
+"""
+Perfilado por frame (overlay con F3).
+
+    with FRAME_PROFILER.section("mapa"):
+        self.map.draw(self.screen)
+
+    @FRAME_PROFILER.timed("pedidos.update")
+    def update(...): ...
+
+Cada sección acumula nanosegundos (perf_counter_ns) durante el frame y
+end_frame() los guarda en un buffer circular de FRAME_PROFILE_FRAMES frames,
+junto con el tiempo total de trabajo del frame. Deshabilitado, section()
+devuelve un contexto vacío y timed() llama directo a la función: queda
+prendido en producción sin costo que se note.
+"""
+from __future__ import annotations
+import functools
+from array import array
+from contextlib import nullcontext
+from time import perf_counter_ns
+from typing import Dict, List, Tuple
+
+from . import settings
+
+_NULL = nullcontext()
+
+FRAME = "frame"   # nombre reservado: tiempo de trabajo del frame completo
+
+
+class _Section:
+    """Contexto reusable de una sección (uno por nombre, sin alocar por llamada)."""
+    __slots__ = ("acc", "name", "t")
+
+    def __init__(self, acc: Dict[str, int], name: str) -> None:
+        self.acc = acc
+        self.name = name
+        self.t = 0
+
+    def __enter__(self) -> None:
+        self.t = perf_counter_ns()
+
+    def __exit__(self, *exc) -> None:
+        self.acc[self.name] += perf_counter_ns() - self.t
+
+
+def _percentile(values, q: float) -> float:
+    s = sorted(values)
+    return s[min(len(s) - 1, int(q * len(s)))] if s else 0
+
+
+class FrameProfiler:
+    def __init__(self, frames: int = settings.FRAME_PROFILE_FRAMES) -> None:
+        self.enabled = False
+        self.size = frames
+        self.count = 0                      # frames registrados (el índice en el buffer es count % size)
+        self._acc: Dict[str, int] = {}      # ns del frame en curso, por sección
+        self._sections: Dict[str, _Section] = {}
+        self._ring: Dict[str, array] = {FRAME: array("q", [0]) * frames}
+        self._frame_t = 0
+
+    def set_enabled(self, enabled: bool) -> None:
+        if enabled and not self.enabled:
+            self._frame_t = 0   # el frame a medio medir no cuenta
+        self.enabled = enabled
+
+    # --------- Medición ---------
+    def section(self, name: str):
+        if not self.enabled:
+            return _NULL
+        sec = self._sections.get(name)
+        if sec is None:
+            sec = self._sections[name] = _Section(self._acc, name)
+            self._acc[name] = 0
+            self._ring[name] = array("q", [0]) * self.size
+        return sec
+
+    def timed(self, name: str):
+        """Decorador: mide cada llamada en la sección `name` (si está habilitado)."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with self.section(name):
+                    return fn(*args, **kwargs)
+            return inner
+        return wrap
+
+    def begin_frame(self) -> None:
+        if self.enabled:
+            self._frame_t = perf_counter_ns()
+
+    def end_frame(self) -> None:
+        if not self.enabled or not self._frame_t:
+            return
+        i = self.count % self.size
+        self._ring[FRAME][i] = perf_counter_ns() - self._frame_t
+        acc = self._acc
+        for name, ring in self._ring.items():
+            if name != FRAME:
+                ring[i] = acc[name]
+                acc[name] = 0
+        self.count += 1
+
+    # --------- Consultas ---------
+    def frame_times_ms(self) -> List[float]:
+        """Tiempos de trabajo de los últimos frames (ms), del más viejo al más nuevo."""
+        ring, n = self._ring[FRAME], min(self.count, self.size)
+        start = (self.count - n) % self.size
+        return [ring[(start + k) % self.size] / 1e6 for k in range(n)]
+
+    def stats(self) -> List[Tuple[str, float, float]]:
+        """(sección, p50 ms, p99 ms) sobre los frames del buffer; primero el frame completo."""
+        n = min(self.count, self.size)
+        out = []
+        for name, ring in self._ring.items():
+            vals = ring[:n]
+            out.append((name, _percentile(vals, 0.50) / 1e6, _percentile(vals, 0.99) / 1e6))
+        return out
+
+    def reset(self) -> None:
+        self.count = 0
+        for ring in self._ring.values():
+            for i in range(self.size):
+                ring[i] = 0
+        for name in self._acc:
+            self._acc[name] = 0
+
+
+FRAME_PROFILER = FrameProfiler()
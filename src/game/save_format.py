@@ -0,0 +1,210 @@
+"""
+Formato binario de partidas guardadas (.sav).
+
+    cabecera:  magic "CQSV" | versión (u16) | códec (u8) | reservado (u8) | largo sin comprimir (u32)
+    cuerpo:    estado empaquetado con pack() y comprimido (zlib o lzma)
+
+pack()/unpack() son un empaquetado estilo msgpack (tag de 1 byte + valor
+con struct) para None, bool, int, float, str, bytes, list/tuple y dict.
+A diferencia de pickle, leer un archivo nunca ejecuta código.
+
+write_save()/read_save() son lo único que toca disco; el guardado manual y
+el autosave (hilo de fondo) comparten la misma escritura atómica.
+"""
+from __future__ import annotations
+import lzma
+import os
+import struct
+import tempfile
+import zlib
+from typing import Any
+
+# <repo>/saves, igual que antes en engine
+SAVES_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "saves"))
+
+MAGIC = b"CQSV"
+VERSION = 1
+
+CODEC_ZLIB = 1
+CODEC_LZMA = 2
+
+_HEADER = struct.Struct("<4sHBxI")
+
+# Tags del empaquetado
+_NONE, _FALSE, _TRUE, _INT8, _INT64, _FLOAT, _STR, _BYTES, _LIST, _DICT = range(10)
+
+_B = struct.Struct("<b")
+_Q = struct.Struct("<q")
+_D = struct.Struct("<d")
+_I = struct.Struct("<I")
+
+
+def _pack_into(out: bytearray, obj: Any) -> None:
+    if obj is None:
+        out.append(_NONE)
+    elif obj is True:
+        out.append(_TRUE)
+    elif obj is False:
+        out.append(_FALSE)
+    elif isinstance(obj, int):
+        if -128 <= obj <= 127:
+            out.append(_INT8)
+            out += _B.pack(obj)
+        else:
+            out.append(_INT64)
+            out += _Q.pack(obj)
+    elif isinstance(obj, float):
+        out.append(_FLOAT)
+        out += _D.pack(obj)
+    elif isinstance(obj, str):
+        raw = obj.encode("utf-8")
+        out.append(_STR)
+        out += _I.pack(len(raw))
+        out += raw
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        raw = bytes(obj)
+        out.append(_BYTES)
+        out += _I.pack(len(raw))
+        out += raw
+    elif isinstance(obj, (list, tuple)):
+        out.append(_LIST)
+        out += _I.pack(len(obj))
+        for item in obj:
+            _pack_into(out, item)
+    elif isinstance(obj, dict):
+        out.append(_DICT)
+        out += _I.pack(len(obj))
+        for k, v in obj.items():
+            _pack_into(out, k)
+            _pack_into(out, v)
+    else:
+        raise TypeError(f"Tipo no serializable en partida: {type(obj).__name__}")
+
+
+def pack(obj: Any) -> bytes:
+    out = bytearray()
+    _pack_into(out, obj)
+    return bytes(out)
+
+
+def _unpack_from(buf: memoryview, pos: int) -> tuple:
+    tag = buf[pos]
+    pos += 1
+    if tag == _NONE:
+        return None, pos
+    if tag == _TRUE:
+        return True, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _INT8:
+        return _B.unpack_from(buf, pos)[0], pos + 1
+    if tag == _INT64:
+        return _Q.unpack_from(buf, pos)[0], pos + 8
+    if tag == _FLOAT:
+        return _D.unpack_from(buf, pos)[0], pos + 8
+    if tag in (_STR, _BYTES):
+        n = _I.unpack_from(buf, pos)[0]
+        pos += 4
+        raw = bytes(buf[pos:pos + n])
+        if len(raw) != n:
+            raise ValueError("Partida truncada")
+        return (raw.decode("utf-8") if tag == _STR else raw), pos + n
+    if tag == _LIST:
+        n = _I.unpack_from(buf, pos)[0]
+        pos += 4
+        items = []
+        for _ in range(n):
+            item, pos = _unpack_from(buf, pos)
+            items.append(item)
+        return items, pos
+    if tag == _DICT:
+        n = _I.unpack_from(buf, pos)[0]
+        pos += 4
+        d = {}
+        for _ in range(n):
+            k, pos = _unpack_from(buf, pos)
+            v, pos = _unpack_from(buf, pos)
+            d[k] = v
+        return d, pos
+    raise ValueError(f"Tag desconocido en partida: {tag}")
+
+
+def unpack(data: bytes) -> Any:
+    try:
+        obj, pos = _unpack_from(memoryview(data), 0)
+    except (IndexError, struct.error) as e:
+        raise ValueError("Partida truncada") from e
+    if pos != len(data):
+        raise ValueError("Bytes sobrantes al final de la partida")
+    return obj
+
+
+def encode_save(state: dict, codec: int = CODEC_ZLIB) -> bytes:
+    """Empaqueta y comprime el dict de estado con la cabecera versionada."""
+    body = pack(state)
+    if codec == CODEC_LZMA:
+        compressed = lzma.compress(body, preset=1)
+    else:
+        codec = CODEC_ZLIB
+        compressed = zlib.compress(body, 6)
+    return _HEADER.pack(MAGIC, VERSION, codec, len(body)) + compressed
+
+
+def decode_save(blob: bytes) -> dict:
+    """Inverso de encode_save(). Lanza ValueError si el archivo no es una partida válida."""
+    if len(blob) < _HEADER.size:
+        raise ValueError("Partida truncada")
+    magic, version, codec, raw_len = _HEADER.unpack_from(blob, 0)
+    if magic != MAGIC:
+        raise ValueError("No es una partida de Courier Quest")
+    if version != VERSION:
+        raise ValueError(f"Versión de partida no soportada: {version}")
+
+    compressed = blob[_HEADER.size:]
+    try:
+        if codec == CODEC_ZLIB:
+            body = zlib.decompress(compressed)
+        elif codec == CODEC_LZMA:
+            body = lzma.decompress(compressed)
+        else:
+            raise ValueError(f"Códec de partida desconocido: {codec}")
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError("Partida corrupta") from e
+    if len(body) != raw_len:
+        raise ValueError("Partida corrupta")
+
+    state = unpack(body)
+    if not isinstance(state, dict):
+        raise ValueError("Partida corrupta")
+    return state
+
+
+def atomic_write(path: str, blob: bytes) -> None:
+    """
+    Escritura atómica: temporal en el mismo directorio, fsync y os.replace.
+    Si algo falla el archivo anterior queda intacto.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".tmp", delete=False)
+    try:
+        with tmp:
+            tmp.write(blob)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp.name, path)
+    except BaseException:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+        raise
+
+
+def write_save(path: str, state: dict, codec: int = CODEC_ZLIB) -> None:
+    atomic_write(path, encode_save(state, codec))
+
+
+def read_save(path: str) -> dict:
+    with open(path, "rb") as f:
+        return decode_save(f.read())
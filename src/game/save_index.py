@@ -0,0 +1,147 @@
+"""
+Índice de partidas guardadas (`saves/index.json`).
+
+Una entrada por slot con lo que muestra el menú de carga: nombre, fecha,
+dinero, reputación, tiempo restante y una miniatura chica (RGB comprimido
+con zlib, en base64). Se reescribe de forma atómica en cada guardado, así el
+menú nunca lista el directorio ni abre los archivos de partida.
+
+Si el índice falta o está corrupto se reconstruye la primera vez que se
+pide, leyendo cada partida una sola vez (sin miniatura).
+"""
+from __future__ import annotations
+import base64
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from .save_format import SAVES_DIR, atomic_write, read_save
+
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+
+SAVE_EXTENSIONS = (".sav", ".cqlog")
+
+
+def meta_from_state(state: dict) -> dict:
+    """Extrae del estado guardado los datos que muestra el menú."""
+    stats = state.get("statistics") or {}
+    values = stats.get("stats") or {}
+    timer = stats.get("timer") or {}
+    return {
+        "money": float(values.get("money", 0.0)),
+        "reputation": int(values.get("reputation", 0)),
+        "time_left": float(timer.get("time_left", 0.0)),
+    }
+
+
+def encode_thumb(size: Tuple[int, int], rgb: bytes) -> list:
+    return [int(size[0]), int(size[1]), base64.b64encode(zlib.compress(rgb, 9)).decode("ascii")]
+
+
+def decode_thumb(entry: dict) -> Optional[Tuple[Tuple[int, int], bytes]]:
+    """((w, h), bytes RGB) de la miniatura de una entrada, o None si no tiene."""
+    thumb = entry.get("thumb")
+    if not thumb:
+        return None
+    try:
+        w, h, data = thumb
+        # En el índice JSON viene en base64; desde SQLite, como bytes
+        raw = data if isinstance(data, (bytes, bytearray)) else base64.b64decode(data)
+        rgb = zlib.decompress(raw)
+    except (ValueError, TypeError, zlib.error):
+        return None
+    if len(rgb) != w * h * 3:
+        return None
+    return (w, h), rgb
+
+
+class SaveIndex:
+    def __init__(self, saves_dir: str = SAVES_DIR) -> None:
+        self.saves_dir = saves_dir
+        self.path = os.path.join(saves_dir, INDEX_NAME)
+        self._entries: Optional[Dict[str, dict]] = None
+        # Lo usan el hilo principal (guardado manual, menú) y el del autosave
+        self._lock = threading.Lock()
+
+    # --------- Lectura ---------
+    def _ensure_loaded(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    doc = json.load(f)
+                if doc.get("version") != INDEX_VERSION or not isinstance(doc.get("slots"), dict):
+                    raise ValueError("índice de otra versión")
+                self._entries = doc["slots"]
+            except (OSError, ValueError, AttributeError):
+                self._entries = self._scan()
+                self._write()
+        return self._entries
+
+    def _scan(self) -> Dict[str, dict]:
+        """Reconstruye el índice abriendo cada partida (solo si no había índice)."""
+        from .save_log import SaveLog
+
+        entries: Dict[str, dict] = {}
+        if not os.path.isdir(self.saves_dir):
+            return entries
+        for name in os.listdir(self.saves_dir):
+            if not name.lower().endswith(SAVE_EXTENSIONS):
+                continue
+            path = os.path.join(self.saves_dir, name)
+            try:
+                if name.lower().endswith(".cqlog"):
+                    state = SaveLog(path).load_latest()
+                else:
+                    state = read_save(path)
+                entry = meta_from_state(state)
+            except Exception:
+                continue  # partida ilegible: no se lista
+            entry["name"] = name
+            entry["saved_at"] = os.path.getmtime(path)
+            entry["thumb"] = None
+            entries[name] = entry
+        return entries
+
+    def entries(self) -> List[dict]:
+        """Entradas ordenadas de la más reciente a la más vieja."""
+        with self._lock:
+            items = list(self._ensure_loaded().values())
+        items.sort(key=lambda e: e.get("saved_at", 0.0), reverse=True)
+        return items
+
+    def get(self, name: str) -> Optional[dict]:
+        with self._lock:
+            return self._ensure_loaded().get(name)
+
+    # --------- Escritura ---------
+    def update(self, name: str, state: dict, thumb: Optional[Tuple[Tuple[int, int], bytes]] = None) -> None:
+        """Registra (o actualiza) el slot `name` con los datos de `state` y la miniatura."""
+        entry = meta_from_state(state)
+        entry["name"] = name
+        entry["saved_at"] = time.time()
+        entry["thumb"] = encode_thumb(*thumb) if thumb else None
+        with self._lock:
+            self._ensure_loaded()[name] = entry
+            self._write()
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            if self._ensure_loaded().pop(name, None) is not None:
+                self._write()
+
+    def rebuild(self) -> None:
+        with self._lock:
+            self._entries = self._scan()
+            self._write()
+
+    def _write(self) -> None:
+        doc = {"version": INDEX_VERSION, "slots": self._entries}
+        blob = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        try:
+            atomic_write(self.path, blob)
+        except OSError:
+            pass  # sin índice en disco se reconstruye la próxima vez
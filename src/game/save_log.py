@@ -0,0 +1,311 @@
+"""
+Partidas incrementales: un keyframe (estado completo) seguido de deltas con
+solo lo que cambió (historial nuevo, inventario, posición, timers…).
+
+    cabecera:  magic "CQLG" | versión (u16) | reservado (u16)
+    registro:  tipo (u8: 0 keyframe, 1 delta) | largo (u32) | crc32 (u32) | cuerpo zlib(pack(...))
+
+El archivo solo crece por append, así que un cierre a mitad de escritura deja
+a lo sumo un registro incompleto al final; al abrir se detecta (largo/CRC) y
+se descarta. Cada KEYFRAME_EVERY deltas, o si los deltas ya pesan más que el
+keyframe, se escribe uno nuevo; si el archivo pasa de MAX_BYTES se compacta
+(reescritura atómica conservando los últimos KEEP_KEYFRAMES tramos).
+
+Cargar = último keyframe + sus deltas. state_at(i)/iter_states() permiten
+rebobinar o recorrer la partida guardada sin leer todo desde el principio.
+"""
+from __future__ import annotations
+import os
+import struct
+import tempfile
+import zlib
+from typing import Any, Iterator, List, Optional, Tuple
+
+from . import settings
+from .save_format import pack, unpack
+
+MAGIC = b"CQLG"
+VERSION = 1
+
+KEYFRAME = 0
+DELTA = 1
+
+_HEADER = struct.Struct("<4sHxx")
+_RECORD = struct.Struct("<BII")
+
+# Operaciones de un delta: [op, ruta, valor]
+OP_SET, OP_DEL, OP_EXTEND = 0, 1, 2
+
+
+# --------- Diff genérico sobre dict/list/escalares ---------
+def state_diff(old: Any, new: Any, path: Optional[list] = None, ops: Optional[list] = None) -> list:
+    """
+    Lista de operaciones que transforman `old` en `new`. Recorre dicts y
+    listas del mismo largo; si una lista solo creció al final (historial,
+    posiciones) se registra como EXTEND con los elementos nuevos.
+    """
+    if path is None:
+        path = []
+    if ops is None:
+        ops = []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        for k, v in new.items():
+            if k not in old:
+                ops.append([OP_SET, path + [k], v])
+            elif old[k] is not v:
+                state_diff(old[k], v, path + [k], ops)
+        for k in old:
+            if k not in new:
+                ops.append([OP_DEL, path + [k]])
+        return ops
+
+    if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+        n_old, n_new = len(old), len(new)
+        if n_old == n_new:
+            for i in range(n_new):
+                if old[i] is not new[i]:
+                    state_diff(old[i], new[i], path + [i], ops)
+            return ops
+        if 0 < n_old < n_new and list(new[:n_old]) == list(old):
+            ops.append([OP_EXTEND, path, list(new[n_old:])])
+            return ops
+        ops.append([OP_SET, path, new])
+        return ops
+
+    if type(old) is not type(new) or old != new:
+        ops.append([OP_SET, path, new])
+    return ops
+
+
+def apply_diff(state: Any, ops: list) -> Any:
+    """Aplica in-place las operaciones de state_diff() y devuelve el estado."""
+    for op in ops:
+        kind, path = op[0], op[1]
+        if not path:
+            if kind == OP_SET:
+                state = op[2]
+            elif kind == OP_EXTEND:
+                state.extend(op[2])
+            continue
+        parent = state
+        for key in path[:-1]:
+            parent = parent[key]
+        key = path[-1]
+        if kind == OP_SET:
+            parent[key] = op[2]
+        elif kind == OP_DEL:
+            del parent[key]
+        elif kind == OP_EXTEND:
+            parent[key].extend(op[2])
+        else:
+            raise ValueError(f"Operación de delta desconocida: {kind}")
+    return state
+
+
+# --------- Archivo de log ---------
+class SaveLog:
+    def __init__(
+        self,
+        path: str,
+        keyframe_every: int = settings.SAVE_LOG_KEYFRAME_EVERY,
+        max_bytes: int = settings.SAVE_LOG_MAX_BYTES,
+        keep_keyframes: int = settings.SAVE_LOG_KEEP_KEYFRAMES,
+    ) -> None:
+        self.path = path
+        self.keyframe_every = max(1, int(keyframe_every))
+        self.max_bytes = int(max_bytes)
+        self.keep_keyframes = max(1, int(keep_keyframes))
+
+        # (offset, tipo, largo) de cada registro válido
+        self._records: List[Tuple[int, int, int]] = []
+        self._size = 0
+        self._last: Any = None            # último estado escrito (para el próximo diff)
+        self._keyframe_bytes = 0
+        self._delta_bytes = 0
+        self._deltas_since_key = 0
+
+        if os.path.exists(path):
+            self._scan()
+
+    # --------- Lectura ---------
+    def _scan(self) -> None:
+        """Indexa los registros y descarta una cola truncada o corrupta."""
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if len(data) < _HEADER.size:
+            raise ValueError("Log de partida truncado")
+        magic, version = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("No es un log de partida de Courier Quest")
+        if version != VERSION:
+            raise ValueError(f"Versión de log no soportada: {version}")
+
+        pos = _HEADER.size
+        records = []
+        while pos + _RECORD.size <= len(data):
+            kind, length, crc = _RECORD.unpack_from(data, pos)
+            body = data[pos + _RECORD.size:pos + _RECORD.size + length]
+            if kind not in (KEYFRAME, DELTA) or len(body) != length or zlib.crc32(body) != crc:
+                break
+            if kind == DELTA and not records:
+                break
+            records.append((pos, kind, length))
+            pos += _RECORD.size + length
+
+        if pos != len(data):
+            # Registro a medio escribir: se corta el archivo en el último válido
+            with open(self.path, "r+b") as f:
+                f.truncate(pos)
+        self._records = records
+        self._size = pos
+
+        self._deltas_since_key = 0
+        self._delta_bytes = 0
+        for _, kind, length in reversed(records):
+            if kind == KEYFRAME:
+                self._keyframe_bytes = length
+                break
+            self._deltas_since_key += 1
+            self._delta_bytes += length
+        if records:
+            self._last = self.state_at(len(records) - 1)
+
+    def _read_body(self, f, index: int) -> Any:
+        offset, _, length = self._records[index]
+        f.seek(offset + _RECORD.size)
+        return unpack(zlib.decompress(f.read(length)))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _keyframe_before(self, index: int) -> int:
+        while self._records[index][1] != KEYFRAME:
+            index -= 1
+        return index
+
+    def state_at(self, index: int) -> dict:
+        """Estado tal como estaba en el guardado `index` (negativos cuentan desde el final)."""
+        if not self._records:
+            raise ValueError("Log de partida vacío")
+        if index < 0:
+            index += len(self._records)
+        if not 0 <= index < len(self._records):
+            raise IndexError(index)
+        start = self._keyframe_before(index)
+        with open(self.path, "rb") as f:
+            state = self._read_body(f, start)
+            for i in range(start + 1, index + 1):
+                state = apply_diff(state, self._read_body(f, i))
+        return state
+
+    def load_latest(self) -> dict:
+        return self.state_at(-1)
+
+    def iter_states(self, start: int = 0) -> Iterator[dict]:
+        """
+        Recorre los estados desde `start` aplicando los deltas en orden.
+        El dict entregado se reutiliza en la siguiente vuelta; copiarlo si se guarda.
+        """
+        if start < 0:
+            start += len(self._records)
+        if not self._records or start >= len(self._records):
+            return
+        first = self._keyframe_before(start)
+        with open(self.path, "rb") as f:
+            state = None
+            for i in range(first, len(self._records)):
+                body = self._read_body(f, i)
+                if self._records[i][1] == KEYFRAME:
+                    state = body
+                else:
+                    state = apply_diff(state, body)
+                if i >= start:
+                    yield state
+
+    # --------- Escritura ---------
+    def reset(self) -> None:
+        """Vacía el log; el próximo append() escribe un keyframe."""
+        self._write_file([])
+
+    def append(self, state: dict) -> int:
+        """
+        Agrega un guardado (keyframe o delta según corresponda) y devuelve
+        su tipo. `state` pasa a ser del log: no debe modificarse después.
+        """
+        kind = KEYFRAME
+        payload: Any = state
+        if self._last is not None and self._deltas_since_key < self.keyframe_every:
+            ops = state_diff(self._last, state)
+            body = zlib.compress(pack(ops), 6)
+            if self._delta_bytes + len(body) <= self._keyframe_bytes:
+                kind, payload = DELTA, ops
+        if kind == KEYFRAME:
+            body = zlib.compress(pack(payload), 6)
+
+        if self._size == 0:
+            self._write_file([])
+        with open(self.path, "ab") as f:
+            f.write(_RECORD.pack(kind, len(body), zlib.crc32(body)))
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._records.append((self._size, kind, len(body)))
+        self._size += _RECORD.size + len(body)
+        if kind == KEYFRAME:
+            self._keyframe_bytes = len(body)
+            self._delta_bytes = 0
+            self._deltas_since_key = 0
+        else:
+            self._delta_bytes += len(body)
+            self._deltas_since_key += 1
+        self._last = state
+
+        if self._size > self.max_bytes:
+            self.compact()
+        return kind
+
+    def compact(self) -> None:
+        """Reescribe el log dejando solo los últimos `keep_keyframes` tramos."""
+        keys = [i for i, (_, kind, _) in enumerate(self._records) if kind == KEYFRAME]
+        if len(keys) <= self.keep_keyframes:
+            return
+        first = keys[-self.keep_keyframes]
+        chunks = []
+        with open(self.path, "rb") as f:
+            for offset, kind, length in self._records[first:]:
+                f.seek(offset)
+                chunks.append((kind, length, f.read(_RECORD.size + length)))
+        self._write_file(chunks)
+
+    def _write_file(self, chunks: list) -> None:
+        """Reemplaza el archivo de forma atómica con la cabecera y los registros dados."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".tmp", delete=False)
+        records = []
+        pos = _HEADER.size
+        try:
+            with tmp:
+                tmp.write(_HEADER.pack(MAGIC, VERSION))
+                for kind, length, raw in chunks:
+                    tmp.write(raw)
+                    records.append((pos, kind, length))
+                    pos += len(raw)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp.name, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp.name)
+            except OSError:
+                pass
+            raise
+        self._records = records
+        self._size = pos
+        if not records:
+            self._last = None
+            self._keyframe_bytes = 0
+            self._delta_bytes = 0
+            self._deltas_since_key = 0
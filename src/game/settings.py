@@ -2,6 +2,80 @@
 TILE_SIZE = 20
 FPS = 60
 
+# --- API / cache de /data ---
+API_CACHE_MAX_AGE = 15 * 60  # segundos en que el cache local se usa sin consultar el API (0 = validar siempre)
+API_NETWORK_GRACE = 0.3      # segundos que se espera a la red antes de usar el cache (la descarga sigue de fondo)
+
+# --- Pedidos ---
+JOBS_STREAM_PATH = None           # .jsonl / .json con un catálogo grande: se lee por tandas en vez del API
+JOBS_STREAM_BATCH = 500           # pedidos que se incorporan por frame mientras se lee
+JOBS_CATALOG_CACHE = True         # compila el catálogo leído a data/cache/*.cqcat (mmap) para el próximo arranque
+
+# --- Ruta sugerida (tecla O en el inventario) ---
+ROUTE_TIME_BUDGET = 0.25          # segundos de cómputo por pedido de ruta (en el hilo del planificador)
+ROUTE_EXACT_MAX_STOPS = 9         # hasta cuántas entregas se intenta la DP exacta
+ROUTE_MAX_STOPS = 40              # entregas que se planifican (las más urgentes); el resto queda detrás
+ROUTE_LATE_PENALTY = 4.0          # costo por segundo de atraso (se multiplica por 1 + prioridad)
+ROUTE_PRIORITY_WEIGHT = 0.5       # costo por segundo de espera de cada punto de prioridad
+
+# --- Asesor de ofertas (badges sobre los pickups) ---
+OFFER_ADVISOR = True              # muestra el puntaje 0-100 de cada oferta viva
+OFFER_REP_VALUE = 5.0             # $ que vale un punto de reputación al comparar ofertas
+OFFER_BADGE_FONT_SIZE = 14
+
+# --- Simulación de flota (fleet_logic, sin ventana) ---
+FLEET_TILES_PER_SEC = 8           # igual que BASE_TILES_PER_SEC del engine
+FLEET_STEP = 0.1                  # segundos de juego por paso de la simulación
+FLEET_DELIVERY_WINDOW = 90.0      # segundos para entregar después del pickup (mapas grandes)
+DISPATCH_INTERVAL = 0.5           # segundos de juego entre lotes del despachador
+DISPATCH_TIME_BUDGET = 0.02       # segundos de reloj por lote; lo que no se asigna pasa al siguiente
+DISPATCH_MAX_BATCH = 600          # ofertas por lote (las más nuevas)
+DISPATCH_CANDIDATES = 8           # repartidores más cercanos que puja cada oferta
+DISPATCH_MAX_QUEUE = 2            # tareas (en curso + encoladas) por repartidor
+DISPATCH_TRAVEL_COST = 2.0        # $ por segundo de espera + viaje hasta el pickup
+DISPATCH_LATE_COST = 5.0          # $ por segundo estimado de atraso en la entrega
+
+# --- Modo en red (src/game/net) ---
+NET_HOST = "127.0.0.1"
+NET_PORT = 7777
+NET_TICK_RATE = 20                # ticks de simulación (y deltas) por segundo
+NET_MAX_PLAYERS = 64
+NET_MAX_POSITIONS = 24            # posiciones por delta; las más lejanas salen en ticks siguientes
+NET_MAX_BUFFER = 65536            # bytes sin drenar en un cliente antes de dejar de escribirle
+NET_INTERP_DELAY = 0.1            # segundos que el cliente dibuja por detrás del servidor
+
+# --- Perfilado por frame (F3) ---
+FRAME_PROFILER = False            # medir siempre, aunque el overlay esté cerrado
+FRAME_PROFILE_FRAMES = 240        # frames en el buffer circular (4 s a 60 FPS)
+PERF_OVERLAY_REFRESH = 15         # frames entre actualizaciones de los textos del overlay
+
+# --- Métricas (telemetría de los kioscos) ---
+METRICS_TARGET = None             # None (apagado) | "jsonl" | "statsd" | "prometheus"
+METRICS_INTERVAL = 10.0           # segundos entre registros
+METRICS_PATH = None               # destino de "jsonl"; None = data/metrics.jsonl
+METRICS_STATSD_ADDR = ("127.0.0.1", 8125)
+METRICS_PROMETHEUS_ADDR = ("127.0.0.1", 9108)   # se sirve /metrics
+METRICS_KIOSK_ID = None           # nombre del kiosco en las métricas; None = hostname
+METRICS_BATCH = 16                # registros por escritura
+METRICS_FLUSH_SECONDS = 30.0      # espera máxima para juntar un lote
+METRICS_QUEUE = 64                # registros pendientes antes de empezar a descartar
+METRICS_TRACEMALLOC = False       # memoria con tracemalloc (cuesta CPU en todo el juego)
+METRICS_TRACEMALLOC_TOP = 5       # líneas que más alocan
+METRICS_TRACEMALLOC_TOP_EVERY = 6 # cada cuántos registros se toma el snapshot
+
+# --- Autoguardado ---
+AUTOSAVE_INTERVAL_SECONDS = 60.0  # segundos de juego entre autoguardados (0 = desactivado)
+AUTOSAVE_SLOTS = 3                # autosave-1.cqlog … autosave-N.cqlog, uno por partida, rotando
+SAVE_LOG_KEYFRAME_EVERY = 20      # deltas entre keyframes (estado completo)
+SAVE_LOG_MAX_BYTES = 512 * 1024   # al pasarse se compacta el log
+SAVE_LOG_KEEP_KEYFRAMES = 3       # tramos (keyframe + deltas) que sobreviven a la compactación
+SAVE_THUMB_SIZE = (48, 48)        # miniatura del mapa que guarda saves/index.json por slot
+LOAD_MENU_PAGE_SIZE = 8           # partidas por página en "Cargar partida"
+
+# --- Persistencia ---
+PERSISTENCE_BACKEND = "files"     # "files" (saves/, puntajes.json) | "sqlite" (data/courier_quest.db)
+SQLITE_BATCH_SIZE = 64            # escrituras agrupadas por transacción en el hilo escritor
+
 # --- TIMER ---
 TIMER_START_SECONDS = 60*8
 TIMER_TEXT = (240, 240, 240)
@@ -39,6 +113,7 @@ GO_TITLE_FONT_SIZE = 35        # reutiliza fuente del HUD
 
 # Formato de puntaje
 GO_SCORE_DECIMALS = 2
+LEADERBOARD_COMPACT_EVERY = 200   # puntajes en data/puntajes.log antes de volcarlos a puntajes.json
 
 # --- Tipografía ---
 STATS_FONT_SIZE = 20
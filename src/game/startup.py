@@ -0,0 +1,120 @@
+"""
+Perfilado del arranque (`python -m src --profile-startup`).
+
+Acumula tiempos por fase y categoría (import, io, decode, pygame, init) desde
+cualquier hilo, más hitos como "menú visible". Si está deshabilitado,
+phase() devuelve un contexto vacío y no mide nada.
+"""
+from __future__ import annotations
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Tuple
+
+CATEGORIES = ("import", "io", "decode", "pygame", "init")
+
+_NULL = nullcontext()
+
+
+class StartupProfiler:
+    def __init__(self) -> None:
+        self.enabled = False
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        # (hilo, categoría, nombre) -> [llamadas, segundos]
+        self._phases: Dict[Tuple[str, str, str], List[float]] = {}
+        self._marks: List[Tuple[str, float]] = []
+        self._reported = False
+
+    def start(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._t0 = time.perf_counter()
+
+    def phase(self, name: str, category: str = "init"):
+        if not self.enabled:
+            return _NULL
+        return self._measure(name, category)
+
+    @contextmanager
+    def _measure(self, name: str, category: str):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t
+            key = (threading.current_thread().name, category, name)
+            with self._lock:
+                entry = self._phases.setdefault(key, [0, 0.0])
+                entry[0] += 1
+                entry[1] += dt
+
+    def mark(self, label: str) -> None:
+        """Registra un hito (una sola vez por etiqueta) relativo al inicio."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if all(lbl != label for lbl, _ in self._marks):
+                self._marks.append((label, time.perf_counter() - self._t0))
+
+    def has_mark(self, label: str) -> bool:
+        return any(lbl == label for lbl, _ in self._marks)
+
+    def report(self) -> str:
+        with self._lock:
+            phases = sorted(self._phases.items(), key=lambda kv: -kv[1][1])
+            marks = list(self._marks)
+
+        by_cat = {c: 0.0 for c in CATEGORIES}
+        for (_, cat, _), (_, secs) in phases:
+            by_cat[cat] = by_cat.get(cat, 0.0) + secs
+
+        lines = ["== Perfil de arranque (ms) =="]
+        for label, at in marks:
+            lines.append(f"  {label:<28} {at * 1000:9.1f}")
+        lines.append("  por categoría (los hilos corren en paralelo, pueden sumar más que el total):")
+        lines.append("    " + " | ".join(f"{c} {by_cat[c] * 1000:.1f}" for c in by_cat))
+        lines.append("  fases:")
+        for (thread, cat, name), (calls, secs) in phases:
+            count = f" x{int(calls)}" if calls > 1 else ""
+            lines.append(f"    [{thread[:12]:<12}] {cat:<7} {name + count:<34} {secs * 1000:9.1f}")
+        return "\n".join(lines)
+
+    def report_once(self) -> None:
+        if self.enabled and not self._reported:
+            self._reported = True
+            print(self.report())
+
+
+PROFILER = StartupProfiler()
+
+
+class StartupLoader:
+    """
+    Ejecuta en un hilo de fondo una lista de pasos (etiqueta, peso, función)
+    y expone el progreso para que el menú lo muestre mientras tanto.
+    """
+    def __init__(self, steps) -> None:
+        self._steps = list(steps)
+        self._total = sum(w for _, w, _ in self._steps) or 1.0
+        self.progress = 0.0
+        self.label = self._steps[0][0] if self._steps else ""
+        self.done = False
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="startup-loader", daemon=True)
+
+    def start(self) -> "StartupLoader":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        acc = 0.0
+        try:
+            for label, weight, fn in self._steps:
+                self.label = label
+                fn()
+                acc += weight
+                self.progress = acc / self._total
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
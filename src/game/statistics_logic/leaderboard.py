@@ -0,0 +1,167 @@
+"""
+Tabla de puntajes con índice ordenado en memoria.
+
+    data/puntajes.json   snapshot (lista [{name, score}], ya ordenada de mayor a menor)
+    data/puntajes.log    un JSON por línea con cada puntaje agregado después del snapshot
+
+Agregar un puntaje es un append de una línea al log (sin releer ni reescribir
+el JSON). En memoria los puntajes viven en un array de -score ordenado
+ascendente, así top(k) es un slice y el rango de un puntaje es un
+bisect_right (los empates quedan detrás de los que ya estaban, como antes).
+
+refresh() lee solo la cola nueva del log, por si otra instancia del juego
+(kiosco compartido) agregó puntajes. Cada LEADERBOARD_COMPACT_EVERY
+registros el log se vuelca al snapshot y se vacía.
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+from .. import settings
+from ..save_format import atomic_write
+
+
+class Leaderboard:
+    def __init__(
+        self,
+        snapshot_path: str,
+        log_path: Optional[str] = None,
+        compact_every: int = settings.LEADERBOARD_COMPACT_EVERY,
+    ) -> None:
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path or os.path.splitext(snapshot_path)[0] + ".log"
+        self.compact_every = max(1, int(compact_every))
+
+        self._neg = array("d")          # -score, ascendente (= score descendente)
+        self._names: List[str] = []     # alineado con _neg
+        self._log_offset = 0            # bytes del log ya leídos
+        self._log_records = 0
+        self._loaded = False
+        # Se puede cargar desde el hilo de arranque y usar desde el principal
+        self._lock = threading.RLock()
+
+    # --------- Carga ---------
+    def load(self) -> None:
+        """Lee snapshot + log completos. Idempotente: vuelve a cargar desde cero."""
+        with self._lock:
+            rows = []
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, list):
+                    rows = [r for r in data if isinstance(r, dict) and "score" in r]
+            except (OSError, ValueError):
+                pass
+
+            pairs = [(-float(r["score"]), str(r.get("name", ""))) for r in rows]
+            # sort estable: el snapshot ya viene ordenado, y ante empates manda el orden del archivo
+            pairs.sort(key=lambda p: p[0])
+            self._neg = array("d", (p[0] for p in pairs))
+            self._names = [p[1] for p in pairs]
+            self._log_offset = 0
+            self._log_records = 0
+            self._read_tail()
+            self._loaded = True
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    def _read_tail(self) -> None:
+        """Incorpora las líneas del log que todavía no se leyeron."""
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self._log_offset)
+                chunk = f.read()
+        except OSError:
+            return
+        end = chunk.rfind(b"\n") + 1  # una línea a medio escribir se lee la próxima vez
+        for line in chunk[:end].splitlines():
+            try:
+                rec = json.loads(line)
+                self._insert(str(rec["name"]), float(rec["score"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+            self._log_records += 1
+        self._log_offset += end
+
+    def refresh(self) -> None:
+        """Trae puntajes agregados por otras instancias (solo lee la cola del log)."""
+        with self._lock:
+            if not self._loaded:
+                self.load()
+                return
+            try:
+                size = os.path.getsize(self.log_path)
+            except OSError:
+                size = 0
+            if size < self._log_offset:
+                self.load()  # otra instancia compactó: se relee todo
+            elif size > self._log_offset:
+                self._read_tail()
+
+    # --------- Consultas ---------
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._neg)
+
+    def top(self, k: int) -> List[Tuple[int, str, float]]:
+        """Los k mejores como (rango, nombre, puntaje)."""
+        with self._lock:
+            self._ensure_loaded()
+            return [(i + 1, self._names[i], -self._neg[i]) for i in range(min(k, len(self._neg)))]
+
+    def rank_of(self, score: float) -> int:
+        """Rango (1 = primero) que tendría un puntaje nuevo; empata por detrás."""
+        with self._lock:
+            self._ensure_loaded()
+            return bisect_right(self._neg, -float(score)) + 1
+
+    # --------- Escritura ---------
+    def _insert(self, name: str, score: float) -> int:
+        pos = bisect_right(self._neg, -score)
+        self._neg.insert(pos, -score)
+        self._names.insert(pos, name)
+        return pos
+
+    def add(self, name: str, score: float) -> int:
+        """Agrega un puntaje (append al log) y devuelve su rango."""
+        score = float(round(score, settings.GO_SCORE_DECIMALS))
+        with self._lock:
+            self.refresh()
+            line = (json.dumps({"name": name, "score": score}, ensure_ascii=False) + "\n").encode("utf-8")
+            try:
+                os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+                with open(self.log_path, "ab") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._log_offset += len(line)
+                self._log_records += 1
+            except OSError:
+                pass  # igual queda en memoria para esta sesión
+            rank = self._insert(name, score) + 1
+
+            if self._log_records >= self.compact_every:
+                self.compact()
+            return rank
+
+    def compact(self) -> None:
+        """Vuelca todo al snapshot (ordenado, JSON compacto) y vacía el log."""
+        with self._lock:
+            self._ensure_loaded()
+            rows = [{"name": n, "score": -s} for s, n in zip(self._neg, self._names)]
+            blob = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            try:
+                atomic_write(self.snapshot_path, blob)
+                with open(self.log_path, "wb"):
+                    pass
+            except OSError:
+                return
+            self._log_offset = 0
+            self._log_records = 0
@@ -1,9 +1,9 @@
 import pygame
 from typing import List, Dict, Optional
-import json
 import os
 
 from .. import settings 
+from ..statistics_logic.leaderboard import Leaderboard
 
 # ---- Layout ratios (screen-height relative) ----
 GO_TITLE_Y_RATIO = 0.12
@@ -36,7 +36,7 @@ GO_TABLE_ROW_BORDER_RADIUS = 6
 
 
 class GameOverLogic:
-    def __init__(self, hud_font: pygame.font.Font, small_font: pygame.font.Font):
+    def __init__(self, hud_font: pygame.font.Font, small_font: pygame.font.Font, leaderboard: Optional[Leaderboard] = None):
         self.hud_font = hud_font
         self.small_font = small_font
         self.title_font = pygame.font.Font(settings.UI_FONT_NAME, settings.MENU_TITLE_FONT_SIZE)
@@ -54,9 +54,8 @@ class GameOverLogic:
         base_dir = os.path.dirname(os.path.abspath(__file__))
         self.storage_path = os.path.normpath(os.path.join(base_dir, "..", "..", "..", "data", "puntajes.json"))
 
-        self._base_scores: List[Dict[str, object]] = []
-
-        self._base_scores = self._load_scores()
+        # Puntajes: índice ordenado en memoria + log de appends (se carga una sola vez)
+        self.leaderboard = leaderboard if leaderboard is not None else Leaderboard(self.storage_path)
 
     # -------- Public API --------
 
@@ -65,8 +64,8 @@ class GameOverLogic:
         self._choice_idx = 0
         self._name_buf = ""
         self._user_score = round(float(score), settings.GO_SCORE_DECIMALS)
-        # refresh base scores from JSON
-        self._base_scores = self._load_scores()
+        # trae solo los puntajes nuevos del log (p. ej. de otra instancia)
+        self.leaderboard.refresh()
         self._rows = []
         self._continue_rect = None
         self._done = False
@@ -153,41 +152,18 @@ class GameOverLogic:
 
     # -------- Data prep --------
 
-    def _load_scores(self) -> List[Dict[str, object]]:
-        try:
-            if not os.path.exists(self.storage_path):
-                return []
-            with open(self.storage_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if isinstance(data, list):
-                    return data
-        except Exception:
-            pass
-        return []
-
-    def _save_scores(self, rows: List[Dict[str, object]]) -> None:
-        try:
-            os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
-            with open(self.storage_path, "w", encoding="utf-8") as f:
-                json.dump(rows, f, ensure_ascii=False, indent=2)
-        except Exception:
-            pass
-
     def _append_and_save(self, name: str, score: float) -> None:
-        current = self._load_scores()
-        current.append({"name": name, "score": float(round(score, settings.GO_SCORE_DECIMALS))})
-        self._save_scores(current)
-        self._base_scores = current
+        self.leaderboard.add(name, score)
 
     def _prepare_rows(self, player_name: str, player_score: float) -> None:
-        base = list(self._base_scores)
-        base.sort(key=lambda r: r["score"], reverse=True)
-
-        candidate = base + [{"name": player_name, "score": player_score, "is_player": True}]
-        candidate.sort(key=lambda r: r["score"], reverse=True)
-
-        top3 = candidate[:3]
-        makes_top3 = any(r.get("is_player") for r in top3)
+        # Rango por bisect y top 3 por slice: no se ordena ni copia la lista completa
+        player_rank = self.leaderboard.rank_of(player_score)
+        top3 = [{"name": name, "score": score, "is_player": False}
+                for _, name, score in self.leaderboard.top(3)]
+        makes_top3 = player_rank <= 3
+        if makes_top3:
+            top3.insert(player_rank - 1, {"name": player_name, "score": player_score, "is_player": True})
+            top3 = top3[:3]
         rows: List[Dict] = []
 
         if makes_top3:
@@ -199,8 +175,6 @@ class GameOverLogic:
                     "is_player": r.get("is_player", False),
                 })
         else:
-            player_rank = next((idx for idx, r in enumerate(candidate, start=1) if r.get("is_player")), None)
-
             for idx, r in enumerate(top3, start=1):
                 rows.append({
                     "rank": idx,
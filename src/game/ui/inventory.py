@@ -1,9 +1,14 @@
 # inventory.py
 import pygame
+from collections import OrderedDict
+from datetime import datetime
 from typing import Optional, Callable, Any, List
 
 JobT = Any
 
+# Filas renderizadas que se conservan (LRU); la ventana visible es mucho menor
+ROW_CACHE_SIZE = 512
+
 class InventoryUI:
 
     def __init__(self, job_logic, font: Optional[pygame.font.Font] = None) -> None:
@@ -13,10 +18,12 @@ class InventoryUI:
         self.job_logic = job_logic
 
         self.selected_index: int = 0
-        self._sort_key: Optional[str] = "priority"   # "priority" | "deadline"
+        self.scroll: int = 0                         # primera fila visible
+        self._sort_key: Optional[str] = "priority"   # "priority" | "deadline" | "manual"
         self._sort_desc: bool = True                 
         self.on_pick_job: Optional[Callable[[JobT], None]] = None
         self.on_close_inventory: Optional[Callable[[], None]] = None
+        self.on_optimize_route: Optional[Callable[[], Any]] = None
 
         # Colores
         self.col_bg_panel   = (238, 240, 245)
@@ -56,28 +63,64 @@ class InventoryUI:
             self.panel_rect.h - (self.header_h + self.footer_h + 2 * self.padding),
         )
 
+        # Caches de render: filas por job (sin fondo de selección) y textos fijos
+        self._row_cache: "OrderedDict[str, pygame.Surface]" = OrderedDict()
+        self._text_cache: dict = {}
+
     def set_on_pick_job(self, fn: Callable[[JobT], None]) -> None:
         self.on_pick_job = fn
 
     def set_on_close_inventory(self, fn: Callable[[], None]) -> None:
         self.on_close_inventory = fn
 
+    def set_on_optimize_route(self, fn: Callable[[], Any]) -> None:
+        self.on_optimize_route = fn
+
     def handle_event(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.MOUSEWHEEL:
+            count = self.job_logic.getInventoryCount()
+            if count:
+                self.selected_index = max(0, min(count - 1, self.selected_index - event.y * 3))
+            return
+
         if event.type != pygame.KEYDOWN:
             return
 
-        jobs_view = self._get_jobs_view()
+        count = self.job_logic.getInventoryCount()
+        page = max(1, self._visible_rows())
 
-        if (event.key in (pygame.K_UP, pygame.K_w)) and jobs_view:
+        # Shift+↑/↓: reordena a mano (pasa a la vista "Manual" si estaba ordenada)
+        if event.key in (pygame.K_UP, pygame.K_DOWN) and (event.mod & pygame.KMOD_SHIFT) and count:
+            self._move_selected(-1 if event.key == pygame.K_UP else 1)
+            return
+
+        if (event.key in (pygame.K_UP, pygame.K_w)) and count:
             self.selected_index = max(0, self.selected_index - 1)
             return
 
-        if (event.key in (pygame.K_DOWN, pygame.K_s)) and jobs_view:
-            self.selected_index = min(len(jobs_view) - 1, self.selected_index + 1)
+        if (event.key in (pygame.K_DOWN, pygame.K_s)) and count:
+            self.selected_index = min(count - 1, self.selected_index + 1)
+            return
+
+        if event.key == pygame.K_PAGEUP and count:
+            self.selected_index = max(0, self.selected_index - page)
+            return
+
+        if event.key == pygame.K_PAGEDOWN and count:
+            self.selected_index = min(count - 1, self.selected_index + page)
+            return
+
+        if event.key == pygame.K_HOME and count:
+            self.selected_index = 0
+            return
+
+        if event.key == pygame.K_END and count:
+            self.selected_index = count - 1
             return
 
-        if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE) and jobs_view:
-            job = jobs_view[self.selected_index]
+        if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE) and count:
+            self.selected_index = max(0, min(self.selected_index, count - 1))
+            job = self.job_logic.getInventoryWindow(self._sort_key, self._sort_desc, self.selected_index, 1)[0]
             if callable(self.on_pick_job):
                 try:
                     self.on_pick_job(job)
@@ -110,19 +153,47 @@ class InventoryUI:
                 self._sort_desc = not self._sort_desc
             return
 
+        if event.key == pygame.K_m:
+            self._sort_key = "manual"
+            return
+
+        if event.key == pygame.K_o and count and callable(self.on_optimize_route):
+            # La ruta se aplica como orden manual a medida que el planificador mejora
+            if self.on_optimize_route():
+                self._sort_key = "manual"
+                self.selected_index = 0
+            return
+
+    def _move_selected(self, delta: int) -> None:
+        count = self.job_logic.getInventoryCount()
+        self.selected_index = max(0, min(self.selected_index, count - 1))
+        job = self.job_logic.getInventoryWindow(self._sort_key, self._sort_desc, self.selected_index, 1)[0]
+        if self._sort_key != "manual":
+            # Lo que se reordena es el orden manual: se muestra ese, con el job seleccionado
+            self._sort_key = "manual"
+            self.selected_index = self.job_logic.orders.inventory.index(job.id)
+        if self.job_logic.moveInventoryJob(job.id, delta):
+            self.selected_index += delta
+
     # Draws
     def draw(self, screen: pygame.Surface) -> None:
         r = self.panel_rect
         pygame.draw.rect(screen, self.col_bg_panel, r, border_radius=16)
         pygame.draw.rect(screen, self.col_bd_panel, r, width=1, border_radius=16)
 
-        title = self.font.render("Inventario", True, self.col_text_title)
+        self.job_logic.pollRoute()
+        title = self._text("Inventario", self.col_text_title)
         screen.blit(title, (r.x + self.padding, r.y + self.padding))
+        status = self.job_logic.routeStatus()
+        if status and self._sort_key == "manual":
+            route = self._text(f"Ruta: {status}", self.col_text_dim)
+            screen.blit(route, (r.x + self.padding + title.get_width() + 12,
+                                r.y + self.padding + title.get_height() - route.get_height()))
 
-        label_map = {"priority": "Prioridad", "deadline": "Deadline"}
+        label_map = {"priority": "Prioridad", "deadline": "Deadline", "manual": "Manual"}
         if self._sort_key in label_map:
-            arrow = "↓" if self._sort_desc else "↑"
-            pill_txt = self.font.render(f"Orden: {label_map[self._sort_key]} {arrow}", True, self.col_text_label)
+            arrow = "" if self._sort_key == "manual" else ("↓" if self._sort_desc else "↑")
+            pill_txt = self._text(f"Orden: {label_map[self._sort_key]} {arrow}", self.col_text_label)
             pad = 8
             pr = pill_txt.get_rect()
             pr.inflate_ip(2 * pad, 2 * pad)
@@ -139,94 +210,110 @@ class InventoryUI:
 
         foot_y = r.bottom - self.footer_h
         pygame.draw.line(screen, self.col_sep, (r.x + self.padding, foot_y), (r.right - self.footer_h, foot_y), 1)
-        helps = "P: Prioridad  |  D: Deadline  |  ↑/↓: Navegar  |  ENTER: Seleccionar"
-        help_surf = self.font.render(helps, True, self.col_text_dim)
+        helps = "P/D/M: Orden  |  O: Ruta  |  Shift+↑/↓: Mover  |  ENTER: Elegir"
+        help_surf = self._text(helps, self.col_text_dim)
         screen.blit(help_surf, (r.x + self.padding, foot_y + (self.footer_h - help_surf.get_height()) // 2))
 
+    # -------- Render cacheado --------
+    def _text(self, s: str, color) -> pygame.Surface:
+        key = (s, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            surf = self._text_cache[key] = self.font.render(s, True, color)
+        return surf
+
+    def _columns(self):
+        area = self.list_rect
+        return (
+            area.x + 10,
+            area.x + int(area.w * 0.38),
+            area.x + int(area.w * 0.55),
+            area.x + int(area.w * 0.72),
+        )
+
+    def _rows_top(self) -> int:
+        return self.list_rect.y + 6 + self.font.get_height() + 4 + 6
+
+    def _visible_rows(self) -> int:
+        return max(0, (self.list_rect.bottom - self._rows_top()) // self.row_h)
+
+    @staticmethod
+    def _deadline_text(job) -> str:
+        ddt = getattr(job, "deadline", None)
+        if isinstance(ddt, datetime):
+            return ddt.strftime("%Y-%m-%d %H:%M")
+        return "—" if ddt is None else str(ddt)[:16]
+
+    def _row_surface(self, job) -> pygame.Surface:
+        """Fila ya renderizada del job (los Job no cambian, así que se arma una sola vez)."""
+        jid = str(getattr(job, "id", ""))
+        surf = self._row_cache.get(jid)
+        if surf is not None:
+            self._row_cache.move_to_end(jid)
+            return surf
+
+        area = self.list_rect
+        col_id_x, col_pri_x, col_weight_x, col_dead_x = self._columns()
+        surf = pygame.Surface((area.w - 8, self.row_h - 2), pygame.SRCALPHA)
+        ox = area.x + 4  # la fila se dibuja en area.x + 4
+        surf.blit(self.font.render(jid, True, (25, 25, 30)), (col_id_x - ox, 0))
+        surf.blit(self.font.render(str(getattr(job, "priority", 0)), True, (35, 35, 40)), (col_pri_x - ox, 0))
+        surf.blit(self.font.render(str(getattr(job, "weight", 0)), True, (35, 35, 40)), (col_weight_x - ox, 0))
+        surf.blit(self.font.render(self._deadline_text(job), True, (35, 35, 40)), (col_dead_x - ox, 0))
+
+        self._row_cache[jid] = surf
+        if len(self._row_cache) > ROW_CACHE_SIZE:
+            self._row_cache.popitem(last=False)
+        return surf
+
     def _draw_jobs_list(self, screen: pygame.Surface) -> None:
         area = self.list_rect
         pygame.draw.rect(screen, self.col_list_bg, area, border_radius=10)
 
         hdr_y = area.y + 6
-        col_id_x     = area.x + 10
-        col_pri_x    = area.x + int(area.w * 0.38)
-        col_weight_x = area.x + int(area.w * 0.55)
-        col_dead_x   = area.x + int(area.w * 0.72)
-
-        def T(s, c=(60, 60, 65)):
-            return self.font.render(s, True, c)
-
-        screen.blit(T("Job"),      (col_id_x, hdr_y))
-        screen.blit(T("Pri"),      (col_pri_x, hdr_y))
-        screen.blit(T("Peso"),     (col_weight_x, hdr_y))
-        screen.blit(T("Deadline"), (col_dead_x, hdr_y))
+        col_id_x, col_pri_x, col_weight_x, col_dead_x = self._columns()
+        screen.blit(self._text("Job", (60, 60, 65)),      (col_id_x, hdr_y))
+        screen.blit(self._text("Pri", (60, 60, 65)),      (col_pri_x, hdr_y))
+        screen.blit(self._text("Peso", (60, 60, 65)),     (col_weight_x, hdr_y))
+        screen.blit(self._text("Deadline", (60, 60, 65)), (col_dead_x, hdr_y))
 
         y = hdr_y + self.font.get_height() + 4
         pygame.draw.line(screen, (215, 220, 228), (area.x + 6, y), (area.right - 6, y), 1)
         y += 6
 
-        jobs_view = self._get_jobs_view()
-        if not jobs_view:
+        count = self.job_logic.getInventoryCount()
+        if not count:
             self.selected_index = 0
+            self.scroll = 0
             return
 
-        self.selected_index = max(0, min(self.selected_index, len(jobs_view) - 1))
+        self.selected_index = max(0, min(self.selected_index, count - 1))
 
-        max_rows = max(0, (area.bottom - y) // self.row_h)
-        end_idx = min(len(jobs_view), max_rows)
-
-        for i in range(end_idx):
-            job = jobs_view[i]
+        # Ventana visible: solo se piden y dibujan estas filas
+        max_rows = self._visible_rows()
+        if max_rows <= 0:
+            return
+        if self.selected_index < self.scroll:
+            self.scroll = self.selected_index
+        elif self.selected_index >= self.scroll + max_rows:
+            self.scroll = self.selected_index - max_rows + 1
+        self.scroll = max(0, min(self.scroll, max(0, count - max_rows)))
+
+        jobs = self.job_logic.getInventoryWindow(self._sort_key, self._sort_desc, self.scroll, max_rows)
+        for row, job in enumerate(jobs):
             row_rect = pygame.Rect(area.x + 4, y, area.w - 8, self.row_h - 2)
 
-            if i == self.selected_index:
+            if self.scroll + row == self.selected_index:
                 pygame.draw.rect(screen, self.col_row_sel_bg, row_rect, border_radius=6)
                 pygame.draw.rect(screen, self.col_row_sel_bd, row_rect, width=1, border_radius=6)
 
-            screen.blit(T(str(getattr(job, "id", "")), (25, 25, 30)), (area.x + 10, y))
-            screen.blit(T(str(getattr(job, "priority", 0)), (35, 35, 40)), (col_pri_x, y))
-            screen.blit(T(str(getattr(job, "weight", 0)),   (35, 35, 40)), (col_weight_x, y))
-
-            from datetime import datetime as _dt_type
-            dline = None
-            ds = getattr(job, "deadline_str", None)
-            if callable(ds):
-                try:
-                    dline = ds()
-                except Exception:
-                    dline = None
-            if dline is None:
-                ddt = getattr(job, "deadline", None) or getattr(job, "deadline_dt", None)
-                if isinstance(ddt, _dt_type):
-                    try:
-                        dline = ddt.strftime("%Y-%m-%d %H:%M")
-                    except Exception:
-                        dline = str(ddt)[:16]
-            if dline is None:
-                dline = "—"
-            screen.blit(T(dline, (35, 35, 40)), (col_dead_x, y))
-
+            screen.blit(self._row_surface(job), (area.x + 4, y))
             y += self.row_h
 
-    def _get_jobs_view(self) -> List[JobT]:
-        jobs: List[JobT] = self.job_logic.getInventory()  
-        if not jobs:
-            return jobs
-
-        if self._sort_key == "priority":
-            return sorted(jobs, key=lambda j: getattr(j, "priority", 0), reverse=self._sort_desc)
-
-        if self._sort_key == "deadline":
-            from datetime import datetime
-            def _deadline_key(j):
-                kd = getattr(j, "key_deadline", None)
-                if callable(kd):
-                    try:
-                        return kd()
-                    except Exception:
-                        pass
-                d = getattr(j, "deadline", None) or getattr(j, "deadline_dt", None)
-                return d if d is not None else datetime.max
-            return sorted(jobs, key=_deadline_key, reverse=self._sort_desc)
-
-        return jobs
+        # Barra de scroll si no entra todo
+        if count > max_rows:
+            top = self._rows_top()
+            track_h = max_rows * self.row_h
+            thumb_h = max(12, track_h * max_rows // count)
+            thumb_y = top + (track_h - thumb_h) * self.scroll // max(1, count - max_rows)
+            pygame.draw.rect(screen, self.col_sep, (area.right - 6, thumb_y, 4, thumb_h), border_radius=2)
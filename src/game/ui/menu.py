@@ -1,14 +1,17 @@
 import os
+import time
 import pygame
 from .. import settings
+from ..save_index import decode_thumb
 from .button import Button
 from typing import Optional, Callable
 
 class MainMenu:
-    def __init__(self, screen_size, on_load: Optional[Callable[[str], bool]] = None):
+    def __init__(self, screen_size, on_load: Optional[Callable[[str], bool]] = None, save_index=None):
         self.w, self.h = screen_size
         self.font = pygame.font.Font(settings.UI_FONT_NAME, settings.UI_FONT_SIZE)
         self.on_load = on_load
+        self.save_index = save_index
 
         base_dir = os.path.dirname(os.path.abspath(__file__))
         bg_path = os.path.normpath(os.path.join(base_dir, "..", "..", "assets", "images", "menu_bg.png"))
@@ -34,6 +37,17 @@ class MainMenu:
         self.load_title = "Cargar partida"
         self.save_buttons: list[Button] = []
         self.load_feedback: Optional[str] = None  # para mostrar errores (opcional)
+        self._slots: list[dict] = []              # entradas del índice, más recientes primero
+        self.page = 0
+        self.page_size = settings.LOAD_MENU_PAGE_SIZE
+        self.selected = 0                         # fila seleccionada dentro de la página
+        self._thumbs: dict = {}                   # (nombre, saved_at) -> Surface escalada
+        self._preview_font = pygame.font.Font(settings.UI_FONT_NAME, 18)
+
+        # Carga en segundo plano: None = listo; 0..1 = progreso (botones deshabilitados)
+        self.loading_progress: Optional[float] = None
+        self.loading_label = ""
+        self._loading_font = pygame.font.Font(settings.UI_FONT_NAME, 18)
 
         self._layout((self.w, self.h))
 
@@ -147,6 +161,26 @@ class MainMenu:
         else:  # LOAD
             self._draw_load(surface)
 
+        if self.loading_progress is not None:
+            self._draw_loading(surface)
+
+    def set_loading(self, progress: Optional[float], label: str = "") -> None:
+        """Muestra una barra de progreso mientras arranca el juego (None la oculta)."""
+        self.loading_progress = progress
+        self.loading_label = label
+
+    def _draw_loading(self, surface: pygame.Surface):
+        bar_w, bar_h = 248, 10
+        x = self.w // 2 - bar_w // 2 + self.offset_x
+        y = int(self.h * 0.92)
+        pygame.draw.rect(surface, settings.MENU_BG, (x, y, bar_w, bar_h), border_radius=4)
+        fill_w = int(bar_w * max(0.0, min(1.0, self.loading_progress)))
+        if fill_w > 0:
+            pygame.draw.rect(surface, settings.BUTTON_BG_SELECTED, (x, y, fill_w, bar_h), border_radius=4)
+
+        label = self._loading_font.render(f"Cargando: {self.loading_label}", True, settings.TEXT_LIGHT)
+        surface.blit(label, (self.w // 2 - label.get_width() // 2 + self.offset_x, y - label.get_height() - 4))
+
     def _draw_main(self, surface: pygame.Surface):
         self.btn_start.draw(surface)
         self.btn_load.draw(surface)
@@ -177,14 +211,29 @@ class MainMenu:
             surface.blit(fb, (fb_x, fb_y))
 
         else:
-          for b in self.save_buttons:
+          for i, b in enumerate(self.save_buttons):
               b.draw(surface)
+              if i == self.selected:
+                  pygame.draw.rect(surface, settings.BUTTON_BG_SELECTED, b.rect, width=2, border_radius=10)
+          self._draw_preview(surface)
+
+          pages = self._page_count()
+          if pages > 1:
+              page_surf = self._preview_font.render(
+                  f"Página {self.page + 1}/{pages}  ·  RePág/AvPág", True, settings.TEXT_LIGHT)
+              page_pos = (self.w // 2 - page_surf.get_width() // 2, int(self.h * 0.88) - 28)
+              pygame.draw.rect(surface, settings.MENU_BG, page_surf.get_rect(topleft=page_pos).inflate(12, 6), border_radius=6)
+              surface.blit(page_surf, page_pos)
 
         hint = "ESC para volver"
         hint_surf = pygame.font.Font(settings.UI_FONT_NAME, 18).render(hint, True, settings.BUTTON_BG)
         surface.blit(hint_surf, (self.w // 2 - hint_surf.get_width() // 2 , int(self.h * 0.88)))
 
     def handle_event(self, event) -> str | None:
+        # Mientras se carga en segundo plano no se puede iniciar ni cargar partida
+        if self.loading_progress is not None:
+            return None
+
         if self.phase == "MAIN":
             if self.btn_start.handle_event(event):
                 return "start"
@@ -201,19 +250,34 @@ class MainMenu:
                 self.phase = "MAIN"
                 return None
 
+            # Páginas y selección con teclado
+            if event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_PAGEDOWN, pygame.K_RIGHT):
+                    self._set_page(self.page + 1)
+                elif event.key in (pygame.K_PAGEUP, pygame.K_LEFT):
+                    self._set_page(self.page - 1)
+                elif event.key == pygame.K_DOWN and self.save_buttons:
+                    self.selected = (self.selected + 1) % len(self.save_buttons)
+                elif event.key == pygame.K_UP and self.save_buttons:
+                    self.selected = (self.selected - 1) % len(self.save_buttons)
+                elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER) and self.save_buttons:
+                    return self._try_load(self.save_buttons[self.selected].text)
+                return None
+
+            if event.type == pygame.MOUSEMOTION:
+                for i, b in enumerate(self.save_buttons):
+                    if b.rect.collidepoint(event.pos):
+                        self.selected = i
+                return None
+
+            if event.type == pygame.MOUSEWHEEL:
+                self._set_page(self.page - event.y)
+                return None
+
             # Click sobre un save
             for b in self.save_buttons:
                 if b.handle_event(event):
-                    filename = b.text  # viene con .sav
-                    ok = False
-                    if self.on_load:
-                        ok = bool(self.on_load(filename))
-                    if ok:
-                        return "loaded"   # el engine pone GameState.PLAYING
-                    else:
-                        # muestra feedback, no cambia de pantalla
-                        self.load_feedback = "No se pudo cargar la partida."
-                        return None
+                    return self._try_load(b.text)  # viene con .sav / .cqlog
             return None
 
         return None
@@ -225,43 +289,112 @@ class MainMenu:
         """Placeholder for Load Game action (no-op for now)."""
         pass
     
+    def _try_load(self, filename: str) -> str | None:
+        ok = False
+        if self.on_load:
+            ok = bool(self.on_load(filename))
+        if ok:
+            return "loaded"   # el engine pone GameState.PLAYING
+        # muestra feedback, no cambia de pantalla
+        self.load_feedback = "No se pudo cargar la partida."
+        return None
+
     def _build_save_list(self):
-        """Crea botones para cada .sav en /saves, centrados en vertical."""
-        self.save_buttons.clear()
+        """Lee las partidas del índice (sin abrir los archivos) y arma la página actual."""
         self.load_feedback = None
+        if self.save_index is not None:
+            self._slots = self.save_index.entries()
+        else:
+            self._slots = self._scan_saves_dir()
+
+        # Cuántas filas entran entre el título y el pie
+        btn_h, gap = 36, 6
+        avail = int(self.h * 0.88) - 40 - (int(self.h * 0.18) + 56)
+        self.page_size = max(1, min(settings.LOAD_MENU_PAGE_SIZE, avail // (btn_h + gap)))
+        self._set_page(self.page)
+
+        # Si no hay saves, deja un feedback mínimo
+        if not self._slots:
+            self.load_feedback = "No se encontraron partidas guardadas."
+
+    def _scan_saves_dir(self) -> list[dict]:
+        """Sin índice: solo nombres, como antes."""
         base_dir = os.path.dirname(os.path.abspath(__file__))
         saves_dir = os.path.join(base_dir, "..", "..", "..", "saves")
-
         try:
-            entries = []
-            if os.path.isdir(saves_dir):
-                for name in os.listdir(saves_dir):
-                    if name.lower().endswith(".sav"):
-                        entries.append(name)
-            entries.sort(key=str.lower)
-        except Exception:
-            entries = []
-        btn_w, btn_h = 320, 48
-        total_h = len(entries) * btn_h + max(0, (len(entries) - 1)) * 10
-        y0 = self.h // 2 - total_h // 2
-        x = self.w // 2 - btn_w // 2 
-
-        for idx, fname in enumerate(entries):
-            y = y0 + idx * (btn_h + 10)
+            names = [n for n in os.listdir(saves_dir) if n.lower().endswith((".sav", ".cqlog"))]
+        except OSError:
+            names = []
+        names.sort(key=str.lower)
+        return [{"name": n} for n in names]
+
+    def _page_count(self) -> int:
+        return max(1, -(-len(self._slots) // self.page_size))
+
+    def _set_page(self, page: int):
+        """Crea botones solo para las partidas de la página visible."""
+        self.page = max(0, min(page, self._page_count() - 1))
+        self.selected = 0
+        self.save_buttons.clear()
+
+        btn_w, btn_h, gap = int(self.w * 0.5), 36, 6
+        x = int(self.w * 0.05)
+        y0 = int(self.h * 0.18) + 56
+        first = self.page * self.page_size
+        for row, entry in enumerate(self._slots[first:first + self.page_size]):
             self.save_buttons.append(
                 Button(
-                    rect=pygame.Rect(x, y, btn_w, btn_h),
-                    text=fname,
-                    font=self.font,
+                    rect=pygame.Rect(x, y0 + row * (btn_h + gap), btn_w, btn_h),
+                    text=entry["name"],
+                    font=self._preview_font,
                     bg=settings.MENU_BG,
                     bg_hover=settings.MENU_BG_HOVER,
                     fg=settings.TEXT_LIGHT
                 )
             )
 
-        # Si no hay saves, deja un feedback mínimo
+    def _thumb_surface(self, entry: dict, size: int) -> pygame.Surface | None:
+        key = (entry.get("name"), entry.get("saved_at"))
+        if key not in self._thumbs:
+            decoded = decode_thumb(entry)
+            surf = None
+            if decoded:
+                dims, rgb = decoded
+                surf = pygame.transform.scale(pygame.image.frombytes(rgb, dims, "RGB"), (size, size))
+            self._thumbs[key] = surf
+        return self._thumbs[key]
+
+    def _draw_preview(self, surface: pygame.Surface):
+        """Miniatura y datos de la partida seleccionada, a la derecha de la lista."""
         if not self.save_buttons:
-            self.load_feedback = "No se encontraron partidas guardadas."
+            return
+        entry = self._slots[self.page * self.page_size + self.selected]
+        if "saved_at" not in entry:
+            return
+
+        x = int(self.w * 0.05) + int(self.w * 0.5) + 16
+        y = int(self.h * 0.18) + 56
+        size = min(self.w - x - int(self.w * 0.05), 160)
+        panel = pygame.Rect(x - 8, y - 8, size + 16, size + 16 + 4 * 22 + 8)
+        pygame.draw.rect(surface, settings.MENU_BG, panel, border_radius=8)
+
+        thumb = self._thumb_surface(entry, size)
+        if thumb is not None:
+            surface.blit(thumb, (x, y))
+        else:
+            pygame.draw.rect(surface, settings.MENU_BG_HOVER, (x, y, size, size))
+
+        t = int(entry.get("time_left", 0))
+        lines = [
+            time.strftime("%d/%m/%Y %H:%M", time.localtime(entry["saved_at"])),
+            f"Dinero: ${entry.get('money', 0):.0f}",
+            f"Reputación: {entry.get('reputation', 0)}",
+            f"Tiempo: {t // 60:02d}:{t % 60:02d}",
+        ]
+        ty = y + size + 8
+        for line in lines:
+            surface.blit(self._preview_font.render(line, True, settings.TEXT_LIGHT), (x, ty))
+            ty += 22
 
 # --- helper: outlined text ---
 def draw_text_outline(surface, text, font, pos, color_fg, color_outline, outline_width=2):
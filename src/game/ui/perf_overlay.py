@@ -0,0 +1,72 @@
+"""
+Overlay de rendimiento (F3): gráfico de tiempos de frame y p50/p99 por sección
+del FrameProfiler. Los textos se rearman cada PERF_OVERLAY_REFRESH frames, así
+el overlay casi no pesa en lo que mide.
+"""
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+import pygame
+
+from .. import settings
+from ..profiler import FrameProfiler
+
+_BG = (0, 0, 0, 200)
+_BAR_OK = (80, 200, 110)
+_BAR_SLOW = (230, 80, 60)
+_BUDGET = (255, 220, 120)
+
+
+class PerfOverlay:
+    def __init__(self, profiler: FrameProfiler, width: int = 260, graph_h: int = 60) -> None:
+        self.profiler = profiler
+        self.visible = False
+        self.width = width
+        self.graph_h = graph_h
+        self._font: Optional[pygame.font.Font] = None
+        self._lines: List[Tuple[pygame.Surface, pygame.Surface]] = []   # (nombre, p50 / p99)
+        self._since = settings.PERF_OVERLAY_REFRESH
+
+    def toggle(self) -> None:
+        self.visible = not self.visible
+        self._since = settings.PERF_OVERLAY_REFRESH   # textos frescos al abrir
+
+    def _refresh_text(self) -> None:
+        if self._font is None:
+            self._font = pygame.font.Font(settings.UI_FONT_NAME, 16)
+        render = lambda text: self._font.render(text, True, settings.TEXT_LIGHT)
+        lines = [(render("sección"), render("p50 / p99 ms"))]
+        for name, p50, p99 in self.profiler.stats():
+            lines.append((render(name), render(f"{p50:.2f} / {p99:.2f}")))
+        self._lines = lines
+
+    def draw(self, screen: pygame.Surface) -> None:
+        if not self.visible:
+            return
+        self._since += 1
+        if self._since >= settings.PERF_OVERLAY_REFRESH:
+            self._since = 0
+            self._refresh_text()
+
+        line_h = self._lines[0][0].get_height() if self._lines else 16
+        h = self.graph_h + 8 + line_h * len(self._lines) + 8
+        panel = pygame.Surface((self.width, h), pygame.SRCALPHA)
+        panel.fill(_BG)
+
+        # Gráfico: una barra por frame, escala fija de 2 frames de presupuesto
+        budget = 1000.0 / settings.FPS
+        scale = self.graph_h / (2 * budget)
+        times = self.profiler.frame_times_ms()[-(self.width - 8):]
+        base = 4 + self.graph_h
+        for k, ms in enumerate(times):
+            bar = min(self.graph_h, int(ms * scale))
+            pygame.draw.line(panel, _BAR_SLOW if ms > budget else _BAR_OK, (4 + k, base), (4 + k, base - bar))
+        y_budget = base - int(budget * scale)
+        pygame.draw.line(panel, _BUDGET, (4, y_budget), (self.width - 4, y_budget))
+
+        y = base + 6
+        for name, nums in self._lines:
+            panel.blit(name, (6, y))
+            panel.blit(nums, (self.width - 6 - nums.get_width(), y))
+            y += line_h
+        screen.blit(panel, (screen.get_width() - self.width - 6, 40))   # debajo de la barra de resistencia
@@ -1,6 +1,6 @@
 import random
-import os
-from ..api_client import APIClient
+from typing import Optional
+from ..world_data import WorldData, load_world
 from .weather_visuals import WeatherVisuals
 
 
@@ -21,12 +21,21 @@ class WeatherManager:
         "cold": 0.92,
     }
 
-    def __init__(self, window_w, window_h):
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../..", ".."))
-        api = APIClient(base_dir)
+    def __init__(self, window_w, window_h, world: Optional[WorldData] = None, visuals: bool = True):
+        # Modelo del clima compartido (se carga una vez por proceso)
+        self.world = world or load_world()
 
-        payload = api.get_weather()
-        data = payload.get("data", {})
+        self._init_state()
+
+        # Sin visuals (servidor de red, simulaciones) no se cargan imágenes ni hace falta ventana
+        self.visuals = WeatherVisuals(window_w, window_h) if visuals else None
+
+    # --------------------------
+    # Internos
+    # --------------------------
+    def _init_state(self):
+        """Reinicia el estado mutable a partir del modelo del clima (sin I/O)."""
+        data = self.world.weather
 
         # Condición inicial
         initial = data.get("initial", {"condition": "clear", "intensity": 0.0})
@@ -47,11 +56,6 @@ class WeatherManager:
         self.from_multiplier = self.BASE_MULTIPLIERS[self.current_condition]
         self.to_multiplier = self.from_multiplier
 
-        self.visuals = WeatherVisuals(window_w, window_h)
-
-    # --------------------------
-    # Internos
-    # --------------------------
     def _random_burst_duration(self) -> float:
         return random.uniform(45, 60)
 
@@ -75,7 +79,8 @@ class WeatherManager:
         self.from_multiplier = self.BASE_MULTIPLIERS[self.current_condition]
         self.to_multiplier = self.BASE_MULTIPLIERS[next_condition]
 
-        self.visuals.handle_condition_change(next_condition)
+        if self.visuals:
+            self.visuals.handle_condition_change(next_condition)
         self.current_condition = next_condition
 
     # --------------------------
@@ -98,7 +103,8 @@ class WeatherManager:
             if self.transition_elapsed >= self.transition_duration:
                 self.transitioning = False
 
-        self.visuals.update(dt, self.current_condition, self.transitioning)
+        if self.visuals:
+            self.visuals.update(dt, self.current_condition, self.transitioning)
 
     def current_multiplier(self) -> float:
         if not self.transitioning:
@@ -121,34 +127,12 @@ class WeatherManager:
 
     def reset(self, window_w=None, window_h=None):
        
-        window_w = window_w or self.visuals.window_w
-        window_h = window_h or self.visuals.window_h
-
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../..", ".."))
-        api = APIClient(base_dir)
-        payload = api.get_weather()
-        data = payload.get("data", {})
-
-        # Condición inicial
-        initial = data.get("initial", {"condition": "clear", "intensity": 0.0})
-        self.current_condition = initial["condition"]
-        self.current_intensity = float(initial.get("intensity", 0.0))
-
-        # Transiciones (Markov)
-        self.transition_matrix = data.get("transition", {})
-
-        # Temporizadores
-        self.burst_duration = self._random_burst_duration()
-        self.burst_elapsed = 0.0
-
-        # Transición
-        self.transitioning = False
-        self.transition_elapsed = 0.0
-        self.transition_duration = 0.0
-        self.from_multiplier = self.BASE_MULTIPLIERS[self.current_condition]
-        self.to_multiplier = self.from_multiplier
-
-        self.visuals = WeatherVisuals(window_w, window_h)
+        # Solo estado mutable: el modelo del clima y las imágenes ya están cargados
+        self._init_state()
+        if self.visuals:
+            window_w = window_w or self.visuals.window_w
+            window_h = window_h or self.visuals.window_h
+            self.visuals.reset(window_w, window_h)
 
     def get_current_condition(self):
         return self.current_condition
@@ -167,7 +151,7 @@ class WeatherManager:
             "to_multiplier": self.to_multiplier,
             "burst_duration": self.burst_duration,
             "transition_duration": self.transition_duration,  # añadido
-            "visuals": self.visuals.save_state()
+            "visuals": self.visuals.save_state() if self.visuals else {}
         }
         return base_state
 
@@ -197,7 +181,8 @@ class WeatherManager:
 
             # Restaurar parte visual
             visuals_state = state.get("visuals", {})
-            self.visuals.load_state(visuals_state)
+            if self.visuals:
+                self.visuals.load_state(visuals_state)
 
             
             
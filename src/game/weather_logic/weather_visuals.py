@@ -1,8 +1,8 @@
 import random
-import os
 import pygame
 import math
 from .. import settings
+from ..assets import load_image
 from .weather_Items import Cloud 
 
 
@@ -13,28 +13,14 @@ class WeatherVisuals:
     """
 
     def __init__(self, window_w, window_h):
-        self.clouds = []
-        self._cloud_spawn_timer = 0.0
-        self._max_clouds = 0
-        self.rain_timer = 0.0 
-
-        self.lightning_alpha = 0
-        self.lightning = None
-
-
-        self.wind_offset = 0  # desplazamiento para animar las líneas de viento
         self.wind_speed = 250  # px/s, velocidad de las líneas de viento
-        self.wind_gusts = []
         self.max_wind_gusts = 25  # cuántas ráfagas simultáneas
 
-        
-
         self.filter_speed = 50     # velocidad de transición 
 
-        # Cargar imágenes heat/cold
-        assets_dir = os.path.join(os.path.dirname(__file__), "..", "..", "assets", "overlays")
-        self.heat_image = pygame.image.load(os.path.join(assets_dir, "heat.png")).convert_alpha()
-        self.cold_image = pygame.image.load(os.path.join(assets_dir, "cold.png")).convert_alpha()
+        # Imágenes heat/cold (cargadas una vez por proceso)
+        self.heat_image = load_image("overlays", "heat.png")
+        self.cold_image = load_image("overlays", "cold.png")
 
         # Ventana
         self.window_w = window_w
@@ -42,7 +28,6 @@ class WeatherVisuals:
 
         # alpha por clima
         self.climates = ["clear","clouds","rain_light","rain","storm","fog","wind","heat","cold"]
-        self.alphas = {c: 0 for c in self.climates}  
         self.targets = {
             "clear": 0,
             "clouds": 50,
@@ -55,6 +40,26 @@ class WeatherVisuals:
             "cold": 120
         }
 
+        self.reset()
+
+    def reset(self, window_w=None, window_h=None):
+        """Reinicia nubes, ráfagas y filtros sin recargar imágenes."""
+        self.window_w = window_w or self.window_w
+        self.window_h = window_h or self.window_h
+
+        self.clouds = []
+        self._cloud_spawn_timer = 0.0
+        self._max_clouds = 0
+        self.rain_timer = 0.0 
+
+        self.lightning_alpha = 0
+        self.lightning = None
+
+        self.wind_offset = 0  # desplazamiento para animar las líneas de viento
+        self.wind_gusts = []
+
+        self.alphas = {c: 0 for c in self.climates}  
+
     def update(self, dt, condition: str, transitioning: bool):
         # actualizar nubes
         for cloud in self.clouds:
@@ -113,16 +118,11 @@ class WeatherVisuals:
 
     def _select_Image(self):
         num= random.randint(0,4)
-        assets_dir = os.path.join(os.path.dirname(__file__), "..","..", "assets", "clouds")
-        nubes = []
-        nubes.append(pygame.image.load(os.path.join(assets_dir, f"cloud_white{num}.png")).convert_alpha())
-        nubes.append(pygame.image.load(os.path.join(assets_dir, f"cloud_gray{num}.png")).convert_alpha())
-        return num, nubes  
+        return num, self._select_Image_by_index(num)
     
     def _select_lightning_image(self):
         num= random.randint(0,4)
-        assets_dir = os.path.join(os.path.dirname(__file__), "..","..", "assets", "lightning")
-        return pygame.image.load(os.path.join(assets_dir, f"lightning_{num}.png")).convert_alpha()
+        return load_image("lightning", f"lightning_{num}.png")
 
     def _spawn_cloud(self, condition: str):
         variant_index, nubes = self._select_Image()
@@ -277,10 +277,10 @@ class WeatherVisuals:
     def save_state(self) -> dict:
         return {
             "clouds": [c.to_dict() for c in self.clouds],
-            "alphas": self.alphas,
+            "alphas": dict(self.alphas),
             "_cloud_spawn_timer": self._cloud_spawn_timer,
             "_max_clouds": self._max_clouds,
-            "wind_gusts": self.wind_gusts,
+            "wind_gusts": [list(g) for g in self.wind_gusts],
             "lightning_alpha": self.lightning_alpha
         }
 
@@ -303,9 +303,6 @@ class WeatherVisuals:
         self.lightning_alpha = data.get("lightning_alpha", 0)
 
     def _select_Image_by_index(self, num):
-        assets_dir = os.path.join(os.path.dirname(__file__), "..","..", "assets", "clouds")
-        nubes = []
-        nubes.append(pygame.image.load(os.path.join(assets_dir, f"cloud_white{num}.png")).convert_alpha())
-        nubes.append(pygame.image.load(os.path.join(assets_dir, f"cloud_gray{num}.png")).convert_alpha())
-        return nubes
+        # Las nubes nunca modifican estas superficies (Cloud.draw dibuja una copia)
+        return [load_image("clouds", f"cloud_white{num}.png"), load_image("clouds", f"cloud_gray{num}.png")]
     
@@ -0,0 +1,46 @@
+from __future__ import annotations
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .api_client import APIClient
+
+
+@dataclass(frozen=True)
+class WorldData:
+    """
+    Datos del mundo que no cambian durante el proceso: payload del mapa, modelo
+    del clima (condición inicial + matriz de transición) y catálogo de pedidos.
+    Se cargan una vez y se comparten; los reset de partida solo reinician el
+    estado mutable de cada subsistema. Las imágenes se comparten por
+    `assets.load_image`. Tratar los dicts como solo lectura.
+    """
+    map_payload: Dict[str, Any]
+    weather: Dict[str, Any]                # payload["data"] del clima
+    jobs_raw: Tuple[Dict[str, Any], ...]   # jobs ya normalizados (list[dict] del API)
+
+    @classmethod
+    def load(cls, api: APIClient) -> "WorldData":
+        api.prefetch()
+        return cls(
+            map_payload=api.get_map(),
+            weather=api.get_weather().get("data", {}),
+            jobs_raw=tuple(api.get_jobs()),
+        )
+
+
+_shared: Optional[WorldData] = None
+_shared_lock = threading.Lock()
+
+
+def load_world(api: Optional[APIClient] = None) -> WorldData:
+    """Devuelve el WorldData del proceso, cargándolo la primera vez."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            if api is None:
+                base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+                api = APIClient(base_dir)
+            _shared = WorldData.load(api)
+        return _shared
@@ -0,0 +1,123 @@
+"""
+APIClient contra un servidor HTTP local de reemplazo (sin red).
+
+    python -m pytest tests        (desde la raíz del repo)
+"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.game.api_client import APIClient
+
+MAP_V1 = {"version": 1, "width": 2, "height": 1, "tiles": [["C", "C"]]}
+MAP_V2 = {"version": 2, "width": 2, "height": 1, "tiles": [["C", "B"]]}
+ETAG = '"mapa-v2"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, como el API real
+    delay = 0.0
+    requests: list = []
+
+    def do_GET(self) -> None:
+        type(self).requests.append((self.path, self.headers.get("If-None-Match")))
+        time.sleep(self.delay)
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(MAP_V2).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class APIClientTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.base_dir = tempfile.mkdtemp(prefix="cq-api-")
+        self.handler = type("Handler", (_Handler,), {"delay": 0.0, "requests": []})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def _client(self, **kwargs) -> APIClient:
+        client = APIClient(self.base_dir, base_url=self.url, max_age=0, **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def _write_cache(self, data: dict) -> None:
+        os.makedirs(os.path.join(self.base_dir, "data"), exist_ok=True)
+        with open(os.path.join(self.base_dir, "data", "ciudad.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def _read_cache(self) -> dict:
+        with open(os.path.join(self.base_dir, "data", "ciudad.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_slow_api_returns_cache_and_refreshes_it_in_background(self) -> None:
+        self.handler.delay = 1.5
+        self._write_cache(MAP_V1)
+        client = self._client(grace=0.1)
+
+        t0 = time.perf_counter()
+        data, from_network = client._get("map")
+        self.assertLess(time.perf_counter() - t0, 1.0)
+        self.assertEqual(data, MAP_V1)
+        self.assertFalse(from_network)
+
+        # La descarga sigue y deja el cache al día
+        client._network["map"].result(timeout=5)
+        self.assertEqual(self._read_cache(), MAP_V2)
+
+    def test_slow_api_without_cache_waits_for_network(self) -> None:
+        self.handler.delay = 0.5
+        data, from_network = self._client(grace=0.1)._get("map")
+        self.assertEqual(data, MAP_V2)
+        self.assertTrue(from_network)
+
+    def test_fast_api_wins_the_race(self) -> None:
+        self._write_cache(MAP_V1)
+        data, from_network = self._client(grace=1.0)._get("map")
+        self.assertEqual(data, MAP_V2)
+        self.assertTrue(from_network)
+
+    def test_etag_revalidation_uses_cache_on_304(self) -> None:
+        self.assertEqual(self._client().get_map(), MAP_V2)
+        self.assertEqual(self.handler.requests[-1], ("/city/map", None))
+
+        data, from_network = self._client()._get("map")
+        self.assertEqual(self.handler.requests[-1], ("/city/map", ETAG))
+        self.assertEqual(data, MAP_V2)
+        self.assertTrue(from_network)
+
+    def test_unreachable_api_falls_back_to_cache(self) -> None:
+        self._write_cache(MAP_V1)
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)   # para el tearDown
+        data, from_network = self._client(grace=5.0)._get("map")
+        self.assertEqual(data, MAP_V1)
+        self.assertFalse(from_network)
+
+
+if __name__ == "__main__":
+    unittest.main()